@@ -0,0 +1,663 @@
+"""
+File:		benchmarks.py
+Author:		Dominic Carrano (carrano.dominic@gmail.com)
+Created:	October 16, 2026
+
+Timing harness for the hot paths in the hamming package.
+Run with `python benchmarks.py`; pass --no-reference to skip the slow per-parity reference implementation.
+Pass --json FILE to run the reproducible suite instead, and --baseline FILE to fail on regressions against
+a previous run of it.
+"""
+from argparse import ArgumentParser
+import asyncio
+from bitarray import __version__ as bitarray_version
+from bitarray.util import ba2int, int2ba
+from collections import deque
+from json import dump, load
+from os import path, urandom
+from platform import python_version
+from random import Random
+from subprocess import run
+from sys import executable, stderr, stdout
+from timeit import default_timer
+import hamming
+
+try:
+	from resource import getrusage, RUSAGE_SELF
+except ImportError: # not on Windows - peak RSS is reported as null there
+	getrusage = None
+
+KIB = 1 << 10
+MIB = 1 << 20
+
+# payload sizes (in bytes) benchmarked by default
+PAYLOAD_SIZES = [4 * KIB, 64 * KIB, 256 * KIB, 1 * MIB]
+
+# (record count, record length in bits) shapes benchmarked for the batch API - 64-bit words and 512-byte sectors
+BATCH_SHAPES = [(100000, 64), (2000, 4096)]
+
+# payload sizes (in bytes) benchmarked for bytes_to_bits() and bits_to_bytes()
+CONVERSION_SIZES = [1000000, 100000000]
+
+# the per-bit reference conversions take minutes beyond this many bytes, so they're skipped past it
+CONVERSION_REFERENCE_LIMIT = 8 * MIB
+
+# default input size (in MiB) streamed through encode_stream() and decode_stream(), and the number of
+# equal windows its throughput is reported over
+STREAM_SIZE = 256
+STREAM_WINDOWS = 8
+
+# default input size (in MiB) for encode_parallel() and decode_parallel(), and the worker counts timed on it
+PARALLEL_SIZE = 1024
+PARALLEL_WORKERS = [1, 2, 4, 8]
+
+# number of random words timed for each of the (72,64) and (39,32) word codecs
+WORD_COUNT = 100000
+WORD_SIZES = [64, 32]
+
+# data bits of the short codes decoded through decode_lookup() - the (8,4) and (16,11) codes
+LOOKUP_SIZES = [4, 11]
+
+# payload size (in bytes) and interleaving depths timed for encode_interleaved() and decode_interleaved()
+INTERLEAVE_SIZE   = 256 * KIB
+INTERLEAVE_DEPTHS = [8, 64, 1024]
+
+# message size (in bytes) and count sent through the loopback echo server, and how often (in seconds) the event
+# loop's lag is sampled meanwhile
+ECHO_SIZE     = 1 * MIB
+ECHO_MESSAGES = 16
+LAG_INTERVAL  = 0.001
+
+# number of (72,64) codewords encoded and decoded one call at a time to measure the overhead of metrics
+METRICS_CALLS = 100000
+
+# raw bit error rates at which (72,64) codewords go through simulate_channel(), for this many trials, and through a
+# loop of encode(), random flips and decode() for LOOP_TRIALS trials
+SIMULATION_RATES  = [1e-4, 1e-3, 1e-2]
+SIMULATION_TRIALS = 4000000
+LOOP_TRIALS       = 20000
+
+# sizes (in bits) timed by the suite - every power of four from 8 bits to 8 Mbit
+SUITE_SIZES = [8 << 2 * i for i in range(11)]
+
+# the suite times each case for at least this many seconds and samples, but no more than SUITE_MAX_SAMPLES samples
+SUITE_MIN_TIME    = 0.2
+SUITE_MIN_SAMPLES = 3
+SUITE_MAX_SAMPLES = 10000
+
+# seed of the suite's random inputs, so every run times the same data
+SUITE_SEED = 2017
+
+# a case regresses when its median time exceeds the baseline's by more than this fraction
+REGRESSION_TOLERANCE = 0.25
+
+# the suite times `import hamming` in this many fresh interpreters, and fails if the median exceeds IMPORT_BUDGET
+# seconds - short-lived worker processes pay it every time
+IMPORT_SAMPLES = 20
+IMPORT_BUDGET  = 0.05
+
+# reference implementation - the per-parity rescan encode()/decode() used before the single-pass syndrome engine
+
+def _reference_encode(data):
+	num_parity_bits = hamming._num_parity_bits_needed(len(data))
+	encoded = hamming.bitarray(len(data) + num_parity_bits + 1)
+	for parity_bit_index in hamming._powers_of_two(num_parity_bits):
+		encoded[parity_bit_index] = hamming._calculate_parity(data, parity_bit_index)
+	data_index = 0
+	for encoded_index in range(3, len(encoded)):
+		if not hamming._is_power_of_two(encoded_index):
+			encoded[encoded_index] = data[data_index]
+			data_index += 1
+	encoded[0] = hamming._calculate_parity(encoded[1:], 0)
+	return encoded
+
+def _reference_decode(encoded):
+	num_parity_bits = hamming.floor(hamming.log2(len(encoded) - 1)) + 1
+	index_of_error = 0
+	decoded = hamming._extract_data(encoded)
+	overall_correct = hamming._calculate_parity(encoded[1:], 0) == encoded[0]
+	for parity_bit_index in hamming._powers_of_two(num_parity_bits):
+		if hamming._calculate_parity(decoded, parity_bit_index) != encoded[parity_bit_index]:
+			index_of_error += parity_bit_index
+	if index_of_error and overall_correct:
+		raise ValueError("Two errors detected.")
+	elif index_of_error:
+		encoded[index_of_error] = not encoded[index_of_error]
+	return hamming._extract_data(encoded)
+
+def _reference_bytes_to_bits(byte_stream):
+	out = hamming.bitarray()
+	for byte in byte_stream:
+		for bit in bin(byte)[2:].zfill(hamming.BITS_PER_BYTE):
+			out.append(0 if bit == '0' else 1)
+	return out
+
+def _reference_bits_to_bytes(bits):
+	out = bytearray()
+	for i in range(0, len(bits), hamming.BITS_PER_BYTE):
+		byte = 0
+		for bit in bits[i:i + hamming.BITS_PER_BYTE]:
+			byte = (byte << 1) | bit
+		out.append(byte)
+	return out
+
+# timing helpers
+
+def best_of(fn, arg, repeat):
+	"""
+	Returns the fastest of 'repeat' wall clock timings (in seconds) of fn(arg), along with fn's last return value.
+	"""
+	best, result = float('inf'), None
+	for _ in range(repeat):
+		start = default_timer()
+		result = fn(arg)
+		best = min(best, default_timer() - start)
+	return best, result
+
+def bench_codec(size, repeat, reference):
+	"""
+	Benchmarks encode() and decode() on a random payload of 'size' bytes, with one bit in error
+	on the decode side. Returns a list of (name, seconds, speedup over reference or None) rows.
+	"""
+	data = hamming.bytes_to_bits(urandom(size))
+	encode_time, encoded = best_of(hamming.encode, data, repeat)
+	corrupted = lambda: _flip(encoded.copy(), len(encoded) // 2)
+	decode_time, decoded = best_of(lambda e: hamming.decode(e()), corrupted, repeat)
+	assert decoded == data
+
+	rows = [["encode", encode_time, None], ["decode", decode_time, None]]
+	if reference:
+		ref_encode_time, ref_encoded = best_of(_reference_encode, data, 1)
+		ref_decode_time, ref_decoded = best_of(lambda e: _reference_decode(e()), corrupted, 1)
+		assert ref_encoded == encoded and ref_decoded == data
+		rows[0][2] = ref_encode_time / encode_time
+		rows[1][2] = ref_decode_time / decode_time
+	return rows
+
+def bench_batch(records, record_bits, repeat):
+	"""
+	Benchmarks encode_batch() and decode_batch() against per-record encode() and decode() calls on
+	'records' random records of 'record_bits' bits each. Returns a list of (name, seconds, speedup) rows.
+	"""
+	np = hamming.np
+	data = np.random.default_rng(0).integers(0, 2, (records, record_bits), dtype=np.uint8)
+	rows = [hamming.bitarray(row.tolist()) for row in data]
+
+	encode_time, encoded = best_of(hamming.encode_batch, data, repeat)
+	decode_time, (decoded, _) = best_of(hamming.decode_batch, encoded, repeat)
+	scalar_encode_time, scalar_encoded = best_of(lambda rows: [hamming.encode(row) for row in rows], rows, 1)
+	scalar_decode_time, _ = best_of(lambda rows: [hamming.decode(row) for row in rows], scalar_encoded, 1)
+	assert (decoded == data).all()
+	return [["encode_batch", encode_time, scalar_encode_time / encode_time],
+		["decode_batch", decode_time, scalar_decode_time / decode_time]]
+
+def bench_conversions(size, repeat, reference):
+	"""
+	Benchmarks bytes_to_bits() and bits_to_bytes() on a random payload of 'size' bytes, passed in as a
+	memoryview for bytes_to_bits(). Returns a list of (name, seconds, speedup over reference or None) rows.
+	"""
+	payload = urandom(size)
+	to_bits_time, bits = best_of(hamming.bytes_to_bits, memoryview(payload), repeat)
+	to_bytes_time, back = best_of(hamming.bits_to_bytes, bits, repeat)
+	assert back == payload
+
+	rows = [["bytes_to_bits", to_bits_time, None], ["bits_to_bytes", to_bytes_time, None]]
+	if reference and size <= CONVERSION_REFERENCE_LIMIT:
+		ref_to_bits_time, ref_bits = best_of(_reference_bytes_to_bits, payload, 1)
+		ref_to_bytes_time, ref_back = best_of(_reference_bits_to_bytes, bits, 1)
+		assert ref_bits == bits and ref_back == payload
+		rows[0][2] = ref_to_bits_time / to_bits_time
+		rows[1][2] = ref_to_bytes_time / to_bytes_time
+	return rows
+
+def bench_bytes(size, repeat):
+	"""
+	Benchmarks encode_bytes() and decode_bytes() against the same round trips through bytes_to_bits() and
+	bits_to_bytes() on a random payload of 'size' bytes. Returns a list of (name, seconds, speedup) rows.
+	"""
+	payload = urandom(size)
+	encode_time, encoded = best_of(hamming.encode_bytes, payload, repeat)
+	decode_time, decoded = best_of(hamming.decode_bytes, encoded, repeat)
+	bits_encode_time, bits_encoded = best_of(lambda payload: hamming.bits_to_bytes(hamming.encode(hamming.bytes_to_bits(payload))),
+		payload, repeat)
+	codeword = hamming.encode(hamming.bytes_to_bits(payload))
+	bits_decode_time, _ = best_of(lambda codeword: hamming.bits_to_bytes(hamming.decode(codeword.copy())), codeword, repeat)
+	assert bits_encoded == encoded and decoded == payload
+	return [["encode_bytes", encode_time, bits_encode_time / encode_time],
+		["decode_bytes", decode_time, bits_decode_time / decode_time]]
+
+class _Sink:
+	"""
+	A write-only binary file object that discards its input, recording when each window of 'window' bytes filled up.
+	"""
+
+	def __init__(self, window):
+		self.window, self.written, self.marks = window, 0, [default_timer()]
+
+	def write(self, data):
+		self.written += len(data)
+		while self.written >= self.window * len(self.marks):
+			self.marks.append(default_timer())
+		return len(data)
+
+def bench_stream(size, chunk_size):
+	"""
+	Streams 'size' bytes of data through encode_stream() and its output through decode_stream(), reading a
+	repeated random megabyte so the input costs nothing to produce. Returns a list of (name, MB/s per window) rows.
+	"""
+	piece = urandom(MIB)
+	source = lambda total: (piece[:min(MIB, total - offset)] for offset in range(0, total, MIB))
+	encoded_size = hamming.blocks._block_encoded_bytes(size, hamming.BLOCK_BITS)
+
+	encoded_sink = _Sink(encoded_size // STREAM_WINDOWS)
+	hamming.encode_stream(source(size), encoded_sink, chunk_size=chunk_size)
+	encoded_piece = hamming.encode_blocks(piece)
+	encoded_source = (encoded_piece[:min(len(encoded_piece), encoded_size - offset)]
+		for offset in range(0, encoded_size, len(encoded_piece)))
+	decoded_sink = _Sink(size // STREAM_WINDOWS)
+	assert hamming.decode_stream(encoded_source, decoded_sink, chunk_size=chunk_size) == []
+
+	window = size / STREAM_WINDOWS / MIB
+	throughput = lambda marks: [window / (end - start) for start, end in zip(marks, marks[1:])][:STREAM_WINDOWS]
+	return [["encode_stream", throughput(encoded_sink.marks)], ["decode_stream", throughput(decoded_sink.marks)]]
+
+def bench_parallel(size, workers):
+	"""
+	Benchmarks encode_parallel() and decode_parallel() with the given number of worker processes on a
+	'size' byte input made of a repeated random megabyte. Returns a list of (name, seconds) rows.
+	"""
+	data = urandom(MIB) * (size // MIB)
+	encode_time, encoded = best_of(lambda data: hamming.encode_parallel(data, workers=workers), data, 1)
+	decode_time, (decoded, errors) = best_of(lambda encoded: hamming.decode_parallel(encoded, workers=workers), encoded, 1)
+	assert decoded == data and errors == []
+	return [["encode_parallel", encode_time], ["decode_parallel", decode_time]]
+
+def bench_words(count, data_bits, repeat):
+	"""
+	Benchmarks encode_word() and decode_word() against encode() and decode() of int2ba() bitarrays on 'count'
+	random 'data_bits' bit words, and encode_words() and decode_words() when NumPy is available. Returns a list
+	of (name, seconds, speedup over the bitarray path) rows.
+	"""
+	rng = Random(SUITE_SEED)
+	values = [rng.getrandbits(data_bits) for _ in range(count)]
+	encoded_length = hamming.code_layout(data_bits).encoded_length
+	encode_time, encoded = best_of(lambda values: [hamming.encode_word(value, data_bits) for value in values], values, repeat)
+	decode_time, decoded = best_of(lambda encoded: [hamming.decode_word(word, data_bits)[0] for word in encoded], encoded, repeat)
+	bits_encode_time, bits_encoded = best_of(lambda values:
+		[ba2int(hamming.encode(int2ba(value, data_bits))) for value in values], values, 1)
+	bits_decode_time, _ = best_of(lambda encoded:
+		[ba2int(hamming.decode(int2ba(word, encoded_length))) for word in encoded], encoded, 1)
+	assert decoded == values and bits_encoded == encoded
+
+	rows = [["encode_word", encode_time, bits_encode_time / encode_time], ["decode_word", decode_time, bits_decode_time / decode_time]]
+	if hamming.np is not None:
+		array = hamming.np.array(values, dtype=hamming.np.uint64)
+		words_encode_time, words = best_of(lambda array: hamming.encode_words(array, data_bits), array, repeat)
+		words_decode_time, (words_decoded, _) = best_of(lambda words: hamming.decode_words(words, data_bits), words, repeat)
+		assert (words_decoded == array).all()
+		rows.append(["encode_words", words_encode_time, bits_encode_time / words_encode_time])
+		rows.append(["decode_words", words_decode_time, bits_decode_time / words_decode_time])
+	return rows
+
+def bench_lookup(count, data_bits, repeat):
+	"""
+	Benchmarks decode_lookup() against decode_word() and decode() of int2ba() bitarrays on 'count' random
+	codewords of 'data_bits' data bits, most with a single error, and on a NumPy array of them when available.
+	Returns a list of (name, seconds, speedup over the bitarray path) rows. The table is built before timing.
+	"""
+	rng = Random(SUITE_SEED)
+	encoded_length = hamming.code_layout(data_bits).encoded_length
+	encoded = [hamming.encode_word(rng.getrandbits(data_bits), data_bits) ^ (1 << rng.randrange(encoded_length + 2) >> 2)
+		for _ in range(count)]
+	hamming.decode_lookup(0, data_bits)
+	lookup_time, decoded = best_of(lambda encoded: [hamming.decode_lookup(word, data_bits) for word in encoded], encoded, repeat)
+	word_time, word_decoded = best_of(lambda encoded: [hamming.decode_word(word, data_bits) for word in encoded], encoded, repeat)
+	bits_time, _ = best_of(lambda encoded: [hamming.decode_into(int2ba(word, encoded_length), hamming.bitarray(data_bits))
+		for word in encoded], encoded, 1)
+	assert decoded == word_decoded
+
+	rows = [["decode_lookup", lookup_time, bits_time / lookup_time], ["decode_word", word_time, bits_time / word_time]]
+	if hamming.np is not None:
+		array = hamming.np.array(encoded)
+		array_time, _ = best_of(lambda array: hamming.decode_lookup(array, data_bits), array, repeat)
+		rows.append(["lookup array", array_time, bits_time / array_time])
+	return rows
+
+def bench_interleaved(size, depth, repeat):
+	"""
+	Benchmarks encode_interleaved() and decode_interleaved() at the given depth on a random payload of 'size'
+	bytes, with a burst of 'depth' errors on the decode side. Returns a list of (name, seconds, time relative
+	to encode() or decode() of the whole payload as a single codeword) rows.
+	"""
+	data = hamming.bytes_to_bits(urandom(size))
+	encode_time, encoded = best_of(lambda data: hamming.encode_interleaved(data, depth), data, repeat)
+	encoded[len(encoded) // 2:len(encoded) // 2 + depth] = ~encoded[len(encoded) // 2:len(encoded) // 2 + depth]
+	decode_time, decoded = best_of(lambda encoded: hamming.decode_interleaved(encoded, depth, len(data)), encoded, repeat)
+	single_encode_time, single = best_of(hamming.encode, data, repeat)
+	single_decode_time, _ = best_of(lambda single: hamming.decode(single.copy()), single, repeat)
+	assert decoded == data
+	return [["encode_interleaved", encode_time, encode_time / single_encode_time],
+		["decode_interleaved", decode_time, decode_time / single_decode_time]]
+
+async def _echo_round_trips(payload, messages, threshold):
+	"""
+	Sends 'messages' copies of 'payload' through a FramedStream echo server on the loopback interface, 'threshold'
+	applying to both ends, while sampling how late a task sleeping LAG_INTERVAL at a time wakes up. Returns a tuple
+	of the seconds taken and the sorted lag samples.
+	"""
+	async def echo(reader, writer):
+		stream = hamming.FramedStream(reader, writer, threshold=threshold)
+		try:
+			while True:
+				data, _ = await stream.read()
+				await stream.write(data)
+		except asyncio.IncompleteReadError:
+			stream.close()
+
+	lags, done = [], asyncio.Event()
+	async def probe():
+		loop = asyncio.get_running_loop()
+		while not done.is_set():
+			start = loop.time()
+			await asyncio.sleep(LAG_INTERVAL)
+			lags.append(loop.time() - start - LAG_INTERVAL)
+
+	server = await asyncio.start_server(echo, "127.0.0.1", 0)
+	reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+	client = hamming.FramedStream(reader, writer, threshold=threshold)
+	prober = asyncio.ensure_future(probe())
+	start = default_timer()
+	for _ in range(messages):
+		await client.write(payload)
+		assert (await client.read()) == (payload, [])
+	elapsed = default_timer() - start
+	done.set()
+	await prober
+	client.close()
+	await client.wait_closed()
+	server.close()
+	await server.wait_closed()
+	return elapsed, sorted(lags)
+
+def bench_echo(size, messages):
+	"""
+	Benchmarks FramedStream round trips of 'size' byte messages through a loopback echo server, with the codec
+	run on the event loop and offloaded to its executor. Returns a list of (name, seconds, p50, p99 and max
+	event loop lag in seconds) rows.
+	"""
+	payload = urandom(size)
+	rows = []
+	for name, threshold in (("inline", float('inf')), ("executor", hamming.ASYNC_THRESHOLD)):
+		elapsed, lags = asyncio.run(_echo_round_trips(payload, messages, threshold))
+		rows.append([name, elapsed, _percentile(lags, 0.5), _percentile(lags, 0.99), lags[-1]])
+	return rows
+
+def bench_metrics(calls, repeat):
+	"""
+	Benchmarks 'calls' calls each of encode() and decode() on 64 data bits through the hamming package with
+	metrics off, then on. Returns a list of (name, seconds off, seconds on) rows.
+	"""
+	data = hamming.bytes_to_bits(urandom(8))
+	encoded = hamming.encode(data)
+	rows = []
+	for name, fn, arg in (("encode", lambda data: [hamming.encode(data) for _ in range(calls)], data),
+			("decode", lambda encoded: [hamming.decode(encoded) for _ in range(calls)], encoded)):
+		off_time, _ = best_of(fn, arg, repeat)
+		hamming.enable_metrics()
+		on_time, _ = best_of(fn, arg, repeat)
+		hamming.disable_metrics()
+		rows.append([name, off_time, on_time])
+	hamming.reset_metrics()
+	return rows
+
+def bench_simulation(bit_error_rate, trials, loop_trials):
+	"""
+	Benchmarks simulate_channel() in this process against a loop of encode(), random flips and decode() of
+	(72,64) codewords at the given raw bit error rate. Returns a list of (name, trials per second) rows.
+	"""
+	report = hamming.simulate_channel(bit_error_rate, trials, seed=0, workers=1)
+	data, rng = hamming.bytes_to_bits(urandom(8)), Random(0)
+	start = default_timer()
+	for _ in range(loop_trials):
+		encoded = hamming.encode(data)
+		for i in range(len(encoded)):
+			if rng.random() < bit_error_rate:
+				_flip(encoded, i)
+		try:
+			hamming.decode(encoded)
+		except ValueError:
+			pass
+	return [["simulate_channel", report.trials_per_s], ["loop", loop_trials / (default_timer() - start)]]
+
+def time_samples(fn, prepare, min_time, min_samples=SUITE_MIN_SAMPLES, max_samples=SUITE_MAX_SAMPLES):
+	"""
+	Times fn(prepare()) repeatedly, only counting the call to fn, until at least min_time seconds and min_samples
+	samples have gone by (or max_samples samples). Returns the list of per-call times in seconds.
+	"""
+	samples, total = [], 0.0
+	while len(samples) < max_samples and (len(samples) < min_samples or total < min_time):
+		arg = prepare()
+		start = default_timer()
+		fn(arg)
+		samples.append(default_timer() - start)
+		total += samples[-1]
+	return samples
+
+def _percentile(ordered, fraction):
+	return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def _peak_rss_kib():
+	if getrusage is None:
+		return None
+	return getrusage(RUSAGE_SELF).ru_maxrss # KiB on Linux
+
+def _decode_reporting(encoded):
+	try:
+		return hamming.decode(encoded)
+	except ValueError: # double errors are timed up to the point they're detected
+		return None
+
+def suite_cases(bits, rng):
+	"""
+	Yields the (op, input, fn, prepare) cases timed by the suite on random inputs of 'bits' bits, where
+	fn(prepare()) is one call to time. decode() gets fresh copies of clean, single error and double error
+	codewords, since it corrects them in place.
+	"""
+	payload = rng.getrandbits(bits // hamming.BITS_PER_BYTE * hamming.BITS_PER_BYTE).to_bytes(bits // hamming.BITS_PER_BYTE, 'little') # randbytes() is 3.9+
+	data = hamming.bytes_to_bits(payload)
+	encoded = hamming.encode(data)
+	single = _flip(encoded.copy(), len(encoded) // 2)
+	double = _flip(single.copy(), len(encoded) // 3)
+
+	yield "encode", "clean", hamming.encode, lambda: data
+	for name, codeword in (("clean", encoded), ("single", single), ("double", double)):
+		yield "decode", name, _decode_reporting, codeword.copy
+	yield "bytes_to_bits", "clean", hamming.bytes_to_bits, lambda: payload
+	yield "bits_to_bytes", "clean", hamming.bits_to_bytes, lambda: data
+	yield "_calculate_parity", "clean", lambda data: hamming._calculate_parity(data, 1), lambda: data
+	yield "_data_bits_covered", "clean", lambda bits: deque(hamming._data_bits_covered(1, bits), maxlen=0), lambda: bits
+
+def import_time_samples(samples):
+	"""
+	Returns the time in seconds `import hamming` took in each of 'samples' fresh interpreters, as reported
+	by python -X importtime for the hamming package and everything it imported in turn.
+	"""
+	times = []
+	for _ in range(samples):
+		result = run([executable, "-X", "importtime", "-c", "import hamming"], cwd=path.dirname(path.abspath(__file__)),
+			capture_output=True, text=True, check=True)
+		for line in result.stderr.splitlines(): # "import time: self [us] | cumulative | imported package"
+			fields = line.split("|")
+			if len(fields) == 3 and fields[2].strip() == "hamming":
+				times.append(int(fields[1]) / 1e6)
+	return times
+
+def run_suite(sizes, min_time):
+	"""
+	Times every suite case on every size (in bits), returning a JSON-ready dictionary of the environment and
+	one result per case: ops/s and MB/s from the mean time, p50/p99 latency, and peak RSS so far. The time to
+	import hamming is the "import" case, of 0 bits.
+	"""
+	results, rng = [], Random(SUITE_SEED)
+	for bits in sizes:
+		for op, kind, fn, prepare in suite_cases(bits, rng):
+			samples = time_samples(fn, prepare, min_time)
+			ordered, mean = sorted(samples), sum(samples) / len(samples)
+			results.append({"op": op, "input": kind, "bits": bits, "samples": len(samples),
+				"ops_per_s": 1 / mean, "mb_per_s": bits / hamming.BITS_PER_BYTE / mean / MIB,
+				"p50_s": _percentile(ordered, 0.5), "p99_s": _percentile(ordered, 0.99), "peak_rss_kib": _peak_rss_kib()})
+	samples = import_time_samples(IMPORT_SAMPLES)
+	ordered, mean = sorted(samples), sum(samples) / len(samples)
+	results.append({"op": "import", "input": "cold", "bits": 0, "samples": len(samples), "ops_per_s": 1 / mean,
+		"mb_per_s": None, "p50_s": _percentile(ordered, 0.5), "p99_s": _percentile(ordered, 0.99), "peak_rss_kib": None})
+	return {"backend": hamming.current_backend(), "python": python_version(), "bitarray": bitarray_version,
+		"numpy": None if hamming.np is None else hamming.np.__version__, "peak_rss_kib": _peak_rss_kib(), "results": results}
+
+def compare_to_baseline(report, baseline, tolerance):
+	"""
+	Returns a list of (op, input, bits, baseline p50, p50) rows for every case of 'report' whose median time
+	is more than 'tolerance' slower than the same case in 'baseline'. Cases missing from 'baseline' are skipped.
+	"""
+	previous = {(row["op"], row["input"], row["bits"]): row["p50_s"] for row in baseline["results"]}
+	regressions = []
+	for row in report["results"]:
+		key = (row["op"], row["input"], row["bits"])
+		if key in previous and row["p50_s"] > previous[key] * (1 + tolerance):
+			regressions.append(key + (previous[key], row["p50_s"]))
+	return regressions
+
+def suite_main(args):
+	report = run_suite([bits for bits in SUITE_SIZES if bits <= args.max_bits], args.min_time)
+	if args.json == "-":
+		dump(report, stdout, indent=1)
+		stdout.write("\n")
+	elif args.json:
+		with open(args.json, "w") as out:
+			dump(report, out, indent=1)
+	import_time = next(row["p50_s"] for row in report["results"] if row["op"] == "import")
+	over_budget = import_time > args.import_budget
+	if over_budget:
+		stderr.write("IMPORT BUDGET exceeded: import hamming took {0:.3g}s (p50), the budget is {1:.3g}s\n".format(
+			import_time, args.import_budget))
+	if not args.baseline:
+		return 1 if over_budget else 0
+	with open(args.baseline) as previous:
+		regressions = compare_to_baseline(report, load(previous), args.tolerance)
+	for op, kind, bits, before, after in regressions:
+		stderr.write("REGRESSION {0} ({1}, {2} bits): p50 {3:.3g}s -> {4:.3g}s ({5:+.0%})\n".format(
+			op, kind, bits, before, after, after / before - 1))
+	return 1 if regressions or over_budget else 0
+
+def _flip(bits, index):
+	bits[index] = not bits[index]
+	return bits
+
+def main():
+	parser = ArgumentParser(description="Benchmark the hamming codec.")
+	parser.add_argument("sizes", nargs="*", type=int, default=PAYLOAD_SIZES, help="payload sizes in bytes")
+	parser.add_argument("--repeat", type=int, default=5, help="timings per measurement (best is reported)")
+	parser.add_argument("--no-reference", action="store_true", help="skip the per-parity reference implementation")
+	parser.add_argument("--no-batch", action="store_true", help="skip the NumPy batch API")
+	parser.add_argument("--no-conversions", action="store_true", help="skip bytes_to_bits() and bits_to_bytes()")
+	parser.add_argument("--stream-size", type=int, default=STREAM_SIZE, help="MiB to stream (0 skips streaming)")
+	parser.add_argument("--chunk-size", type=int, default=hamming.STREAM_CHUNK_SIZE, help="streaming chunk size in bytes")
+	parser.add_argument("--parallel-size", type=int, default=PARALLEL_SIZE, help="MiB to encode in parallel (0 skips it)")
+	parser.add_argument("--no-words", action="store_true", help="skip the fixed-width word codecs")
+	parser.add_argument("--no-interleaved", action="store_true", help="skip the interleaved codec")
+	parser.add_argument("--echo-size", type=int, default=ECHO_SIZE, help="bytes per echoed message (0 skips the echo server)")
+	parser.add_argument("--echo-messages", type=int, default=ECHO_MESSAGES, help="messages sent to the echo server")
+	parser.add_argument("--no-metrics", action="store_true", help="skip the overhead of metrics")
+	parser.add_argument("--no-simulation", action="store_true", help="skip the channel simulator")
+	parser.add_argument("--json", metavar="FILE", help="run the suite and write its JSON report to FILE ('-' for stdout)")
+	parser.add_argument("--baseline", metavar="FILE", help="run the suite and fail if it regressed against this JSON report")
+	parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE, help="allowed p50 slowdown before failing")
+	parser.add_argument("--min-time", type=float, default=SUITE_MIN_TIME, help="seconds to time each suite case for")
+	parser.add_argument("--max-bits", type=int, default=SUITE_SIZES[-1], help="largest suite size in bits")
+	parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET, help="seconds import hamming may take (p50)")
+	parser.add_argument("--backend", choices=hamming.available_backends(), default=hamming.current_backend(),
+		help="codec backend to time (default: %(default)s)")
+	args = parser.parse_args()
+	hamming.use_backend(args.backend)
+	if args.json or args.baseline:
+		return suite_main(args)
+
+	stdout.write("{0:>10} {1:>8} {2:>12} {3:>10} {4:>9}\n".format("bytes", "op", "seconds", "MB/s", "speedup"))
+	for size in args.sizes:
+		for name, seconds, speedup in bench_codec(size, args.repeat, not args.no_reference):
+			stdout.write("{0:>10} {1:>8} {2:>12.6f} {3:>10.2f} {4:>9}\n".format(
+				size, name, seconds, size / seconds / MIB, "-" if speedup is None else "{0:.1f}x".format(speedup)))
+
+	if not args.no_conversions:
+		stdout.write("\n{0:>10} {1:>13} {2:>12} {3:>10} {4:>9}\n".format("bytes", "op", "seconds", "MB/s", "speedup"))
+		for size in CONVERSION_SIZES:
+			for name, seconds, speedup in bench_conversions(size, args.repeat, not args.no_reference):
+				stdout.write("{0:>10} {1:>13} {2:>12.6f} {3:>10.2f} {4:>9}\n".format(
+					size, name, seconds, size / seconds / MIB, "-" if speedup is None else "{0:.1f}x".format(speedup)))
+			for name, seconds, speedup in bench_bytes(size, args.repeat):
+				stdout.write("{0:>10} {1:>13} {2:>12.6f} {3:>10.2f} {4:>8.1f}x\n".format(size, name, seconds, size / seconds / MIB, speedup))
+
+	if args.stream_size:
+		stdout.write("\n{0:>10} {1:>13}  MB/s per {2:.0f} MiB window\n".format("MiB", "op", args.stream_size / STREAM_WINDOWS))
+		for name, windows in bench_stream(args.stream_size * MIB, args.chunk_size):
+			stdout.write("{0:>10} {1:>13}  {2}\n".format(args.stream_size, name, " ".join("{0:.1f}".format(w) for w in windows)))
+
+	if args.parallel_size:
+		stdout.write("\n{0:>10} {1:>7} {2:>15} {3:>12} {4:>10} {5:>9}\n".format("MiB", "workers", "op", "seconds", "MB/s", "scaling"))
+		single = {}
+		for workers in PARALLEL_WORKERS:
+			for name, seconds in bench_parallel(args.parallel_size * MIB, workers):
+				single.setdefault(name, seconds)
+				stdout.write("{0:>10} {1:>7} {2:>15} {3:>12.6f} {4:>10.2f} {5:>8.2f}x\n".format(
+					args.parallel_size, workers, name, seconds, args.parallel_size / seconds, single[name] / seconds))
+
+	if not args.no_words:
+		stdout.write("\n{0:>12} {1:>13} {2:>12} {3:>12} {4:>9}\n".format("words", "op", "seconds", "words/s", "speedup"))
+		for data_bits in WORD_SIZES:
+			for name, seconds, speedup in bench_words(WORD_COUNT, data_bits, args.repeat):
+				stdout.write("{0:>12} {1:>13} {2:>12.6f} {3:>12.0f} {4:>8.1f}x\n".format(
+					"{0} x {1}".format(WORD_COUNT, data_bits), name, seconds, WORD_COUNT / seconds, speedup))
+		for data_bits in LOOKUP_SIZES:
+			for name, seconds, speedup in bench_lookup(WORD_COUNT, data_bits, args.repeat):
+				stdout.write("{0:>12} {1:>13} {2:>12.6f} {3:>12.0f} {4:>8.1f}x\n".format(
+					"{0} x {1}".format(WORD_COUNT, data_bits), name, seconds, WORD_COUNT / seconds, speedup))
+
+	if not args.no_interleaved:
+		stdout.write("\n{0:>10} {1:>6} {2:>18} {3:>12} {4:>10} {5:>14}\n".format("bytes", "depth", "op", "seconds", "MB/s", "vs. codeword"))
+		for depth in INTERLEAVE_DEPTHS:
+			for name, seconds, relative in bench_interleaved(INTERLEAVE_SIZE, depth, args.repeat):
+				stdout.write("{0:>10} {1:>6} {2:>18} {3:>12.6f} {4:>10.2f} {5:>13.2f}x\n".format(
+					INTERLEAVE_SIZE, depth, name, seconds, INTERLEAVE_SIZE / seconds / MIB, relative))
+
+	if args.echo_size:
+		stdout.write("\n{0:>10} {1:>9} {2:>12} {3:>10} {4:>9} {5:>9} {6:>9}\n".format(
+			"bytes", "codec", "seconds", "MB/s", "lag p50", "lag p99", "lag max"))
+		for name, seconds, p50, p99, worst in bench_echo(args.echo_size, args.echo_messages):
+			stdout.write("{0:>10} {1:>9} {2:>12.6f} {3:>10.2f} {4:>7.2f}ms {5:>7.2f}ms {6:>7.2f}ms\n".format(args.echo_size,
+				name, seconds, 2 * args.echo_size * args.echo_messages / seconds / MIB, p50 * 1000, p99 * 1000, worst * 1000))
+
+	if not args.no_metrics:
+		stdout.write("\n{0:>10} {1:>8} {2:>13} {3:>13} {4:>10}\n".format("calls", "op", "ns/call off", "ns/call on", "overhead"))
+		for name, off_time, on_time in bench_metrics(METRICS_CALLS, args.repeat):
+			stdout.write("{0:>10} {1:>8} {2:>13.0f} {3:>13.0f} {4:>9.0%}\n".format(
+				METRICS_CALLS, name, off_time / METRICS_CALLS * 1e9, on_time / METRICS_CALLS * 1e9, on_time / off_time - 1))
+
+	if hamming.np is None: # the rest needs NumPy
+		return None
+	if not args.no_batch:
+		stdout.write("\n{0:>18} {1:>13} {2:>12} {3:>10} {4:>9}\n".format("records x bits", "op", "seconds", "MB/s", "speedup"))
+		for records, record_bits in BATCH_SHAPES:
+			size = records * record_bits // hamming.BITS_PER_BYTE
+			for name, seconds, speedup in bench_batch(records, record_bits, args.repeat):
+				stdout.write("{0:>18} {1:>13} {2:>12.6f} {3:>10.2f} {4:>8.1f}x\n".format(
+					"{0} x {1}".format(records, record_bits), name, seconds, size / seconds / MIB, speedup))
+
+	if not args.no_simulation:
+		stdout.write("\n{0:>10} {1:>17} {2:>14} {3:>9}\n".format("BER", "op", "trials/s", "speedup"))
+		for bit_error_rate in SIMULATION_RATES:
+			rows = bench_simulation(bit_error_rate, SIMULATION_TRIALS, LOOP_TRIALS)
+			for name, rate in rows:
+				stdout.write("{0:>10.0e} {1:>17} {2:>14.0f} {3:>8.1f}x\n".format(bit_error_rate, name, rate, rate / rows[-1][1]))
+	return None
+
+if __name__ == '__main__':
+	exit(main())
@@ -0,0 +1,64 @@
+"""
+File:		hamming/__init__.py
+Author:		Dominic Carrano (carrano.dominic@gmail.com)
+Created:	October 16, 2026
+
+Hamming single error correction, double error detection (SECDED) codes for arbitrary
+length bitstrings, represented as Python bitarrays.
+
+Importing the package only imports the core codec, hamming.core. Everything else - the
+batch, word, interleaving, block framing, parallel, file protection, container, scrubbing,
+channel simulation, asyncio and command line APIs - lives in its own module, imported the
+first time one of its names is used, so short-lived processes only pay for what they call.
+"""
+
+from importlib import import_module
+from os import environ
+from . import core
+from .core import * # the names listed in core.__all__
+
+# public names of the modules imported on first use, by module - np is NumPy, or None if it isn't installed
+_LAZY_MODULES = {
+	'batch':      ('np', 'encode_batch', 'decode_batch'),
+	'words':      ('LOOKUP_MAX_BITS', 'LOOKUP_CACHE_SIZE', 'encode_word', 'decode_word', 'encode_words',
+		'decode_words', 'decode_lookup'),
+	'interleave': ('INTERLEAVE_BATCH_DEPTH', 'encode_interleaved', 'decode_interleaved'),
+	'blocks':     ('BATCH_BLOCKS', 'STREAM_CHUNK_SIZE', 'encode_blocks', 'decode_blocks', 'encode_stream',
+		'decode_stream'),
+	'parallel':   ('PARALLEL_CHUNK_SIZE', 'encode_parallel', 'decode_parallel'),
+	'files':      ('SIDECAR_SUFFIX', 'SIDECAR_MAGIC', 'SIDECAR_HEADER', 'FileReport', 'protect_file', 'verify_file'),
+	'container':  ('CONTAINER_MAGIC', 'CONTAINER_HEADER', 'Container', 'encode_container', 'open_container'),
+	'simulate':   ('SIMULATION_BATCH', 'SIMULATION_CHUNK', 'SimulationReport', 'simulate_channel'),
+	'scrubber':   ('SCRUB_CHUNK_SIZE', 'CHECKPOINT_INTERVAL', 'ScrubReport', 'scrub'),
+	'aio':        ('ASYNC_THRESHOLD', 'FRAME_HEADER', 'FRAME_MAX_SIZE', 'encode_async', 'decode_async',
+		'encode_blocks_async', 'decode_blocks_async', 'FramedStream'),
+	'metrics':    ('FunctionMetrics', 'enable_metrics', 'disable_metrics', 'reset_metrics', 'metrics_snapshot'),
+	'cli':        ('main',),
+}
+_LAZY_NAMES = {name: module for module, names in _LAZY_MODULES.items() for name in names}
+
+# what 'from hamming import *' imports - the core API, and every name of the modules imported on first use but
+# np and the command line's main, which would shadow the importer's own and are only reachable as hamming.np/main
+__all__ = core.__all__ + [name for name in _LAZY_NAMES if name not in ('np', 'main')]
+
+def __getattr__(name: str):
+	"""
+	Imports the module holding 'name' on first use, keeping the name around so later lookups skip this function.
+	Any other name is looked up in the core, so its private helpers stay reachable as hamming._helper.
+	"""
+	if name in _LAZY_MODULES:
+		return import_module('.' + name, __name__)
+	if name in _LAZY_NAMES:
+		value = getattr(import_module('.' + _LAZY_NAMES[name], __name__), name)
+		globals()[name] = value
+		return value
+	if hasattr(core, name): # not kept around, since use_backend() changes the core's _accelerator
+		return getattr(core, name)
+	raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
+def __dir__():
+	return sorted(set(globals()) | set(_LAZY_NAMES) | set(_LAZY_MODULES))
+
+# metrics are enabled before anyone can import the API functions by name, when asked for through the environment
+if environ.get('HAMMING_METRICS'):
+	import_module('.metrics', __name__).enable_metrics()
@@ -0,0 +1,11 @@
+"""
+File:		hamming/__main__.py
+Author:		Dominic Carrano (carrano.dominic@gmail.com)
+Created:	October 16, 2026
+
+Entry point of `python -m hamming`, see hamming.cli.
+"""
+from hamming.cli import main
+
+if __name__ == '__main__':
+	exit(main())
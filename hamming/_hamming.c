@@ -0,0 +1,369 @@
+/*
+File:		hamming/_hamming.c
+Author:		Dominic Carrano (carrano.dominic@gmail.com)
+Created:	October 16, 2026
+
+Optional C accelerator for the hamming package, built by setup.py. Implements the encode, decode and data
+extraction kernels over the raw buffers of big-endian bitarrays (bit i is bit 7 - i % 8 of byte i / 8).
+hamming.core works out every codeword length itself and falls back to pure Python when this module isn't built.
+
+Codeword layout: index 0 is the overall parity bit, every power of two is a parity bit, and the data bits
+fill the remaining indices from 3 on, in order.
+*/
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <string.h>
+
+#define NO_ERROR     (-1)
+#define DOUBLE_ERROR (-2)
+
+static inline int get_bit(const unsigned char *buffer, Py_ssize_t index)
+{
+	return (buffer[index >> 3] >> (7 - (index & 7))) & 1;
+}
+
+static inline void set_bit(unsigned char *buffer, Py_ssize_t index, int value)
+{
+	unsigned char mask = (unsigned char) (0x80 >> (index & 7));
+	if (value)
+		buffer[index >> 3] |= mask;
+	else
+		buffer[index >> 3] &= (unsigned char) ~mask;
+}
+
+static inline int is_power_of_two(Py_ssize_t n)
+{
+	return n && !(n & (n - 1));
+}
+
+/* XOR of the positions (0 = most significant) of the set bits of every byte value, and its parity */
+static unsigned char byte_xor[256];
+static unsigned char byte_parity[256];
+
+static void init_tables(void)
+{
+	int value, position;
+	for (value = 0; value < 256; value++) {
+		for (position = 0; position < 8; position++) {
+			if (value & (0x80 >> position)) {
+				byte_xor[value] ^= (unsigned char) position;
+				byte_parity[value] ^= 1;
+			}
+		}
+	}
+}
+
+/* Copies 'count' bits from bit src_start of src to bit dst_start of dst, a byte at a time once dst is aligned. */
+static void copy_bits(unsigned char *dst, Py_ssize_t dst_start, const unsigned char *src, Py_ssize_t src_start,
+	Py_ssize_t count)
+{
+	Py_ssize_t bytes, i;
+	int shift;
+	const unsigned char *from;
+	unsigned char *to;
+
+	while (count > 0 && (dst_start & 7)) {
+		set_bit(dst, dst_start++, get_bit(src, src_start++));
+		count--;
+	}
+	bytes = count >> 3;
+	shift = (int) (src_start & 7);
+	from = src + (src_start >> 3);
+	to = dst + (dst_start >> 3);
+	if (shift == 0)
+		memcpy(to, from, (size_t) bytes);
+	else /* every byte straddles two source bytes, both inside the range copied */
+		for (i = 0; i < bytes; i++)
+			to[i] = (unsigned char) ((from[i] << shift) | (from[i + 1] >> (8 - shift)));
+	dst_start += bytes << 3;
+	src_start += bytes << 3;
+	count -= bytes << 3;
+	while (count-- > 0)
+		set_bit(dst, dst_start++, get_bit(src, src_start++));
+}
+
+/* Returns the XOR of the indices of the set bits among the first n bits of the byte aligned codeword, setting
+   *parity to their parity. Bits past n in its last byte are ignored. */
+static Py_ssize_t syndrome_of(const unsigned char *codeword, Py_ssize_t n, int *parity)
+{
+	Py_ssize_t syndrome = 0, byte, full = n >> 3;
+	int odd = 0;
+	unsigned char value;
+	for (byte = 0; byte < full; byte++) {
+		value = codeword[byte];
+		if (byte_parity[value])
+			syndrome ^= byte << 3;
+		syndrome ^= byte_xor[value];
+		odd ^= byte_parity[value];
+	}
+	if (n & 7) {
+		value = codeword[full] & (unsigned char) (0xFF00 >> (n & 7));
+		if (byte_parity[value])
+			syndrome ^= full << 3;
+		syndrome ^= byte_xor[value];
+		odd ^= byte_parity[value];
+	}
+	*parity = odd;
+	return syndrome;
+}
+
+/* Writes the n bit codeword of the data bits from bit data_start of data on to the byte aligned codeword,
+   clearing every bit of its last byte past n. */
+static void encode_codeword(const unsigned char *data, Py_ssize_t data_start, unsigned char *codeword, Py_ssize_t n)
+{
+	Py_ssize_t syndrome, power, data_index = 0, run_length, parity_bit;
+	int overall;
+
+	/* data bits fill the runs of indices strictly between consecutive powers of two */
+	memset(codeword, 0, (size_t) ((n + 7) >> 3));
+	for (power = 2; power + 1 < n; power <<= 1) {
+		run_length = (2 * power < n ? 2 * power : n) - power - 1;
+		copy_bits(codeword, power + 1, data, data_start + data_index, run_length);
+		data_index += run_length;
+	}
+
+	/* with every parity bit still zero, the syndrome has exactly the bits set whose parity bits need to be 1 */
+	syndrome = syndrome_of(codeword, n, &overall);
+	for (parity_bit = 1; parity_bit < n; parity_bit <<= 1) {
+		if (syndrome & parity_bit) {
+			set_bit(codeword, parity_bit, 1);
+			overall ^= 1;
+		}
+	}
+	set_bit(codeword, 0, overall);
+}
+
+/* Writes the (corrected) data bits of the n bit byte aligned codeword to bit out_start of out, returning its
+   status: NO_ERROR, DOUBLE_ERROR, or the index of the bit in error. */
+static Py_ssize_t decode_codeword(const unsigned char *codeword, Py_ssize_t n, unsigned char *out, Py_ssize_t out_start)
+{
+	Py_ssize_t syndrome, status, power, data_index = 0, run_length;
+	int overall;
+
+	syndrome = syndrome_of(codeword, n, &overall);
+	if (syndrome && !overall)          /* two errors found */
+		status = DOUBLE_ERROR;
+	else if (syndrome >= n)            /* bad overall parity, but no single bit explains the syndrome */
+		status = DOUBLE_ERROR;
+	else if (overall)                  /* one error found */
+		status = syndrome;
+	else
+		status = NO_ERROR;
+
+	for (power = 2; power + 1 < n; power <<= 1) {
+		run_length = (2 * power < n ? 2 * power : n) - power - 1;
+		copy_bits(out, out_start + data_index, codeword, power + 1, run_length);
+		data_index += run_length;
+	}
+
+	/* the bit in error is a data bit - flip it in the output, where it's preceded by status - 1 - bits
+	   data bits, 'bits' being the number of parity bits below it (the bit length of status - 1) */
+	if (status > 0 && !is_power_of_two(status)) {
+		Py_ssize_t below = status - 1, bits = 0;
+		while (below) {
+			bits++;
+			below >>= 1;
+		}
+		data_index = out_start + status - 1 - bits;
+		set_bit(out, data_index, !get_bit(out, data_index));
+	}
+	return status;
+}
+
+/* Writes the data bits of the n bit byte aligned codeword, as received, to the start of out. */
+static void extract_codeword(const unsigned char *codeword, Py_ssize_t n, unsigned char *out)
+{
+	Py_ssize_t power, data_index = 0, run_length;
+	for (power = 2; power + 1 < n; power <<= 1) {
+		run_length = (2 * power < n ? 2 * power : n) - power - 1;
+		copy_bits(out, data_index, codeword, power + 1, run_length);
+		data_index += run_length;
+	}
+}
+
+static int check_bits(const Py_buffer *buffer, Py_ssize_t bits, const char *name)
+{
+	if (bits < 0 || buffer->len < (bits + 7) / 8) {
+		PyErr_Format(PyExc_ValueError, "%s buffer of %zd bytes can't hold %zd bits", name, buffer->len, bits);
+		return 0;
+	}
+	return 1;
+}
+
+PyDoc_STRVAR(encode_doc,
+"encode(data, k, n, out)\n\
+\n\
+Writes the n bit Hamming SECDED codeword of the first k bits of data to the first n bits of out.");
+
+static PyObject *hamming_encode(PyObject *self, PyObject *args)
+{
+	Py_buffer data, out;
+	Py_ssize_t k, n;
+	if (!PyArg_ParseTuple(args, "y*nnw*", &data, &k, &n, &out))
+		return NULL;
+	if (check_bits(&data, k, "data") && check_bits(&out, n, "output")) {
+		Py_BEGIN_ALLOW_THREADS
+		encode_codeword(data.buf, 0, out.buf, n);
+		Py_END_ALLOW_THREADS
+	}
+	PyBuffer_Release(&data);
+	PyBuffer_Release(&out);
+	if (PyErr_Occurred())
+		return NULL;
+	Py_RETURN_NONE;
+}
+
+PyDoc_STRVAR(decode_doc,
+"decode(encoded, n, k, out) -> status\n\
+\n\
+Writes the (corrected) k data bits of the n bit codeword at the start of encoded to the first k bits of out,\n\
+and returns its status. encoded is left as is.");
+
+static PyObject *hamming_decode(PyObject *self, PyObject *args)
+{
+	Py_buffer encoded, out;
+	Py_ssize_t k, n, status = 0;
+	if (!PyArg_ParseTuple(args, "y*nnw*", &encoded, &n, &k, &out))
+		return NULL;
+	if (check_bits(&encoded, n, "encoded") && check_bits(&out, k, "output")) {
+		Py_BEGIN_ALLOW_THREADS
+		status = decode_codeword(encoded.buf, n, out.buf, 0);
+		Py_END_ALLOW_THREADS
+	}
+	PyBuffer_Release(&encoded);
+	PyBuffer_Release(&out);
+	if (PyErr_Occurred())
+		return NULL;
+	return PyLong_FromSsize_t(status);
+}
+
+PyDoc_STRVAR(extract_doc,
+"extract(encoded, n, k, out)\n\
+\n\
+Writes the k data bits of the n bit codeword at the start of encoded, as received, to the first k bits of out.");
+
+static PyObject *hamming_extract(PyObject *self, PyObject *args)
+{
+	Py_buffer encoded, out;
+	Py_ssize_t k, n;
+	if (!PyArg_ParseTuple(args, "y*nnw*", &encoded, &n, &k, &out))
+		return NULL;
+	if (check_bits(&encoded, n, "encoded") && check_bits(&out, k, "output")) {
+		Py_BEGIN_ALLOW_THREADS
+		extract_codeword(encoded.buf, n, out.buf);
+		Py_END_ALLOW_THREADS
+	}
+	PyBuffer_Release(&encoded);
+	PyBuffer_Release(&out);
+	if (PyErr_Occurred())
+		return NULL;
+	Py_RETURN_NONE;
+}
+
+PyDoc_STRVAR(encode_blocks_doc,
+"encode_blocks(data, blocks, k, n, out)\n\
+\n\
+Writes the n bit codewords of each of the first 'blocks' blocks of k bits of data back to back to out.");
+
+static PyObject *hamming_encode_blocks(PyObject *self, PyObject *args)
+{
+	Py_buffer data, out;
+	Py_ssize_t blocks, k, n, block;
+	unsigned char *codeword = NULL;
+	if (!PyArg_ParseTuple(args, "y*nnnw*", &data, &blocks, &k, &n, &out))
+		return NULL;
+	if (check_bits(&data, blocks * k, "data") && check_bits(&out, blocks * n, "output")) {
+		/* codewords of a whole number of bytes are built in place, others one at a time in a scratch buffer */
+		if (n & 7 && (codeword = PyMem_Malloc((size_t) ((n + 7) >> 3))) == NULL)
+			PyErr_NoMemory();
+		else {
+			Py_BEGIN_ALLOW_THREADS
+			for (block = 0; block < blocks; block++) {
+				if (codeword == NULL)
+					encode_codeword(data.buf, block * k, (unsigned char *) out.buf + ((block * n) >> 3), n);
+				else {
+					encode_codeword(data.buf, block * k, codeword, n);
+					copy_bits(out.buf, block * n, codeword, 0, n);
+				}
+			}
+			Py_END_ALLOW_THREADS
+		}
+	}
+	PyMem_Free(codeword);
+	PyBuffer_Release(&data);
+	PyBuffer_Release(&out);
+	if (PyErr_Occurred())
+		return NULL;
+	Py_RETURN_NONE;
+}
+
+PyDoc_STRVAR(decode_blocks_doc,
+"decode_blocks(encoded, blocks, n, k, out) -> errors\n\
+\n\
+Decodes the first 'blocks' back to back n bit codewords of encoded, writing their k bit blocks of data\n\
+back to back to out. Returns the list of (block index, status) pairs of every block that wasn't error free.");
+
+static PyObject *hamming_decode_blocks(PyObject *self, PyObject *args)
+{
+	Py_buffer encoded, out;
+	Py_ssize_t blocks, k, n, block, status;
+	unsigned char *codeword = NULL;
+	PyObject *errors, *error;
+	if (!PyArg_ParseTuple(args, "y*nnnw*", &encoded, &blocks, &n, &k, &out))
+		return NULL;
+	errors = PyList_New(0);
+	if (errors != NULL && check_bits(&encoded, blocks * n, "encoded") && check_bits(&out, blocks * k, "output")) {
+		/* codewords of a whole number of bytes are decoded in place, others are first copied to a scratch buffer */
+		if (n & 7 && (codeword = PyMem_Malloc((size_t) ((n + 7) >> 3))) == NULL)
+			PyErr_NoMemory();
+		else {
+			for (block = 0; block < blocks; block++) {
+				if (codeword == NULL)
+					status = decode_codeword((unsigned char *) encoded.buf + ((block * n) >> 3), n, out.buf, block * k);
+				else {
+					copy_bits(codeword, 0, encoded.buf, block * n, n);
+					status = decode_codeword(codeword, n, out.buf, block * k);
+				}
+				if (status == NO_ERROR)
+					continue;
+				error = Py_BuildValue("(nn)", block, status);
+				if (error == NULL || PyList_Append(errors, error) < 0) {
+					Py_XDECREF(error);
+					break;
+				}
+				Py_DECREF(error);
+			}
+		}
+	}
+	PyMem_Free(codeword);
+	PyBuffer_Release(&encoded);
+	PyBuffer_Release(&out);
+	if (PyErr_Occurred()) {
+		Py_XDECREF(errors);
+		return NULL;
+	}
+	return errors;
+}
+
+static PyMethodDef hamming_methods[] = {
+	{"encode", hamming_encode, METH_VARARGS, encode_doc},
+	{"decode", hamming_decode, METH_VARARGS, decode_doc},
+	{"extract", hamming_extract, METH_VARARGS, extract_doc},
+	{"encode_blocks", hamming_encode_blocks, METH_VARARGS, encode_blocks_doc},
+	{"decode_blocks", hamming_decode_blocks, METH_VARARGS, decode_blocks_doc},
+	{NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef hamming_module = {
+	PyModuleDef_HEAD_INIT,
+	"hamming._hamming",
+	"C kernels for hamming.core - see hamming.use_backend().",
+	-1,
+	hamming_methods
+};
+
+PyMODINIT_FUNC PyInit__hamming(void)
+{
+	init_tables();
+	return PyModule_Create(&hamming_module);
+}
@@ -0,0 +1,109 @@
+"""
+File:		hamming/aio.py
+Author:		Dominic Carrano (carrano.dominic@gmail.com)
+Created:	October 16, 2026
+
+The codec from asyncio coroutines, and framed messages over asyncio streams.
+"""
+
+from asyncio import get_running_loop
+from bitarray import bitarray
+from struct import Struct
+from .blocks import decode_blocks, encode_blocks, _block_encoded_bytes
+from .core import BITS_PER_BYTE, BLOCK_BITS, DOUBLE_ERROR, DecodeCounters, decode, encode
+
+# data bits at or above which the async API hands its work to an executor instead of running it on the event loop -
+# encoding 16 KiB takes about a millisecond
+ASYNC_THRESHOLD = 1 << 17
+
+# FramedStream messages are preceded by their length in bytes, sent as a single (72,64) codeword, and may be
+# no longer than FRAME_MAX_SIZE bytes by default
+FRAME_HEADER   = Struct('>Q')
+FRAME_MAX_SIZE = 1 << 30
+
+# ASYNCIO - the codec from coroutines, with anything large enough to stall the event loop run in an executor
+
+async def encode_async(data: bitarray, executor=None, threshold: int = ASYNC_THRESHOLD):
+	"""
+	Returns encode(data), computed on the event loop's executor (or 'executor', if given) when 'data' holds at
+	least 'threshold' bits, so that the loop stays responsive.
+	"""
+	return await _run_async(encode, data, len(data), executor, threshold)
+
+async def decode_async(encoded: bitarray, executor=None, threshold: int = ASYNC_THRESHOLD):
+	"""
+	Returns decode(encoded), computed on the event loop's executor (or 'executor', if given) when 'encoded'
+	holds at least 'threshold' bits.
+	"""
+	return await _run_async(decode, encoded, len(encoded), executor, threshold)
+
+async def encode_blocks_async(data, block_bits: int = BLOCK_BITS, executor=None, threshold: int = ASYNC_THRESHOLD):
+	"""
+	Returns encode_blocks(data, block_bits), computed on the event loop's executor (or 'executor', if given)
+	when 'data' holds at least 'threshold' bits.
+	"""
+	return await _run_async(encode_blocks, data, len(data) * BITS_PER_BYTE, executor, threshold, block_bits)
+
+async def decode_blocks_async(encoded, block_bits: int = BLOCK_BITS, executor=None, threshold: int = ASYNC_THRESHOLD):
+	"""
+	Returns decode_blocks(encoded, block_bits), computed on the event loop's executor (or 'executor', if given)
+	when 'encoded' holds at least 'threshold' bits.
+	"""
+	return await _run_async(decode_blocks, encoded, len(encoded) * BITS_PER_BYTE, executor, threshold, block_bits)
+
+async def _run_async(function, argument, bits: int, executor, threshold: int, *args):
+	if bits < threshold:
+		return function(argument, *args)
+	return await get_running_loop().run_in_executor(executor, function, argument, *args)
+
+class FramedStream:
+	"""
+	Sends and receives whole messages over an asyncio StreamReader and StreamWriter pair, such as the ones
+	given by asyncio.open_connection(). Each message is sent as its length in a single (72,64) codeword,
+	followed by its encode_blocks() encoding for block_bits. Both ends must use the same block_bits.
+	"""
+
+	def __init__(self, reader, writer, block_bits: int = BLOCK_BITS, executor=None, threshold: int = ASYNC_THRESHOLD,
+		max_size: int = FRAME_MAX_SIZE):
+		self.reader     = reader
+		self.writer     = writer
+		self.block_bits = block_bits
+		self.executor   = executor
+		self.threshold  = threshold
+		self.max_size   = max_size
+
+	async def read(self, counters: DecodeCounters = None):
+		"""
+		Receives one message, returning a tuple of its data and the (block index, status) pairs of every block
+		that wasn't error free, as decode_blocks() does. Raises asyncio.IncompleteReadError if the stream ends
+		first, and a ValueError if the length of the message can't be trusted.
+		"""
+		header_bytes = _block_encoded_bytes(FRAME_HEADER.size, BLOCK_BITS)
+		header, header_errors = decode_blocks(await self.reader.readexactly(header_bytes))
+		if header_errors and header_errors[0][1] == DOUBLE_ERROR:
+			raise ValueError("Two errors detected in a frame header.")
+		length, = FRAME_HEADER.unpack(header)
+		if length > self.max_size:
+			raise ValueError("Frame of {0} bytes exceeds the maximum of {1}.".format(length, self.max_size))
+
+		encoded = await self.reader.readexactly(_block_encoded_bytes(length, self.block_bits))
+		data, errors = await decode_blocks_async(encoded, self.block_bits, self.executor, self.threshold)
+		if counters is not None:
+			counters.add_errors(-(-length * BITS_PER_BYTE // self.block_bits), errors)
+		return data, errors
+
+	async def write(self, data):
+		"""
+		Sends the bytes-like 'data' as one message, waiting for the writer to drain.
+		"""
+		if len(data) > self.max_size:
+			raise ValueError("Frame of {0} bytes exceeds the maximum of {1}.".format(len(data), self.max_size))
+		self.writer.write(encode_blocks(FRAME_HEADER.pack(len(data))))
+		self.writer.write(await encode_blocks_async(data, self.block_bits, self.executor, self.threshold))
+		await self.writer.drain()
+
+	def close(self):
+		self.writer.close()
+
+	async def wait_closed(self):
+		await self.writer.wait_closed()
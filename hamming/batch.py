@@ -0,0 +1,114 @@
+"""
+File:		hamming/batch.py
+Author:		Dominic Carrano (carrano.dominic@gmail.com)
+Created:	October 16, 2026
+
+The batch API: many records of the same length encoded and decoded at once as the rows of NumPy arrays.
+The only module of the package that imports NumPy - the others get it from here, if at all.
+"""
+
+from functools import lru_cache
+from .core import BITS_PER_BYTE, LAYOUT_CACHE_SIZE, NO_ERROR, DOUBLE_ERROR, DecodeCounters, code_layout, _encoded_layout
+
+try:
+	import numpy as np
+except ImportError: # only the batch API needs NumPy - everything else just runs faster with it
+	np = None
+
+# BATCH API - requires NumPy. Records are the rows of 2-D uint8 arrays holding one bit (0 or 1) per entry
+
+def encode_batch(data):
+	"""
+	Given an (N, k) array of N data records of k bits each, returns the (N, n) array of their Hamming SECDED
+	codewords. Row i of the result is identical to encode() of row i.
+	"""
+	data = _bit_matrix(data)
+	layout = code_layout(data.shape[1])
+	masks = _batch_masks(data.shape[1])
+
+	# set data bits, a whole run of columns at a time, leaving every parity bit zero
+	encoded = np.zeros((data.shape[0], layout.encoded_length), dtype=np.uint8)
+	data_index = 0
+	for start, stop in layout.runs:
+		encoded[:, start:stop] = data[:, data_index:data_index + stop - start]
+		data_index += stop - start
+
+	# set parity bits - each is the parity of the packed codeword under the parity bit's coverage mask
+	packed  = np.packbits(encoded, axis=1)
+	overall = _row_parity(packed)
+	for parity_bit_index, mask in zip(layout.parity_positions, masks):
+		encoded[:, parity_bit_index] = _row_parity(packed & mask)
+		overall ^= encoded[:, parity_bit_index]
+
+	# set the overall parity bit, which covers the data and parity bits alike
+	encoded[:, 0] = overall
+	return encoded
+
+def decode_batch(encoded, counters: DecodeCounters = None):
+	"""
+	Given an (N, n) array of N Hamming SECDED codewords, returns a tuple of the (N, k) array of their
+	(corrected) data and an array of N statuses: NO_ERROR, DOUBLE_ERROR, or the index of the single
+	bit that was corrected. Rows with a double error hold their data as received instead of raising.
+	The statuses are also tallied into 'counters', if given.
+	"""
+	encoded = _bit_matrix(encoded)
+	layout = _encoded_layout(encoded.shape[1])
+	masks = _batch_masks(layout.data_length)
+
+	# syndrome of every codeword - bit j is set if parity bit 2 ** j disagrees with the bits it covers
+	packed   = np.packbits(encoded, axis=1)
+	syndrome = np.zeros(encoded.shape[0], dtype=np.int64)
+	for parity_bit_index, mask in zip(layout.parity_positions, masks):
+		syndrome[_row_parity(packed & mask).astype(bool)] |= parity_bit_index
+	overall_correct = _row_parity(packed) == 0
+
+	# classify - a bad overall parity with a syndrome pointing past the codeword is at least three errors
+	single = ~overall_correct & (syndrome < layout.encoded_length)
+	status = np.full(encoded.shape[0], NO_ERROR, dtype=np.int64)
+	status[single] = syndrome[single]
+	status[~overall_correct & ~single] = DOUBLE_ERROR
+	status[overall_correct & (syndrome != 0)] = DOUBLE_ERROR
+
+	# flip every bit in error and extract the data, a whole run of columns at a time
+	rows = np.flatnonzero(single)
+	encoded[rows, syndrome[rows]] ^= 1
+	data = np.empty((encoded.shape[0], layout.data_length), dtype=np.uint8)
+	data_index = 0
+	for start, stop in layout.runs:
+		data[:, data_index:data_index + stop - start] = encoded[:, start:stop]
+		data_index += stop - start
+	if counters is not None:
+		counters.add_array(status)
+	return data, status
+
+def _bit_matrix(bits):
+	"""
+	Returns the given 2-D array-like of bits as a new uint8 array of zeros and ones.
+	"""
+	if np is None:
+		raise ImportError("The batch API requires NumPy.")
+	bits = np.asarray(bits)
+	if bits.ndim != 2:
+		raise ValueError("Expected a 2-D array with one record per row, got {0} dimension(s).".format(bits.ndim))
+	return (bits != 0).astype(np.uint8)
+
+def _row_parity(packed):
+	"""
+	Returns the parity of every row of a 2-D array of packed bits, as a uint8 array.
+	"""
+	return _byte_parities()[np.bitwise_xor.reduce(packed, axis=1)]
+
+@lru_cache(maxsize=1)
+def _byte_parities():
+	"""
+	Returns a lookup table of the parity of every byte value.
+	"""
+	return np.array([bin(byte).count('1') & 1 for byte in range(1 << BITS_PER_BYTE)], dtype=np.uint8)
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _batch_masks(data_length: int):
+	"""
+	Returns the coverage masks of code_layout(data_length), packed into bytes the same way np.packbits
+	packs a codeword.
+	"""
+	return [np.frombuffer(mask.tobytes(), dtype=np.uint8) for mask in code_layout(data_length).masks]
@@ -0,0 +1,224 @@
+"""
+File:		hamming/blocks.py
+Author:		Dominic Carrano (carrano.dominic@gmail.com)
+Created:	October 16, 2026
+
+Block framing of byte strings, whole or streamed. Imports NumPy (through the batch module) only once a
+block needs encoding or decoding without the C accelerator.
+"""
+
+from bitarray import bitarray
+from . import core
+from .core import BITS_PER_BYTE, BLOCK_BITS, NO_ERROR, DecodeCounters, bytes_to_bits, code_layout, encode, _decode
+
+# blocks handed to the batch API at a time when block framing with NumPy available - a multiple of 8, so every
+# batch of codewords fills a whole number of bytes
+BATCH_BLOCKS = 1 << 16
+
+# data bytes encode_stream() reads at a time by default, rounded to a whole number of block groups
+STREAM_CHUNK_SIZE = 1 << 20
+
+# BLOCK FRAMING - long byte strings are split into fixed-size blocks of data bits, each its own codeword,
+# so that every block can correct its own single error and costs the same to encode no matter the input size
+
+def encode_blocks(data, block_bits: int = BLOCK_BITS):
+	"""
+	Splits the bytes-like 'data' into blocks of block_bits data bits and returns the Hamming SECDED codewords
+	of every block, packed back to back into bytes. The last byte is padded with zeros on the right.
+
+	Every block is encoded exactly as encode() encodes it: block_bits=64 gives the standard (72,64) codewords
+	and block_bits=32 the (39,32) ones. If the data doesn't split evenly, the bits left over make up one last,
+	shorter block.
+	"""
+	return _encode_block_bits(bytes_to_bits(data), block_bits).tobytes()
+
+def decode_blocks(encoded, block_bits: int = BLOCK_BITS, counters: DecodeCounters = None):
+	"""
+	Given the bytes-like output of encode_blocks() for the same block_bits, returns a tuple of the decoded
+	data and a list of (block index, status) pairs for every block that wasn't error free. A status is either
+	DOUBLE_ERROR or the index of the corrected bit within the block's codeword. Blocks with a double error
+	hold their data as received instead of raising. Every block is also tallied into 'counters', if given.
+	"""
+	data_length = _block_data_length(len(encoded), block_bits)
+	data, errors = _decode_block_bits(bytes_to_bits(encoded), data_length * BITS_PER_BYTE, block_bits)
+	if counters is not None:
+		counters.add_errors(-(-data_length * BITS_PER_BYTE // block_bits), errors)
+	return data.tobytes(), errors
+
+def _encode_block_bits(bits: bitarray, block_bits: int):
+	"""
+	Returns the concatenated codewords of every block_bits long block of the bitstring bits, the last
+	block being shorter if block_bits doesn't divide its length.
+	"""
+	if block_bits <= 0:
+		raise ValueError("Blocks must hold a positive number of data bits.")
+	full_blocks = len(bits) // block_bits
+	encoded = bitarray(endian='big')
+	accelerated = core._accelerator is not None and bits.endian == 'big' and full_blocks
+	np = _numpy() if full_blocks and not accelerated else None
+
+	if accelerated:
+		encoded_length = code_layout(block_bits).encoded_length
+		encoded = bitarray(full_blocks * encoded_length, endian='big')
+		core._accelerator.encode_blocks(bits, full_blocks, block_bits, encoded_length, encoded)
+	elif np is not None: # encode full blocks in batches, each packing into a whole number of bytes
+		from .batch import encode_batch
+		encoded_length = code_layout(block_bits).encoded_length
+		for first in range(0, full_blocks, BATCH_BLOCKS):
+			blocks = min(BATCH_BLOCKS, full_blocks - first)
+			chunk = bits[first * block_bits:(first + blocks) * block_bits].tobytes()
+			matrix = np.unpackbits(np.frombuffer(chunk, dtype=np.uint8), count=blocks * block_bits)
+			encoded.frombytes(np.packbits(encode_batch(matrix.reshape(blocks, block_bits))).tobytes())
+			del encoded[(first + blocks) * encoded_length:] # drop the padding of a partial last byte
+	else:
+		for start in range(0, full_blocks * block_bits, block_bits):
+			encoded += encode(bits[start:start + block_bits])
+
+	if len(bits) % block_bits:
+		encoded += encode(bits[full_blocks * block_bits:])
+	return encoded
+
+def _decode_block_bits(encoded: bitarray, data_length: int, block_bits: int):
+	"""
+	Decodes the concatenated block codewords at the start of 'encoded' holding data_length data bits in all,
+	returning a tuple of the decoded data bitstring and the (block index, status) pairs of every block that
+	wasn't error free.
+	"""
+	full_blocks = data_length // block_bits
+	encoded_length = code_layout(block_bits).encoded_length if full_blocks else 0
+	data, errors = bitarray(endian='big'), []
+	accelerated = core._accelerator is not None and encoded.endian == 'big' and full_blocks
+	np = _numpy() if full_blocks and not accelerated else None
+
+	if accelerated:
+		data = bitarray(full_blocks * block_bits, endian='big')
+		errors = core._accelerator.decode_blocks(encoded, full_blocks, encoded_length, block_bits, data)
+	elif np is not None: # decode full blocks in batches, each packing into a whole number of bytes
+		from .batch import decode_batch
+		for first in range(0, full_blocks, BATCH_BLOCKS):
+			blocks = min(BATCH_BLOCKS, full_blocks - first)
+			chunk = encoded[first * encoded_length:(first + blocks) * encoded_length].tobytes()
+			matrix = np.unpackbits(np.frombuffer(chunk, dtype=np.uint8), count=blocks * encoded_length)
+			decoded, status = decode_batch(matrix.reshape(blocks, encoded_length))
+			data.frombytes(np.packbits(decoded).tobytes())
+			del data[(first + blocks) * block_bits:] # drop the padding of a partial last byte
+			errors.extend((first + int(i), int(status[i])) for i in np.flatnonzero(status != NO_ERROR))
+	else:
+		for block in range(full_blocks):
+			decoded, status = _decode(encoded[block * encoded_length:(block + 1) * encoded_length])
+			data += decoded
+			if status != NO_ERROR:
+				errors.append((block, status))
+
+	if data_length % block_bits:
+		start = full_blocks * encoded_length
+		tail_length = code_layout(data_length % block_bits).encoded_length
+		decoded, status = _decode(encoded[start:start + tail_length])
+		data += decoded
+		if status != NO_ERROR:
+			errors.append((full_blocks, status))
+	return data, errors
+
+def _numpy():
+	"""
+	Returns the NumPy module if it's installed, else None. Imported on first call rather than with this module,
+	so that block framing through the C accelerator never pays for importing NumPy.
+	"""
+	from .batch import np
+	return np
+
+def _block_encoded_length(data_length: int, block_bits: int):
+	"""
+	Returns the number of bits encode_blocks() produces for data_length data bits, before padding.
+	"""
+	full_blocks, leftover = divmod(data_length, block_bits)
+	encoded_length = full_blocks * code_layout(block_bits).encoded_length if full_blocks else 0
+	return encoded_length + (code_layout(leftover).encoded_length if leftover else 0)
+
+def _block_encoded_bytes(data_bytes: int, block_bits: int):
+	"""
+	Returns the number of bytes encode_blocks() produces for data_bytes data bytes.
+	"""
+	return -(-_block_encoded_length(data_bytes * BITS_PER_BYTE, block_bits) // BITS_PER_BYTE)
+
+def _block_data_length(encoded_bytes: int, block_bits: int):
+	"""
+	Returns the number of data bytes whose encode_blocks() output is encoded_bytes bytes long.
+
+	Every extra data byte adds at least 8 bits of codeword, so at most one data length fits, and a binary
+	search finds it. Raises a ValueError if there is none.
+	"""
+	if block_bits <= 0:
+		raise ValueError("Blocks must hold a positive number of data bits.")
+	low, high = 0, encoded_bytes
+	while low < high:
+		middle = (low + high) // 2
+		if _block_encoded_bytes(middle, block_bits) < encoded_bytes:
+			low = middle + 1
+		else:
+			high = middle
+	if _block_encoded_bytes(low, block_bits) != encoded_bytes:
+		raise ValueError("No data encodes to {0} bytes of {1}-bit blocks.".format(encoded_bytes, block_bits))
+	return low
+
+# STREAMING - block framing over binary file objects and iterators of byte chunks, in constant memory
+
+def encode_stream(src, dst, block_bits: int = BLOCK_BITS, chunk_size: int = STREAM_CHUNK_SIZE):
+	"""
+	Reads data from 'src', a binary file object or an iterable of bytes-like chunks, and writes its
+	encode_blocks() encoding to the binary file object 'dst' as it goes. Returns the number of bytes written.
+
+	Data is read about chunk_size bytes at a time, rounded to a multiple of block_bits bytes so that every
+	chunk encodes to a whole number of bytes. The output is identical to encode_blocks() of all the data.
+	"""
+	data_chunk, _ = _stream_chunk_sizes(block_bits, chunk_size)
+	written = 0
+	for chunk in _stream_chunks(src, data_chunk):
+		encoded = encode_blocks(chunk, block_bits)
+		dst.write(encoded)
+		written += len(encoded)
+	return written
+
+def decode_stream(src, dst, block_bits: int = BLOCK_BITS, chunk_size: int = STREAM_CHUNK_SIZE,
+	counters: DecodeCounters = None):
+	"""
+	Reads the output of encode_stream() or encode_blocks() for the same block_bits from 'src', a binary file
+	object or an iterable of bytes-like chunks, and writes the decoded data to the binary file object 'dst'
+	as it goes. Returns the (block index, status) pairs of every block that wasn't error free, as
+	decode_blocks() does, and tallies every block into 'counters', if given.
+	"""
+	data_chunk, encoded_chunk = _stream_chunk_sizes(block_bits, chunk_size)
+	blocks_per_chunk = data_chunk * BITS_PER_BYTE // block_bits
+	errors = []
+	for index, chunk in enumerate(_stream_chunks(src, encoded_chunk)):
+		# chunks are whole groups of codewords, all full blocks except maybe in the last chunk
+		data, chunk_errors = decode_blocks(chunk, block_bits, counters)
+		dst.write(data)
+		errors.extend((index * blocks_per_chunk + block, status) for block, status in chunk_errors)
+	return errors
+
+def _stream_chunk_sizes(block_bits: int, chunk_size: int):
+	"""
+	Returns the (data, encoded) byte sizes of the chunks streamed for the given block and chunk size. Chunks
+	hold a multiple of 8 blocks, so that both their data and their codewords fill a whole number of bytes.
+	"""
+	if block_bits <= 0:
+		raise ValueError("Blocks must hold a positive number of data bits.")
+	groups = max(1, chunk_size // block_bits) # groups of 8 blocks, each block_bits bytes of data
+	return groups * block_bits, groups * code_layout(block_bits).encoded_length
+
+def _stream_chunks(src, size: int):
+	"""
+	Yields the contents of 'src', a binary file object or an iterable of bytes-like chunks, in chunks of
+	exactly 'size' bytes, except for a shorter last chunk.
+	"""
+	pieces = iter(lambda: src.read(size), b'') if hasattr(src, 'read') else src
+	pending = bytearray()
+	for piece in pieces:
+		pending += piece
+		while len(pending) >= size:
+			yield bytes(pending[:size])
+			del pending[:size]
+	if pending:
+		yield bytes(pending)
+	return None
@@ -0,0 +1,114 @@
+"""
+File:		hamming/cli.py
+Author:		Dominic Carrano (carrano.dominic@gmail.com)
+Created:	October 16, 2026
+
+The command line interface, run with `python -m hamming`.
+"""
+
+from argparse import ArgumentParser
+from json import dump
+from sys import stderr, stdin, stdout
+from time import monotonic
+from .blocks import decode_stream, encode_stream
+from .core import BLOCK_BITS, DOUBLE_ERROR
+from .files import SIDECAR_SUFFIX, protect_file, verify_file
+from .scrubber import scrub
+
+# seconds between the progress lines `python -m hamming scrub` writes to standard error
+PROGRESS_INTERVAL = 1.0
+
+# COMMAND LINE INTERFACE - python -m hamming
+
+def main(argv: list = None):
+	"""
+	Runs the command line interface: protect, verify, repair or scrub files through sidecar files, or encode
+	and decode whole streams with the block framing API. Returns the exit status.
+	"""
+	parser = ArgumentParser(prog="python -m hamming", description="Hamming SECDED protection for files and streams.")
+	commands = parser.add_subparsers(dest="command")
+	commands.required = True
+	for command, summary in (("protect", "write a sidecar file of parity bits for FILE"),
+			("verify", "check FILE against its sidecar file"),
+			("repair", "check FILE against its sidecar file, correcting single errors in place")):
+		subparser = commands.add_parser(command, help=summary)
+		subparser.add_argument("file", metavar="FILE")
+		subparser.add_argument("--sidecar", help="sidecar file (default: FILE{0})".format(SIDECAR_SUFFIX))
+		if command == "protect":
+			subparser.add_argument("--block-bits", type=int, default=BLOCK_BITS, help="data bits per block (a multiple of 8)")
+	subparser = commands.add_parser("scrub", help="check every protected file under each PATH, correcting single errors in place")
+	subparser.add_argument("paths", metavar="PATH", nargs="+", help="protected file, or directory searched for protected files")
+	subparser.add_argument("--workers", type=int, help="threads (or processes) checking files (default: one per CPU)")
+	subparser.add_argument("--processes", action="store_true", help="check files in worker processes rather than threads")
+	subparser.add_argument("--bandwidth", type=float, help="MB/s of protected data to check at most")
+	subparser.add_argument("--checkpoint", metavar="FILE", help="JSON file to save progress to and resume from")
+	subparser.add_argument("--report", metavar="FILE", help="JSON file to write the final metrics to")
+	subparser.add_argument("--no-repair", action="store_true", help="only report errors, leaving the files as they are")
+	for command, summary in (("encode", "encode SRC into DST as SECDED blocks"), ("decode", "decode the SECDED blocks in SRC into DST")):
+		subparser = commands.add_parser(command, help=summary)
+		subparser.add_argument("src", metavar="SRC", nargs="?", default="-", help="input file (default: standard input)")
+		subparser.add_argument("dst", metavar="DST", nargs="?", default="-", help="output file (default: standard output)")
+		subparser.add_argument("--block-bits", type=int, default=BLOCK_BITS, help="data bits per block")
+	args = parser.parse_args(argv)
+
+	if args.command == "protect":
+		stdout.write("wrote {0}\n".format(protect_file(args.file, args.sidecar, args.block_bits)))
+		return 0
+	if args.command in ("verify", "repair"):
+		report = verify_file(args.file, args.sidecar, repair=args.command == "repair")
+		for offset in report.corrected:
+			stdout.write("{0} single error in block at byte offset {1}\n".format("corrected" if report.repaired else "found", offset))
+		for offset in report.uncorrectable:
+			stdout.write("uncorrectable error in block at byte offset {0}\n".format(offset))
+		stdout.write("{0} blocks checked: {1} {2}, {3} uncorrectable\n".format(report.blocks, len(report.corrected),
+			"corrected" if report.repaired else "correctable", len(report.uncorrectable)))
+		return 1 if report.uncorrectable or (report.corrected and not report.repaired) else 0
+
+	if args.command == "scrub":
+		return _scrub_main(args)
+
+	src = stdin.buffer if args.src == "-" else open(args.src, 'rb')
+	dst = stdout.buffer if args.dst == "-" else open(args.dst, 'wb')
+	try:
+		if args.command == "encode":
+			encode_stream(src, dst, args.block_bits)
+			return 0
+		errors = decode_stream(src, dst, args.block_bits)
+		uncorrectable = [block for block, status in errors if status == DOUBLE_ERROR]
+		for block in uncorrectable:
+			stderr.write("uncorrectable error in block {0}\n".format(block))
+		return 1 if uncorrectable else 0
+	finally:
+		if src is not stdin.buffer:
+			src.close()
+		if dst is not stdout.buffer:
+			dst.close()
+
+def _scrub_main(args):
+	"""
+	Runs `python -m hamming scrub`, writing a progress line to standard error every PROGRESS_INTERVAL seconds.
+	"""
+	last = monotonic()
+
+	def progress(report):
+		nonlocal last
+		if monotonic() - last >= PROGRESS_INTERVAL:
+			stderr.write(_scrub_summary(report) + "\n")
+			last = monotonic()
+
+	report = scrub(args.paths, repair=not args.no_repair, workers=args.workers, processes=args.processes,
+		bandwidth=args.bandwidth * 1e6 if args.bandwidth else None, checkpoint=args.checkpoint, progress=progress)
+	for name, offset in report.corrected:
+		stdout.write("{0} single error in {1} block at byte offset {2}\n".format("corrected" if report.repaired else "found", name, offset))
+	for name, offset in report.uncorrectable:
+		stdout.write("uncorrectable error in {0} block at byte offset {1}\n".format(name, offset))
+	stdout.write(_scrub_summary(report) + "\n")
+	if args.report:
+		with open(args.report, "w") as report_file:
+			dump(report.as_dict(), report_file, indent=1)
+	return 1 if report.uncorrectable or (report.corrected and not report.repaired) else 0
+
+def _scrub_summary(report):
+	return "{0} files, {1} blocks ({2:.1f} MB) checked in {3:.1f}s at {4:.0f} blocks/s: {5} {6}, {7} uncorrectable".format(
+		report.files, report.blocks, report.bytes_scanned / 1e6, report.elapsed, report.blocks_per_s, len(report.corrected),
+		"corrected" if report.repaired else "correctable", len(report.uncorrectable))
@@ -0,0 +1,143 @@
+"""
+File:		hamming/container.py
+Author:		Dominic Carrano (carrano.dominic@gmail.com)
+Created:	October 16, 2026
+
+Random-access containers of protected data, in memory or in memory mapped files.
+"""
+
+from mmap import mmap, ACCESS_READ, ACCESS_WRITE
+from struct import Struct
+from bitarray import bitarray
+from bitarray.util import zeros
+from .core import (BITS_PER_BYTE, BLOCK_BITS, DOUBLE_ERROR, NO_ERROR, DecodeCounters, bytes_to_bits, code_layout,
+	encode, _decode)
+
+# containers start with a header of a magic number, the data bits and codeword bits per block, the length in
+# bytes of the data and the number of blocks
+CONTAINER_MAGIC  = b'HAMMCONT'
+CONTAINER_HEADER = Struct('>8sIIQQ')
+
+# CONTAINERS - after the header, every block of the data is stored as its systematic codeword (see encode()),
+# padded to a whole number of bytes, so block i always starts at the same offset and a read only decodes the
+# blocks it covers. The data is padded with zeros to a whole number of blocks
+
+class Container:
+	"""
+	Random access to the data held in the bytes-like container 'buffer', as written by encode_container() -
+	bytes, a bytearray or a memory map. Every read decodes just the blocks it covers, correcting single errors
+	and raising a ValueError on two. With repair=True, single errors are also corrected in 'buffer' itself,
+	which must then be writable.
+	"""
+
+	def __init__(self, buffer, repair: bool = False):
+		magic, block_bits, encoded_length, data_length, blocks = CONTAINER_HEADER.unpack_from(buffer)
+		if magic != CONTAINER_MAGIC:
+			raise ValueError("Not a container written by encode_container().")
+		layout = _container_layout(block_bits)
+		if encoded_length != layout.encoded_length or blocks != -(-data_length * BITS_PER_BYTE // block_bits):
+			raise ValueError("The container's header is corrupt.")
+		self.stride      = -(-encoded_length // BITS_PER_BYTE)
+		if len(buffer) < CONTAINER_HEADER.size + blocks * self.stride:
+			raise ValueError("The container is truncated.")
+		self.block_bits  = block_bits
+		self.data_length = data_length
+		self.blocks      = blocks
+		self.repair      = repair
+		self._buffer     = buffer
+		self._view       = memoryview(buffer)
+
+	def __repr__(self):
+		return "Container(block_bits={0}, data_length={1}, blocks={2}, repair={3})".format(
+			self.block_bits, self.data_length, self.blocks, self.repair)
+
+	def __len__(self):
+		return self.data_length
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc_info):
+		self.close()
+
+	def read_range(self, offset: int, length: int, counters: DecodeCounters = None):
+		"""
+		Returns the 'length' bytes of data starting at byte 'offset', decoding only the blocks holding them.
+		Every block decoded is also tallied into 'counters', if given.
+		"""
+		if offset < 0 or length < 0 or offset + length > self.data_length:
+			raise IndexError("Bytes {0} to {1} out of range for {2} bytes of data.".format(
+				offset, offset + length, self.data_length))
+		block_bytes = self.block_bits // BITS_PER_BYTE
+		first, stop = offset // block_bytes, -(-(offset + length) // block_bytes)
+		data = bytearray()
+		for block in range(first, stop):
+			data += self._read_block(block, counters)
+		start = offset - first * block_bytes
+		return bytes(data[start:start + length])
+
+	def read_block(self, index: int, counters: DecodeCounters = None):
+		"""
+		Returns the data of block 'index', padding included for the last block.
+		"""
+		if not 0 <= index < self.blocks:
+			raise IndexError("Block {0} out of range for {1} blocks.".format(index, self.blocks))
+		return self._read_block(index, counters)
+
+	def close(self):
+		"""
+		Releases the container's buffer, closing it if it's a memory map.
+		"""
+		self._view.release()
+		if isinstance(self._buffer, mmap):
+			self._buffer.close()
+		return None
+
+	def _read_block(self, index: int, counters: DecodeCounters):
+		"""
+		Decodes block 'index', returning its data as bytes.
+		"""
+		slot = CONTAINER_HEADER.size + index * self.stride
+		codeword = bitarray(endian='big')
+		codeword.frombytes(self._view[slot:slot + self.stride])
+		del codeword[code_layout(self.block_bits).encoded_length:]
+		data, status = _decode(codeword, True)
+		if counters is not None:
+			counters.add(status)
+		if status == DOUBLE_ERROR:
+			raise ValueError("Two errors detected in block {0}.".format(index))
+		if status != NO_ERROR and self.repair:
+			self._view[slot:slot + self.stride] = codeword.tobytes()
+		return data.tobytes()
+
+def encode_container(data, block_bits: int = BLOCK_BITS):
+	"""
+	Returns a container holding the bytes-like 'data', split into blocks of block_bits data bits, which must be
+	a whole number of bytes. Read it back with Container, or open_container() once written to a file.
+	"""
+	layout = _container_layout(block_bits)
+	bits = bytes_to_bits(data)
+	data_length, blocks = len(bits) // BITS_PER_BYTE, -(-len(bits) // block_bits)
+	bits.extend(zeros(blocks * block_bits - len(bits), endian='big'))
+	container = bytearray(CONTAINER_HEADER.pack(CONTAINER_MAGIC, block_bits, layout.encoded_length, data_length, blocks))
+	for start in range(0, len(bits), block_bits):
+		container += encode(bits[start:start + block_bits], systematic=True).tobytes()
+	return bytes(container)
+
+def open_container(path: str, repair: bool = False):
+	"""
+	Returns a Container reading the container file at 'path' through a memory map, which repair=True opens
+	for writing. Use it as a context manager, or close() it, to release the map.
+	"""
+	with open(path, 'r+b' if repair else 'rb') as file:
+		file_map = mmap(file.fileno(), 0, access=ACCESS_WRITE if repair else ACCESS_READ)
+	return Container(file_map, repair)
+
+def _container_layout(block_bits: int):
+	"""
+	Returns the CodeLayout of a container block of block_bits data bits, raising a ValueError unless
+	block_bits is a positive, whole number of bytes.
+	"""
+	if block_bits <= 0 or block_bits % BITS_PER_BYTE:
+		raise ValueError("Container blocks must hold a positive, whole number of bytes.")
+	return code_layout(block_bits)
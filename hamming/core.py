@@ -0,0 +1,889 @@
+"""
+File:		hamming/core.py
+Author:		Dominic Carrano (carrano.dominic@gmail.com)
+Created:	December 18, 2017
+
+Implementation of Hamming single error correction, double error detection
+(SECDED) codes for arbitrary length bitstrings, represented as Python bitarrays.
+All parity bits use even parity.
+
+This is the core codec, imported along with the hamming package itself - the other
+modules of the package build on it and are only imported once first used.
+
+For more, see: https://en.wikipedia.org/wiki/Hamming_code
+"""
+
+from array import array
+from bitarray import bitarray, frozenbitarray
+from bitarray.util import count_and, parity
+from enum import IntEnum
+from functools import lru_cache
+from math import floor, ceil, log2
+
+try:
+	from bitarray.util import xor_indices
+except ImportError: # bitarray < 3.2 - fall back to one masked popcount per parity bit, see _syndrome
+	xor_indices = None
+
+try:
+	from . import _hamming
+except ImportError: # the C accelerator isn't built (see setup.py) - everything runs in pure Python instead
+	_hamming = None
+
+# the core API, which the hamming package re-exports as its own
+__all__ = ['BITS_PER_BYTE', 'LAYOUT_CACHE_SIZE', 'BLOCK_BITS', 'NO_ERROR', 'DOUBLE_ERROR', 'encode', 'encode_into',
+	'decode', 'decode_ex', 'decode_into', 'DecodeStatus', 'DecodeResult', 'DecodeCounters', 'available_backends',
+	'current_backend', 'use_backend', 'CodeLayout', 'code_layout', 'to_systematic', 'from_systematic', 'decode_view',
+	'EncodedBuffer', 'bytes_to_bits', 'bits_to_bytes', 'encode_bytes', 'decode_bytes']
+
+# kernels of the backend in use, picked at import time - the C accelerator if built, see use_backend()
+_accelerator = _hamming
+
+BITS_PER_BYTE = 8
+
+# maximum number of distinct data lengths whose CodeLayout is kept around, see code_layout()
+LAYOUT_CACHE_SIZE = 64
+
+# data bits per block used by the block framing API by default, giving the standard (72,64) codewords
+BLOCK_BITS = 64
+
+# statuses of a decoded codeword, as reported by decode_batch() and decode_blocks() - any other
+# (non-negative) status is the index of the bit that was corrected
+NO_ERROR     = -1
+DOUBLE_ERROR = -2
+
+# CORE API
+
+def encode(data: bitarray, systematic: bool = False):
+	"""
+	Given a bitstring 'data', returns a new bitstring containing the original bits
+	and Hamming (even) parity bits to allow for SECDED.
+
+	If 'systematic' is set, the codeword uses the systematic layout instead, see to_systematic().
+	"""
+	# positions of every bit in the codeword, shared by all codewords with this many data bits
+	layout = code_layout(len(data))
+
+	# the Hamming SECDED encoded bitstring
+	encoded = bitarray(layout.encoded_length)
+	if systematic:
+		_encode_systematic(data, encoded, layout)
+	else:
+		_encode_into(data, encoded, layout)
+
+	# all done!
+	return encoded
+
+def encode_into(data: bitarray, out: bitarray):
+	"""
+	Like encode(), but writes the codeword of 'data' into the preallocated bitstring 'out' instead of
+	returning a new one. 'out' must hold exactly as many bits as encode(data) would.
+	"""
+	layout = code_layout(len(data))
+	if len(out) != layout.encoded_length:
+		raise ValueError("Expected an output of {0} bits, got {1}.".format(layout.encoded_length, len(out)))
+	_encode_into(data, out, layout)
+
+def decode(encoded: bitarray, systematic: bool = False):
+	"""
+	Given a bitstring 'encoded' with Hamming SECDED parity bits, returns the original data bitstring,
+	correcting single errors and reporting if two errors are found.
+
+	If 'systematic' is set, 'encoded' is taken to use the systematic layout, see to_systematic().
+	"""
+	decoded, status = _decode(encoded, systematic)
+	if status == DOUBLE_ERROR:
+		raise ValueError("Two errors detected.")
+	return decoded
+
+def decode_ex(encoded: bitarray, systematic: bool = False):
+	"""
+	Like decode(), but reports rather than raises: returns a DecodeResult holding the (corrected) data
+	bitstring, a DecodeStatus and the index of the bit that was corrected, if any.
+	"""
+	decoded, status = _decode(encoded, systematic)
+	if status == NO_ERROR:
+		return DecodeResult(decoded, DecodeStatus.CLEAN, None)
+	elif status == DOUBLE_ERROR:
+		return DecodeResult(decoded, DecodeStatus.UNCORRECTABLE, None)
+	position = _systematic_index(status, _encoded_layout(len(encoded))) if systematic else status
+	if status == 0:
+		return DecodeResult(decoded, DecodeStatus.CORRECTED_OVERALL_PARITY, position)
+	return DecodeResult(decoded, DecodeStatus.CORRECTED, position)
+
+def decode_into(encoded: bitarray, out: bitarray, fix: bool = False):
+	"""
+	Like decode(), but writes the (corrected) data of the codeword 'encoded' into the preallocated bitstring
+	'out', which must hold exactly as many bits as decode(encoded) would, and returns its status instead of
+	raising: NO_ERROR, DOUBLE_ERROR, or the index of the corrected bit. 'encoded' is left as is, unless
+	'fix' is set, in which case the bit in error is also flipped in 'encoded'.
+	"""
+	layout = _encoded_layout(len(encoded))
+	if len(out) != layout.data_length:
+		raise ValueError("Expected an output of {0} bits, got {1}.".format(layout.data_length, len(out)))
+	return _decode_into(encoded, out, layout, fix)
+
+# DECODE RESULTS - structured outcomes of decode_ex(), and counts of them for the batch, block and stream APIs
+
+class DecodeStatus(IntEnum):
+	"""
+	The outcome of decoding one codeword.
+	"""
+	CLEAN                    = 0 # no error found
+	CORRECTED                = 1 # a single data or parity bit was in error and has been flipped
+	CORRECTED_OVERALL_PARITY = 2 # only the overall parity bit was in error
+	UNCORRECTABLE            = 3 # two (or more) errors found, the data is as received
+
+class DecodeResult:
+	"""
+	What decode_ex() found in a codeword: the decoded 'data', its DecodeStatus and the codeword index of the
+	corrected bit in 'position' (None unless the status is CORRECTED or CORRECTED_OVERALL_PARITY).
+	"""
+	__slots__ = ('data', 'status', 'position')
+
+	def __init__(self, data: bitarray, status: DecodeStatus, position: int):
+		self.data     = data
+		self.status   = status
+		self.position = position
+
+	def __repr__(self):
+		return "DecodeResult(data={0!r}, status=DecodeStatus.{1}, position={2!r})".format(
+			self.data, self.status.name, self.position)
+
+class DecodeCounters:
+	"""
+	Running totals of codewords per DecodeStatus. Pass one as 'counters' to decode_batch(), decode_interleaved(),
+	decode_blocks(), decode_stream(), decode_parallel() or a Container's reads to tally every codeword they
+	decode, without building a result per codeword.
+	"""
+	__slots__ = ('clean', 'corrected', 'corrected_overall_parity', 'uncorrectable')
+
+	def __init__(self):
+		self.clean                    = 0
+		self.corrected                = 0
+		self.corrected_overall_parity = 0
+		self.uncorrectable            = 0
+
+	def __repr__(self):
+		return "DecodeCounters(clean={0}, corrected={1}, corrected_overall_parity={2}, uncorrectable={3})".format(
+			self.clean, self.corrected, self.corrected_overall_parity, self.uncorrectable)
+
+	@property
+	def total(self):
+		"""
+		The number of codewords counted so far.
+		"""
+		return self.clean + self.corrected + self.corrected_overall_parity + self.uncorrectable
+
+	def add(self, status: int):
+		"""
+		Counts one codeword with the given status, as returned by _decode() or decode_batch().
+		"""
+		if status == NO_ERROR:
+			self.clean += 1
+		elif status == DOUBLE_ERROR:
+			self.uncorrectable += 1
+		elif status == 0:
+			self.corrected_overall_parity += 1
+		else:
+			self.corrected += 1
+
+	def add_errors(self, codewords: int, errors: list):
+		"""
+		Counts 'codewords' codewords, all clean but those in the (index, status) pairs of 'errors'.
+		"""
+		self.clean += codewords - len(errors)
+		for _, status in errors:
+			self.add(status)
+
+	def add_array(self, statuses):
+		"""
+		Counts one codeword per entry of the NumPy array of statuses 'statuses', as returned by decode_batch().
+		"""
+		errors = statuses[statuses != NO_ERROR]
+		uncorrectable = int((errors == DOUBLE_ERROR).sum())
+		overall = int((errors == 0).sum())
+		self.clean                    += statuses.size - errors.size
+		self.uncorrectable            += uncorrectable
+		self.corrected_overall_parity += overall
+		self.corrected                += errors.size - uncorrectable - overall
+
+	def as_dict(self):
+		"""
+		Returns the counts as a dictionary keyed by DecodeStatus.
+		"""
+		return {DecodeStatus.CLEAN: self.clean, DecodeStatus.CORRECTED: self.corrected,
+			DecodeStatus.CORRECTED_OVERALL_PARITY: self.corrected_overall_parity,
+			DecodeStatus.UNCORRECTABLE: self.uncorrectable}
+
+# BACKENDS - the codeword kernels run in C when the optional _hamming extension is built, or else in pure Python.
+# Both give identical results; the C kernels only handle big-endian bitarrays, others always use Python
+
+def available_backends():
+	"""
+	Returns the names of the backends that can be used: 'python', and 'c' if the accelerator is built.
+	"""
+	return ['python'] if _hamming is None else ['python', 'c']
+
+def current_backend():
+	"""
+	Returns the name of the backend in use.
+	"""
+	return 'python' if _accelerator is None else 'c'
+
+def use_backend(name: str):
+	"""
+	Switches every codec function of this module (in this process) to the named backend, one of
+	available_backends().
+	"""
+	global _accelerator
+	if name not in available_backends():
+		raise ValueError("Backend {0!r} is not available, pick one of {1}.".format(name, available_backends()))
+	_accelerator = _hamming if name == 'c' else None
+
+# CODEWORD LAYOUTS - which codeword index holds which bit only depends on the number of data bits
+
+class CodeLayout:
+	"""
+	The positions of the data and parity bits in a Hamming SECDED codeword holding 'data_length' data bits.
+
+	Build these through code_layout() rather than directly, so that every codeword of a given data length
+	shares a single layout.
+	"""
+
+	def __init__(self, data_length: int):
+		self.data_length      = data_length
+		self.num_parity_bits  = _num_parity_bits_needed(data_length)
+		self.encoded_length   = data_length + self.num_parity_bits + 1 # need +1 for the overall parity bit
+		self.parity_positions = tuple(_powers_of_two(self.num_parity_bits))
+		self.runs             = tuple(_data_runs(self.encoded_length))
+		self._data_positions  = None
+		self._masks           = None
+
+	def __repr__(self):
+		return "CodeLayout(data_length={0}, num_parity_bits={1}, encoded_length={2})".format(
+			self.data_length, self.num_parity_bits, self.encoded_length)
+
+	@property
+	def data_positions(self):
+		"""
+		An array whose i-th entry is the codeword index holding data bit i. Built on first use.
+		"""
+		if self._data_positions is None:
+			positions = array('L')
+			for start, stop in self.runs:
+				positions.extend(range(start, stop))
+			self._data_positions = positions
+		return self._data_positions
+
+	@property
+	def masks(self):
+		"""
+		A tuple of (big endian) frozenbitarrays, one per parity bit, of the codeword indices each parity bit
+		covers - that is, every index with the parity bit's index set, the parity bit itself included.
+		Built on first use.
+		"""
+		if self._masks is None:
+			masks = []
+			for parity_bit_index in self.parity_positions:
+				pattern = bitarray(parity_bit_index << 1, endian='big')
+				pattern.setall(0)
+				pattern[parity_bit_index:] = 1
+				mask = pattern * (self.encoded_length // len(pattern) + 1)
+				masks.append(frozenbitarray(mask[:self.encoded_length]))
+			self._masks = tuple(masks)
+		return self._masks
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def code_layout(data_length: int):
+	"""
+	Returns the CodeLayout for codewords holding 'data_length' data bits, from a bounded LRU cache
+	of recently used layouts. Use code_layout.cache_info() to inspect the cache's hits and misses.
+	"""
+	return CodeLayout(data_length)
+
+# SYSTEMATIC LAYOUT - the same codewords with their bits reordered: the data bits first, contiguous from index 0,
+# then a trailer of the parity bits in order (1, 2, 4, ...) and the overall parity bit last. Data that fills whole
+# bytes then sits byte-aligned at the start of the codeword, where a clean read can use it without copying
+
+def to_systematic(encoded: bitarray):
+	"""
+	Returns the systematic layout of the codeword 'encoded', as produced by encode(data, systematic=True).
+	"""
+	layout = _encoded_layout(len(encoded))
+	systematic = _extract_data(encoded, layout)
+	systematic.extend(encoded[parity_bit_index] for parity_bit_index in layout.parity_positions)
+	systematic.append(encoded[0])
+	return systematic
+
+def from_systematic(systematic: bitarray):
+	"""
+	Returns the codeword whose systematic layout is 'systematic', as produced by encode(data).
+	"""
+	layout = _encoded_layout(len(systematic))
+	encoded = bitarray(layout.encoded_length)
+	data_index = 0
+	for start, stop in layout.runs:
+		encoded[start:stop] = systematic[data_index:data_index + stop - start]
+		data_index += stop - start
+	for i, parity_bit_index in enumerate(layout.parity_positions):
+		encoded[parity_bit_index] = systematic[layout.data_length + i]
+	encoded[0] = systematic[-1]
+	return encoded
+
+def decode_view(encoded: bitarray):
+	"""
+	Decodes the systematic codeword 'encoded', a big endian bitarray whose data bits fill whole bytes, returning
+	a memoryview of the bytes of 'encoded' holding its data rather than a copy of them. Single errors are
+	corrected in 'encoded' itself, or in a copy of the data if 'encoded' is read-only, and two errors raise a
+	ValueError, as with decode().
+
+	A bytes-like object holding a codeword of a whole number of bytes, e.g. a (72,64) one, can be wrapped
+	without a copy as bitarray(buffer=...).
+	"""
+	layout = _encoded_layout(len(encoded))
+	if layout.data_length % BITS_PER_BYTE or encoded.endian != 'big':
+		raise ValueError("Expected a big endian codeword of whole data bytes, got {0} {1} endian data bits.".format(
+			layout.data_length, encoded.endian))
+	status = _systematic_status(encoded, layout)
+	if status == DOUBLE_ERROR:
+		raise ValueError("Two errors detected.")
+
+	view = memoryview(encoded)[:layout.data_length // BITS_PER_BYTE]
+	if status >= 0:
+		index = _systematic_index(status, layout)
+		if not encoded.readonly:
+			encoded[index] = not encoded[index]
+		elif index < layout.data_length: # the bit in error is a data bit we can't fix in place
+			data = bytearray(view)
+			data[index // BITS_PER_BYTE] ^= 0x80 >> index % BITS_PER_BYTE
+			view = memoryview(data)
+	return view
+
+# INCREMENTAL UPDATES - a data bit at codeword index q is covered by exactly the parity bits set in q, so changing
+# it flips just those parity bits and the overall parity bit rather than calling for a full re-encode
+
+class EncodedBuffer:
+	"""
+	A mutable Hamming SECDED codeword, 'encoded', whose data bits can be changed in place with set_data_bit() and
+	write_range(). Each change only updates the parity bits covering the changed bits, leaving 'encoded' exactly
+	as encode() would have produced it from the changed data.
+
+	The codeword is wrapped, not copied, and is assumed to be valid - decode() it first if it may hold errors.
+	"""
+
+	def __init__(self, encoded: bitarray):
+		self.layout  = _encoded_layout(len(encoded))
+		self.encoded = encoded
+
+	def __repr__(self):
+		return "EncodedBuffer({0!r})".format(self.encoded)
+
+	@classmethod
+	def from_data(cls, data: bitarray):
+		"""
+		Returns an EncodedBuffer holding the encoding of 'data'.
+		"""
+		return cls(encode(data))
+
+	@property
+	def data(self):
+		"""
+		A copy of the data bits of the codeword.
+		"""
+		return _extract_data(self.encoded, self.layout)
+
+	def get_data_bit(self, index: int):
+		"""
+		Returns data bit 'index' of the codeword.
+		"""
+		return self.encoded[self._position(index)]
+
+	def set_data_bit(self, index: int, value: int):
+		"""
+		Sets data bit 'index' of the codeword to 'value', updating its parity bits in O(log n).
+		"""
+		position = self._position(index)
+		if self.encoded[position] != bool(value):
+			self.encoded[position] = not self.encoded[position]
+			self._fix_parity(position, 1)
+
+	def write_range(self, offset: int, bits: bitarray):
+		"""
+		Overwrites the data bits starting at data bit 'offset' with 'bits', updating the parity bits once for
+		the whole range - in O(log n) per bit that actually changes.
+		"""
+		if offset < 0 or offset + len(bits) > self.layout.data_length:
+			raise IndexError("Data bits {0} to {1} out of range for {2} data bits.".format(
+				offset, offset + len(bits), self.layout.data_length))
+		bits = bitarray(bits, endian=self.encoded.endian) # XOR needs both operands to share an endianness
+
+		# XOR together the indices of every changed bit, along with how many changed, run by run
+		syndrome, changed, data_index, stop_index = 0, 0, 0, offset + len(bits)
+		for start, stop in self.layout.runs:
+			lo, hi = max(offset, data_index), min(stop_index, data_index + stop - start)
+			if lo < hi:
+				position = start + lo - data_index
+				difference = self.encoded[position:position + hi - lo] ^ bits[lo - offset:hi - offset]
+				for i in difference.search(1):
+					syndrome ^= position + i
+				changed += difference.count()
+				self.encoded[position:position + hi - lo] = bits[lo - offset:hi - offset]
+			data_index += stop - start
+		self._fix_parity(syndrome, changed)
+
+	def _position(self, index: int):
+		"""
+		Returns the codeword index of data bit 'index', raising an IndexError if there is no such bit.
+		"""
+		if not 0 <= index < self.layout.data_length:
+			raise IndexError("Data bit {0} out of range for {1} data bits.".format(index, self.layout.data_length))
+		return self.layout.data_positions[index]
+
+	def _fix_parity(self, syndrome: int, changed: int):
+		"""
+		Restores a zero syndrome and even overall parity after 'changed' data bits whose indices XOR to
+		'syndrome' were flipped - every power of two below the codeword's length is one of its parity bits.
+		"""
+		flipped = 0
+		for parity_bit_index in self.layout.parity_positions:
+			if syndrome & parity_bit_index:
+				self.encoded[parity_bit_index] = not self.encoded[parity_bit_index]
+				flipped += 1
+		if (changed + flipped) & 1:
+			self.encoded[0] = not self.encoded[0]
+
+# HELPER FUNCTIONS - The functions' names begin with an underscore to denote these being module private
+
+def _decode(encoded: bitarray, systematic: bool = False):
+	"""
+	Does the work of decode(), returning a tuple of the (corrected) data bitstring and a status:
+	NO_ERROR, DOUBLE_ERROR, or the index of the bit that was in error and has been flipped in 'encoded'.
+	For a systematic codeword, that index is the bit's index in the codeword's usual layout.
+	"""
+	layout = _encoded_layout(len(encoded))
+	if systematic:
+		status = _systematic_status(encoded, layout)
+		if status >= 0:
+			index = _systematic_index(status, layout)
+			encoded[index] = not encoded[index]
+		return encoded[:layout.data_length], status
+
+	decoded = bitarray(layout.data_length)
+	status = _decode_into(encoded, decoded, layout, True)
+	return decoded, status
+
+def _decode_into(encoded: bitarray, out: bitarray, layout: CodeLayout, fix: bool):
+	"""
+	Does the work of decode_into(), given the layout of 'encoded' and an 'out' of the right length.
+	"""
+	if _accelerator is not None and encoded.endian == out.endian == 'big':
+		status = _accelerator.decode(encoded, layout.encoded_length, layout.data_length, out)
+		if fix and status >= 0:
+			encoded[status] = not encoded[status]
+		return status
+
+	# index of bit in error, relative to DATA + PARITY bitstring - each parity bit's index (besides overall
+	# parity) is a power of two, so the mismatched parity bits sum to the XOR of the indices of all set bits
+	index_of_error = _syndrome(encoded, layout)
+
+	# check overall parity bit - the whole bitstring, overall parity bit included, must have even parity
+	status = _status(index_of_error, not parity(encoded), len(encoded))
+
+	# copy out the data as received, then correct it in the copy only unless asked to fix the codeword too
+	data_index = 0
+	for start, stop in layout.runs:
+		out[data_index:data_index + stop - start] = encoded[start:stop]
+		data_index += stop - start
+	if status > 0 and not _is_power_of_two(status): # the bit in error is a data bit
+		data_index = status - 1 - (status - 1).bit_length()
+		out[data_index] = not out[data_index]
+	if fix and status >= 0:
+		encoded[status] = not encoded[status]
+	return status
+
+def _status(index_of_error: int, overall_correct: bool, length: int):
+	"""
+	Returns the status of a codeword of the given length, given its syndrome and whether its overall parity holds.
+	"""
+	if index_of_error and overall_correct:          # two errors found
+		return DOUBLE_ERROR
+	elif index_of_error >= length:                  # bad overall parity, but no single bit explains the syndrome
+		return DOUBLE_ERROR
+	elif not overall_correct:                       # one error found
+		return index_of_error
+	return NO_ERROR
+
+def _systematic_status(encoded: bitarray, layout: CodeLayout):
+	"""
+	Returns the status of the systematic codeword 'encoded' as _decode() would, without copying its data.
+	"""
+	index_of_error = _systematic_syndrome(encoded, layout)
+	for i, parity_bit_index in enumerate(layout.parity_positions):
+		if encoded[layout.data_length + i]:
+			index_of_error ^= parity_bit_index
+	return _status(index_of_error, not parity(encoded), len(encoded))
+
+def _systematic_index(status: int, layout: CodeLayout):
+	"""
+	Returns the index in a systematic codeword of the bit at index 'status' in the usual layout.
+	"""
+	if status == 0:
+		return layout.encoded_length - 1
+	elif _is_power_of_two(status):
+		return layout.data_length + status.bit_length() - 1
+	return status - 1 - (status - 1).bit_length()
+
+def _systematic_syndrome(data: bitarray, layout: CodeLayout):
+	"""
+	Returns the XOR of the codeword indices that the set bits among the first layout.data_length bits of 'data'
+	take in the usual layout - the syndrome of their codeword with every parity bit still zero.
+
+	A run of data bits lies between two consecutive powers of two, the lower of which is set in every index
+	of the run, so each run takes one xor_indices() of the data bits, offset so the first is at index 1,
+	and one count of them.
+	"""
+	if _accelerator is not None and data.endian == 'big': # encoding the data sets exactly the parity bits of this
+		encoded = bitarray(layout.encoded_length, endian='big')
+		_accelerator.encode(data, layout.data_length, layout.encoded_length, encoded)
+		return sum(parity_bit_index for parity_bit_index in layout.parity_positions if encoded[parity_bit_index])
+
+	if xor_indices is None:
+		encoded = bitarray(layout.encoded_length)
+		encoded.setall(0)
+		data_index = 0
+		for start, stop in layout.runs:
+			encoded[start:stop] = data[data_index:data_index + stop - start]
+			data_index += stop - start
+		return _syndrome(encoded, layout)
+
+	syndrome, data_index = 0, 0
+	for start, stop in layout.runs:
+		length = stop - start
+		if data_index: # index 0 of the slice is the last bit of the previous run, which xor_indices() ignores
+			syndrome ^= xor_indices(data[data_index - 1:data_index + length])
+		else:          # the first run is the single data bit at index 3
+			syndrome ^= data[0]
+		if data.count(1, data_index, data_index + length) & 1:
+			syndrome ^= start - 1
+		data_index += length
+	return syndrome
+
+def _encode_systematic(data: bitarray, out: bitarray, layout: CodeLayout):
+	"""
+	Does the work of encode(data, systematic=True), given the layout of 'data' and an 'out' of the right length.
+	"""
+	out[:layout.data_length] = data
+	syndrome = _systematic_syndrome(data, layout)
+	for i, parity_bit_index in enumerate(layout.parity_positions):
+		out[layout.data_length + i] = bool(syndrome & parity_bit_index)
+	out[-1] = 0
+	out[-1] = parity(out)
+
+def _encode_into(data: bitarray, out: bitarray, layout: CodeLayout):
+	"""
+	Does the work of encode_into(), given the layout of 'data' and an 'out' of the right length.
+	"""
+	if _accelerator is not None and data.endian == out.endian == 'big':
+		_accelerator.encode(data, layout.data_length, layout.encoded_length, out)
+		return None
+
+	out.setall(0)
+
+	# set data bits - they fill the runs of indices strictly between consecutive powers of two
+	data_index = 0
+	for start, stop in layout.runs:
+		out[start:stop] = data[data_index:data_index + stop - start]
+		data_index += stop - start
+
+	# set parity bits - with every parity bit still zero, the syndrome has exactly the bits set
+	# whose parity bits need to be 1 to make the syndrome of the finished codeword zero
+	syndrome = _syndrome(out, layout)
+	for parity_bit_index in layout.parity_positions:
+		out[parity_bit_index] = bool(syndrome & parity_bit_index)
+
+	# compute and set overall parity for the entire encoded data (out[0] is still zero, so it doesn't contribute)
+	out[0] = parity(out)
+
+def _num_parity_bits_needed(length: int):
+	"""
+	Given the length of a DATA bitstring, returns the number of parity bits needed for Hamming SEC codes.
+	An additional parity bit beyond this number of parity bits is needed to achieve SECDED codes.
+	"""
+	n = _next_power_of_two(length)
+	lower_bin = floor(log2(n))
+	upper_bin = lower_bin + 1
+	data_bit_boundary = n - lower_bin - 1					
+	return lower_bin if length <= data_bit_boundary else upper_bin
+
+def _calculate_parity(data: bitarray, parity: int):
+	"""
+	Calculates the specified Hamming parity bit (1, 2, 4, 8, etc.) for the given data.
+	Assumes even parity to allow for easier computation of parity using XOR.
+
+	If 0 is passed in to parity, then the overall parity is computed - that is, parity over
+	the entire sequence.
+	"""
+	retval = 0 # 0 is the XOR identity
+
+	if parity == 0: # special case - compute the overall parity
+		for bit in data:
+			retval ^= bit
+	else:
+		for data_index in _data_bits_covered(parity, len(data)):
+			retval ^= data[data_index]
+	return retval
+
+def _data_bits_covered(parity: int, lim: int):
+	"""
+	Yields the indices of all data bits covered by a specified parity bit in a bitstring
+	of length lim. The indices are relative to DATA BITSTRING ITSELF, NOT including
+	parity bits.
+	"""
+	if not _is_power_of_two(parity):
+		raise ValueError("All hamming parity bits are indexed by powers of two.")
+
+	# use 1-based indexing for simpler computational logic
+	data_index  = 1		# bit we're currently at in the DATA bitstring
+	total_index = 3 	# bit we're currently at in the OVERALL bitstring
+
+	while data_index <= lim:
+		curr_bit_is_data = not _is_power_of_two(total_index)
+		if curr_bit_is_data and (total_index % (parity << 1)) >= parity:	
+			yield data_index - 1 # adjust output to be zero indexed
+		data_index += curr_bit_is_data
+		total_index += 1
+	return None
+
+def _extract_data(encoded: bitarray, layout: CodeLayout = None):
+	"""
+	Assuming encoded is a Hamming SECDED encoded bitstring, returns the substring that is the data bits.
+	"""
+	if layout is not None and _accelerator is not None and encoded.endian == 'big':
+		data = bitarray(layout.data_length, endian='big')
+		_accelerator.extract(encoded, layout.encoded_length, layout.data_length, data)
+		return data
+
+	runs = layout.runs if layout is not None else _data_runs(len(encoded))
+	data = bitarray()
+	for start, stop in runs:
+		data += encoded[start:stop]
+	return data
+
+def _encoded_layout(encoded_length: int):
+	"""
+	Returns the CodeLayout of a Hamming SECDED codeword of length encoded_length, raising a ValueError
+	if encode() never produces codewords of that length.
+	"""
+	if encoded_length > 3:
+		num_parity_bits = floor(log2(encoded_length - 1)) + 1 # -1 to remove overall parity bit from length, +1 since first parity bit at len 1 (2 ** 0)
+		layout = code_layout(encoded_length - num_parity_bits - 1)
+		if layout.encoded_length == encoded_length:
+			return layout
+	raise ValueError("No Hamming SECDED codeword has length {0}.".format(encoded_length))
+
+def _data_runs(length: int):
+	"""
+	Yields (start, stop) index pairs of the runs of data bits in a Hamming SECDED encoded bitstring
+	of the given length. Data bits fill every index from 3 on that isn't a power of two, so each run
+	lies strictly between two consecutive powers of two.
+
+	>>> [x for x in _data_runs(12)]
+	[(3, 4), (5, 8), (9, 12)]
+	"""
+	start, power = 3, 4
+	while start < length:
+		yield start, min(power, length)
+		start, power = power + 1, power << 1
+	return None
+
+def _syndrome(encoded: bitarray, layout: CodeLayout):
+	"""
+	Returns the XOR of the indices of all set bits in the given Hamming SECDED encoded bitstring.
+
+	Bit k of the result is the parity of every index with bit k set, which is exactly the check
+	performed by parity bit 2 ** k, so the result is zero for a valid codeword and the index of
+	the bit in error for a codeword with a single error. The overall parity bit lives at index 0
+	and never contributes.
+	"""
+	if xor_indices is not None:
+		return xor_indices(encoded)
+
+	# word-wise fallback: one masked popcount per parity bit, over the layout's mask of every index it covers
+	encoded = bitarray(encoded, endian='big') # count_and needs both operands to share an endianness
+	syndrome = 0
+	for parity_bit_index, mask in zip(layout.parity_positions, layout.masks):
+		if count_and(encoded, mask) & 1:
+			syndrome |= parity_bit_index
+	return syndrome
+
+def _next_power_of_two(n: int):
+	"""
+	Given an integer n, returns the next power of two after n.
+
+	>>> _next_power_of_two(768)
+	1024
+	>>> _next_power_of_two(4)
+	8
+	"""
+	if (not (type(n) == int)) or (n <= 0):
+		raise ValueError("Argument must be a positive integer.")
+	elif _is_power_of_two(n):
+		return n << 1
+	return 2 ** ceil(log2(n))
+
+def _is_power_of_two(n: int):
+	"""
+	Returns if the given non-negative integer n is a power of two.
+	Credit: https://stackoverflow.com/questions/600293/how-to-check-if-a-number-is-a-power-of-2
+	"""
+	return (not (n == 0)) and ((n & (n - 1)) == 0)
+
+def _powers_of_two(n: int):
+	"""
+	Yields the first n powers of two.
+
+	>>> [x for x in _powers_of_two(5)]
+	[1, 2, 4, 8, 16]
+	"""
+	power, i = 1, 0
+	while i < n:
+		yield power
+		power <<= 1
+		i += 1
+	return None
+
+# Further utility functions - used by the block framing API, and useful on their own for dealing with
+# Hamming codes of bytearrays (useful for sending strings over an unreliable network, for instance)
+
+def bytes_to_bits(byte_stream: bytearray):
+	"""
+	Converts the given bytearray to a bitarray by converting  each successive byte into its 
+	appropriate binary data bits and appending them to the bitarray.
+
+	Any bytes-like object (bytes, bytearray, memoryview, ...) is read in bulk through the buffer
+	protocol, without an intermediate copy. Other iterables of byte values are converted to bytes first.
+	"""
+	out = bitarray(endian='big') # most significant bit of each byte first
+	try:
+		out.frombytes(byte_stream)
+	except TypeError: # not a bytes-like object
+		out.frombytes(bytes(byte_stream))
+	return out
+
+def bits_to_bytes(bits: bitarray):
+	"""
+	Converts the given bitarray bits to a bytearray. 
+
+	Assumes the bits of the last byte or fraction of a byte are to be interpreted as the least 
+	significant bits of the last byte of data, e.g. 0b100 would map to the byte 0b00000100.
+	"""
+	if bits.endian != 'big': # tobytes() packs bits in the bitarray's own bit order
+		bits = bitarray(bits, endian='big')
+	out = bytearray(bits.tobytes())
+
+	# tail case - tobytes() pads a partial last byte with zeros on the right, so shift its bits down
+	if len(bits) % BITS_PER_BYTE:
+		out[-1] >>= BITS_PER_BYTE - len(bits) % BITS_PER_BYTE
+
+	return out
+
+# BYTE API - byte strings encoded and decoded straight from and into buffers, with the same results as going
+# through bytes_to_bits(), encode() or decode(), and bits_to_bytes(), but without the bitarrays in between
+# when the C accelerator is in use
+
+def encode_bytes(data, pad: str = 'left'):
+	"""
+	Returns bits_to_bytes(encode(bytes_to_bits(data))) for any bytes-like 'data' - bytes, a bytearray, a
+	memoryview (slices of larger buffers included) or a memory map - read in place.
+
+	'pad' says where the zeros padding out the last, partial byte of the codeword go: on the 'left', as
+	bits_to_bytes() puts them, leaving the last bits of the codeword as the least significant bits of the
+	byte, or on the 'right', as bitarray.tobytes() and encode_blocks() put them.
+	"""
+	view = _byte_view(data)
+	layout = code_layout(len(view) * BITS_PER_BYTE)
+	shift = _tail_shift(layout.encoded_length, pad)
+	if _accelerator is not None:
+		encoded = bytearray(-(-layout.encoded_length // BITS_PER_BYTE))
+		_accelerator.encode(view, layout.data_length, layout.encoded_length, encoded)
+	else:
+		codeword = bitarray(layout.encoded_length, endian='big')
+		_encode_into(bitarray(buffer=view, endian='big'), codeword, layout)
+		encoded = bytearray(codeword.tobytes())
+	if shift:
+		encoded[-1] >>= shift
+	return encoded
+
+def decode_bytes(encoded, data_bits: int = None, pad: str = 'left'):
+	"""
+	Returns bits_to_bytes(decode(codeword)) for the codeword packed into the bytes-like 'encoded', as returned
+	by encode_bytes() with the same 'pad', correcting single errors and raising a ValueError on two. The
+	decoded data is padded the same way as the codeword.
+
+	A codeword's length in bytes leaves its number of data bits ambiguous, so give it as data_bits unless the
+	data was a whole number of bytes, as it always is for codewords from encode_bytes().
+	"""
+	data, status = _decode_bytes(encoded, data_bits, pad)
+	if status == DOUBLE_ERROR:
+		raise ValueError("Two errors detected.")
+	return data
+
+def _decode_bytes(encoded, data_bits: int = None, pad: str = 'left'):
+	"""
+	Does the work of decode_bytes(), returning a tuple of the decoded data and a status, as _decode() does.
+	"""
+	view = _byte_view(encoded)
+	layout = code_layout(data_bits) if data_bits is not None else _byte_layout(len(view))
+	if len(view) != -(-layout.encoded_length // BITS_PER_BYTE):
+		raise ValueError("Expected a codeword of {0} bytes, got {1}.".format(-(-layout.encoded_length // BITS_PER_BYTE), len(view)))
+	shift, data_shift = _tail_shift(layout.encoded_length, pad), _tail_shift(layout.data_length, pad)
+	if shift: # move the last bits of the codeword back up to the top of their byte, in a copy
+		view = bytearray(view)
+		view[-1] = view[-1] << shift & 0xFF
+
+	if _accelerator is not None:
+		data = bytearray(-(-layout.data_length // BITS_PER_BYTE))
+		status = _accelerator.decode(view, layout.encoded_length, layout.data_length, data)
+	else:
+		codeword, bits = bitarray(endian='big'), bitarray(layout.data_length, endian='big')
+		codeword.frombytes(view)
+		del codeword[layout.encoded_length:]
+		status = _decode_into(codeword, bits, layout, False)
+		data = bytearray(bits.tobytes())
+	if data_shift:
+		data[-1] >>= data_shift
+	return data, status
+
+def _byte_view(data):
+	"""
+	Returns a flat memoryview of the bytes of the bytes-like 'data', copying them only if they aren't contiguous.
+	"""
+	view = memoryview(data)
+	if not view.c_contiguous:
+		view = memoryview(view.tobytes())
+	return view if view.format == 'B' and view.ndim == 1 else view.cast('B')
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _byte_layout(encoded_bytes: int):
+	"""
+	Returns the CodeLayout of the codewords of whole data bytes that pack into encoded_bytes bytes, raising a
+	ValueError if there are none. There's at most one, since every extra data byte adds at least a byte.
+	"""
+	for data_bytes in range(encoded_bytes - 1, 0, -1):
+		data_length = data_bytes * BITS_PER_BYTE
+		length = -(-(data_length + _num_parity_bits_needed(data_length) + 1) // BITS_PER_BYTE)
+		if length == encoded_bytes:
+			return code_layout(data_length)
+		if length < encoded_bytes:
+			break
+	raise ValueError("No whole number of data bytes encodes to {0} bytes.".format(encoded_bytes))
+
+def _tail_shift(length: int, pad: str):
+	"""
+	Returns how far the last, partial byte of 'length' bits packed with the given padding is shifted down from
+	where bitarray.tobytes() would put its bits, raising a ValueError for an unknown padding.
+	"""
+	if pad not in ('left', 'right'):
+		raise ValueError("Padding must be 'left' or 'right', got {0!r}.".format(pad))
+	return (-length) % BITS_PER_BYTE if pad == 'left' else 0
@@ -0,0 +1,263 @@
+"""
+File:		hamming/files.py
+Author:		Dominic Carrano (carrano.dominic@gmail.com)
+Created:	October 16, 2026
+
+Protection of files in place through sidecar files of parity bits.
+"""
+
+from bitarray import bitarray
+from mmap import mmap, ACCESS_READ, ACCESS_WRITE
+from os import remove, replace
+from struct import Struct
+from .batch import np, encode_batch
+from .blocks import BATCH_BLOCKS
+from .core import (BITS_PER_BYTE, BLOCK_BITS, DOUBLE_ERROR, CodeLayout, bytes_to_bits, code_layout, encode,
+	_encoded_layout, _is_power_of_two)
+
+# sidecar files written by protect_file() are named after the protected file plus this suffix, and start
+# with a header of a magic number, the data bits per block and the length in bytes of the protected file
+SIDECAR_SUFFIX = '.hamming'
+SIDECAR_MAGIC  = b'HAMMSIDE'
+SIDECAR_HEADER = Struct('>8sIQ')
+
+# FILE PROTECTION - files are protected in place by a sidecar file holding the parity bits of each of their
+# blocks, so they stay readable as is. Both files are memory mapped and worked through a group of blocks at a time
+
+class FileReport:
+	"""
+	The outcome of verify_file(): the number of blocks checked, and the byte offsets in the protected file
+	of every block with a (correctable) single error and of every block with an uncorrectable error.
+	"""
+
+	def __init__(self, blocks: int, corrected: list, uncorrectable: list, repaired: bool):
+		self.blocks        = blocks
+		self.corrected     = corrected
+		self.uncorrectable = uncorrectable
+		self.repaired      = repaired
+
+	def __repr__(self):
+		return "FileReport(blocks={0}, corrected={1}, uncorrectable={2}, repaired={3})".format(
+			self.blocks, self.corrected, self.uncorrectable, self.repaired)
+
+def protect_file(path: str, sidecar: str = None, block_bits: int = BLOCK_BITS):
+	"""
+	Writes a sidecar file for the file at 'path' holding the Hamming SECDED parity bits of each of its blocks
+	of block_bits data bits, which must be a whole number of bytes. Returns the sidecar's path, which defaults
+	to path + SIDECAR_SUFFIX.
+
+	Each block's parity bits are exactly those encode() would add to it, so the block and its parity bits
+	together form its codeword, as do the last, shorter block and its parity bits.
+	"""
+	sidecar = path + SIDECAR_SUFFIX if sidecar is None else sidecar
+	entry_bytes = _sidecar_entry_bytes(_check_block_bits(block_bits))
+	try: # written in full next to the sidecar, then moved over it, so a failure never leaves a broken sidecar behind
+		with open(path, 'rb') as data_file, open(sidecar + '.tmp', 'wb') as sidecar_file:
+			data_map = _map_file(data_file, ACCESS_READ)
+			try:
+				sidecar_file.write(SIDECAR_HEADER.pack(SIDECAR_MAGIC, block_bits, len(data_map)))
+				for first, bits in _file_groups(data_map, block_bits):
+					sidecar_file.write(_pack_entries(_parity_entries(bits, block_bits), entry_bytes))
+			finally:
+				_close_map(data_map)
+	except BaseException:
+		try:
+			remove(sidecar + '.tmp')
+		except OSError:
+			pass
+		raise
+	replace(sidecar + '.tmp', sidecar)
+	return sidecar
+
+def verify_file(path: str, sidecar: str = None, repair: bool = False):
+	"""
+	Checks every block of the file at 'path' against the parity bits in its sidecar file, written by
+	protect_file(), and returns a FileReport of what was found. With repair=True, every single error found
+	is also corrected in place, whether it lies in the file or in the sidecar.
+	"""
+	sidecar = path + SIDECAR_SUFFIX if sidecar is None else sidecar
+	access = ACCESS_WRITE if repair else ACCESS_READ
+	with open(path, 'r+b' if repair else 'rb') as data_file, open(sidecar, 'r+b' if repair else 'rb') as sidecar_file:
+		data_map, sidecar_map = _map_file(data_file, access), _map_file(sidecar_file, access)
+		report = _verify_maps(data_map, sidecar_map, repair)
+		_close_map(data_map)
+		_close_map(sidecar_map)
+	return report
+
+def _verify_maps(data_map, sidecar_map, repair: bool):
+	"""
+	Does the work of verify_file() on the memory mapped protected and sidecar files.
+	"""
+	block_bits, data_length = _sidecar_header(sidecar_map, len(sidecar_map), len(data_map))
+	corrected, uncorrectable = _verify_range(data_map, sidecar_map, block_bits, 0, data_length, repair)
+	return FileReport(_block_count(data_length, block_bits), corrected, uncorrectable, repair)
+
+def _sidecar_header(header, sidecar_length: int, data_length: int):
+	"""
+	Given the start of a sidecar file of sidecar_length bytes (or all of it), returns the data bits per block
+	recorded in its header along with the length of the protected file, raising a ValueError if the sidecar
+	doesn't belong to a file of data_length bytes or is truncated.
+	"""
+	magic, block_bits, protected_length = SIDECAR_HEADER.unpack_from(header)
+	if magic != SIDECAR_MAGIC:
+		raise ValueError("Not a sidecar file written by protect_file().")
+	if protected_length != data_length:
+		raise ValueError("The file is {0} bytes long, but was {1} bytes when protected.".format(data_length, protected_length))
+	if sidecar_length != SIDECAR_HEADER.size + _block_count(data_length, block_bits) * _sidecar_entry_bytes(block_bits):
+		raise ValueError("The sidecar file is truncated.")
+	return block_bits, data_length
+
+def _verify_range(data_map, sidecar_map, block_bits: int, start: int, stop: int, repair: bool):
+	"""
+	Checks the blocks of the memory mapped protected file from byte 'start', which must begin a block, up to
+	byte 'stop' against the sidecar, returning the lists of byte offsets of the blocks with a single error and
+	with an uncorrectable error. With repair=True, every single error found is also corrected in place.
+	"""
+	entry_bytes = _sidecar_entry_bytes(block_bits)
+	corrected, uncorrectable = [], []
+	for first, bits in _file_groups(data_map, block_bits, start, stop):
+		offset = SIDECAR_HEADER.size + first * entry_bytes
+		stored = _unpack_entries(memoryview(sidecar_map)[offset:offset + -(-len(bits) // block_bits) * entry_bytes], entry_bytes)
+		computed = _parity_entries(bits, block_bits)
+		for block in _mismatched_entries(stored, computed):
+			layout = code_layout(min(block_bits, len(bits) - block * block_bits))
+			status = _entry_status(int(stored[block]) ^ int(computed[block]), layout)
+			block_offset = (first + block) * block_bits // BITS_PER_BYTE
+			if status == DOUBLE_ERROR:
+				uncorrectable.append(block_offset)
+				continue
+			corrected.append(block_offset)
+			if not repair:
+				continue
+			if _is_power_of_two(status) or status == 0: # a parity bit (or the overall parity bit) is in error
+				bit = layout.num_parity_bits if status == 0 else status.bit_length() - 1
+				sidecar_map[offset + (block + 1) * entry_bytes - 1 - bit // BITS_PER_BYTE] ^= 1 << (bit % BITS_PER_BYTE)
+			else:                                      # a data bit is in error
+				bit = status - 1 - (status - 1).bit_length() # data index of codeword index status
+				data_map[block_offset + bit // BITS_PER_BYTE] ^= 0x80 >> (bit % BITS_PER_BYTE)
+	return corrected, uncorrectable
+
+def _map_file(file, access: int):
+	"""
+	Returns a memory map of the whole given file. Empty files, which can't be memory mapped, give an empty bytearray.
+	"""
+	file.seek(0, 2)
+	return mmap(file.fileno(), 0, access=access) if file.tell() else bytearray()
+
+def _close_map(file_map):
+	"""
+	Flushes any changes to a memory map returned by _map_file() back to its file, and closes it.
+	"""
+	if isinstance(file_map, mmap):
+		file_map.flush()
+		file_map.close()
+	return None
+
+def _file_groups(data_map, block_bits: int, start: int = 0, stop: int = None):
+	"""
+	Yields (index of first block, data bits) pairs for consecutive groups of up to BATCH_BLOCKS blocks of the
+	memory mapped file, from byte 'start' (which must begin a block) up to byte 'stop' (by default, the end),
+	copying only the group at hand out of the mapping.
+	"""
+	_check_block_bits(block_bits)
+	stop = len(data_map) if stop is None else min(stop, len(data_map))
+	group_bytes = BATCH_BLOCKS * block_bits // BITS_PER_BYTE
+	view = memoryview(data_map)
+	for group in range(start, stop, group_bytes):
+		yield group * BITS_PER_BYTE // block_bits, bytes_to_bits(view[group:min(group + group_bytes, stop)])
+	view.release()
+	return None
+
+def _check_block_bits(block_bits: int):
+	"""
+	Returns block_bits, raising a ValueError unless it's a positive, whole number of bytes.
+	"""
+	if block_bits <= 0 or block_bits % BITS_PER_BYTE:
+		raise ValueError("File blocks must hold a positive, whole number of bytes.")
+	return block_bits
+
+def _block_count(data_length: int, block_bits: int):
+	"""
+	Returns the number of blocks of block_bits data bits that data_length bytes of data split into.
+	"""
+	return -(-data_length * BITS_PER_BYTE // block_bits)
+
+def _sidecar_entry_bytes(block_bits: int):
+	"""
+	Returns the bytes a block's parity entry takes up in a sidecar file.
+	"""
+	return -(-(code_layout(block_bits).num_parity_bits + 1) // BITS_PER_BYTE)
+
+def _parity_entries(bits: bitarray, block_bits: int):
+	"""
+	Returns the parity entries of every block of block_bits data bits in the given bitstring, the last block
+	being shorter if block_bits doesn't divide its length. Bit j of a block's entry is its parity bit 2 ** j,
+	and the bit above those is its overall parity bit. Entries come as a NumPy array if NumPy is available.
+	"""
+	full_blocks = len(bits) // block_bits
+	entries = np.zeros(0, dtype=np.uint64) if np is not None else []
+	if np is not None and full_blocks:
+		matrix = np.unpackbits(np.frombuffer(bits[:full_blocks * block_bits].tobytes(), dtype=np.uint8), count=full_blocks * block_bits)
+		encoded = encode_batch(matrix.reshape(full_blocks, block_bits))
+		layout = code_layout(block_bits)
+		entries = encoded[:, 0].astype(np.uint64) << np.uint64(layout.num_parity_bits)
+		for j, parity_bit_index in enumerate(layout.parity_positions):
+			entries |= encoded[:, parity_bit_index].astype(np.uint64) << np.uint64(j)
+	else:
+		entries = [_parity_entry(encode(bits[start:start + block_bits])) for start in range(0, full_blocks * block_bits, block_bits)]
+	if len(bits) % block_bits:
+		tail = _parity_entry(encode(bits[full_blocks * block_bits:]))
+		entries = np.append(entries, np.uint64(tail)) if np is not None else entries + [tail]
+	return entries
+
+def _parity_entry(encoded: bitarray):
+	"""
+	Returns the parity entry (see _parity_entries) of a single codeword.
+	"""
+	layout = _encoded_layout(len(encoded))
+	entry = encoded[0] << layout.num_parity_bits
+	for j, parity_bit_index in enumerate(layout.parity_positions):
+		entry |= encoded[parity_bit_index] << j
+	return entry
+
+def _pack_entries(entries, entry_bytes: int):
+	"""
+	Returns the given parity entries as consecutive big endian integers of entry_bytes bytes each.
+	"""
+	if np is not None:
+		packed = np.asarray(entries, dtype='>u8').view(np.uint8).reshape(-1, 8)
+		return packed[:, 8 - entry_bytes:].tobytes()
+	return b''.join(entry.to_bytes(entry_bytes, 'big') for entry in entries)
+
+def _unpack_entries(packed, entry_bytes: int):
+	"""
+	Does the inverse of _pack_entries().
+	"""
+	if np is not None:
+		columns = np.frombuffer(packed, dtype=np.uint8).reshape(-1, entry_bytes).astype(np.uint64)
+		entries = np.zeros(len(columns), dtype=np.uint64)
+		for column in range(entry_bytes):
+			entries = (entries << np.uint64(BITS_PER_BYTE)) | columns[:, column]
+		return entries
+	return [int.from_bytes(packed[i:i + entry_bytes], 'big') for i in range(0, len(packed), entry_bytes)]
+
+def _mismatched_entries(stored, computed):
+	"""
+	Returns the indices at which two equally long sequences of parity entries differ.
+	"""
+	if np is not None:
+		return np.flatnonzero(np.asarray(stored) != np.asarray(computed)).tolist()
+	return [i for i, (a, b) in enumerate(zip(stored, computed)) if a != b]
+
+def _entry_status(difference: int, layout: CodeLayout):
+	"""
+	Returns the status decode() would find for a codeword whose parity entry differs by 'difference' from the
+	parity entry its data bits call for: DOUBLE_ERROR, or the index of the single bit in error.
+	"""
+	# the syndrome is the XOR of the stored and the computed parity bits, and every mismatched parity
+	# bit flips the overall parity of the codeword on top of the overall parity bit itself
+	syndrome = difference & ((1 << layout.num_parity_bits) - 1)
+	overall_correct = not ((difference >> layout.num_parity_bits) ^ bin(syndrome).count('1')) & 1
+	if overall_correct or syndrome >= layout.encoded_length:
+		return DOUBLE_ERROR
+	return syndrome
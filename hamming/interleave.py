@@ -0,0 +1,91 @@
+"""
+File:		hamming/interleave.py
+Author:		Dominic Carrano (carrano.dominic@gmail.com)
+Created:	October 16, 2026
+
+Interleaved codewords, correcting bursts of errors.
+"""
+
+from bitarray import bitarray
+from .batch import np, encode_batch, decode_batch
+from .core import DOUBLE_ERROR, DecodeCounters, code_layout, encode, _decode, _encoded_layout
+
+# interleaving depth from which decode_interleaved() decodes its codewords as a batch (when NumPy is available)
+# rather than one by one, the batch API being faster for many short codewords than for a few long ones
+INTERLEAVE_BATCH_DEPTH = 1024
+
+# INTERLEAVING - data is split across 'depth' codewords whose bits are interleaved, bit i of codeword j landing at
+# index i * depth + j, so that any burst of up to 'depth' consecutive errors hits each codeword at most once
+
+def encode_interleaved(data: bitarray, depth: int):
+	"""
+	Splits the bitstring 'data', zero padded to a multiple of 'depth' bits, into 'depth' equal parts and returns
+	the interleaved Hamming SECDED codewords of the parts. Corrects any burst of up to 'depth' errors, where
+	encode() only corrects one.
+	"""
+	if depth < 1:
+		raise ValueError("Interleaving depth must be a positive integer, got {0}.".format(depth))
+	part_length = -(-len(data) // depth)
+	padded = data + bitarray(part_length * depth - len(data), endian=data.endian)
+	padded[len(data):] = 0
+
+	if np is None: # encode each part and scatter its bits with extended slices
+		encoded = bitarray(code_layout(part_length).encoded_length * depth)
+		for part in range(depth):
+			encoded[part::depth] = encode(padded[part * part_length:(part + 1) * part_length])
+		return encoded
+
+	# one row per part, encoded as a batch and interleaved by reading the codewords column by column
+	codewords = encode_batch(_bitarray_matrix(padded, part_length))
+	return _matrix_bitarray(codewords.T)
+
+def decode_interleaved(encoded: bitarray, depth: int, length: int = None, counters: DecodeCounters = None):
+	"""
+	Given the output of encode_interleaved() for the same depth, returns the original data, correcting one error
+	per codeword and raising a ValueError if two are found in any of them. The data is padded to a multiple of
+	'depth' bits unless its original 'length' is given. Leaves 'encoded' as is. Every codeword is also tallied
+	into 'counters', if given, before any error is raised.
+	"""
+	if depth < 1 or len(encoded) % depth:
+		raise ValueError("No interleaving depth {0} codewords have length {1}.".format(depth, len(encoded)))
+	layout = _encoded_layout(len(encoded) // depth)
+
+	if np is not None and depth >= INTERLEAVE_BATCH_DEPTH: # many short codewords - decode them as a batch
+		decoded, status = decode_batch(_bitarray_matrix(encoded, depth).T, counters)
+		data, double_errors = _matrix_bitarray(decoded), int(np.count_nonzero(status == DOUBLE_ERROR))
+	else: # few long codewords - gather each one's bits, then decode them one by one
+		if np is not None:
+			codewords = _matrix_bitarray(_bitarray_matrix(encoded, depth).T)
+			parts = (codewords[part * layout.encoded_length:(part + 1) * layout.encoded_length] for part in range(depth))
+		else:
+			parts = (encoded[part::depth] for part in range(depth))
+		data, double_errors = bitarray(), 0
+		for codeword in parts:
+			decoded, status = _decode(codeword)
+			if counters is not None:
+				counters.add(status)
+			data += decoded
+			double_errors += status == DOUBLE_ERROR
+
+	if double_errors:
+		raise ValueError("Two errors detected in {0} of {1} interleaved codewords.".format(double_errors, depth))
+	if length is not None:
+		del data[length:]
+	return data
+
+def _bitarray_matrix(bits: bitarray, columns: int):
+	"""
+	Returns the bitstring 'bits' as a uint8 array of zeros and ones with 'columns' columns, filled row by row.
+	"""
+	if bits.endian != 'big': # tobytes() packs bits in the bitarray's own bit order
+		bits = bitarray(bits, endian='big')
+	return np.unpackbits(np.frombuffer(bits.tobytes(), dtype=np.uint8), count=len(bits)).reshape(-1, columns)
+
+def _matrix_bitarray(matrix):
+	"""
+	Returns the uint8 array of zeros and ones 'matrix' as a bitstring, read row by row.
+	"""
+	bits = bitarray(endian='big')
+	bits.frombytes(np.packbits(matrix).tobytes())
+	del bits[matrix.size:]
+	return bits
@@ -0,0 +1,255 @@
+"""
+File:		hamming/metrics.py
+Author:		Dominic Carrano (carrano.dominic@gmail.com)
+Created:	October 16, 2026
+
+Opt-in per-function metrics: call counts, bytes in, cumulative time, and the statuses of every codeword
+decoded. Enabling them swaps instrumented versions in for the API functions of the hamming package (and for
+the reads of Container), and disabling them swaps the originals back - so they cost nothing while off. The
+modules of the package keep calling each other directly, so only calls made through the package itself are
+counted, each exactly once. File verification, scrubbing and the asyncio API report what they decode through
+their own results instead, and aren't instrumented.
+"""
+
+from functools import wraps
+from importlib import import_module
+from inspect import signature
+from threading import Lock
+from time import perf_counter
+from bitarray import bitarray
+from .core import BITS_PER_BYTE, DOUBLE_ERROR, DecodeCounters
+
+class FunctionMetrics:
+	"""
+	What was recorded for one API function: its number of calls (of which 'errors' raised), the bytes of input
+	they were given, the seconds spent in them, and for decoders, the DecodeCounters of what they decoded.
+	"""
+	__slots__ = ('calls', 'errors', 'bytes', 'seconds', 'statuses')
+
+	def __init__(self, decoder: bool):
+		self.calls    = 0
+		self.errors   = 0
+		self.bytes    = 0
+		self.seconds  = 0.0
+		self.statuses = DecodeCounters() if decoder else None
+
+	def __repr__(self):
+		return "FunctionMetrics(calls={0}, errors={1}, bytes={2}, seconds={3:.6f}, statuses={4!r})".format(
+			self.calls, self.errors, self.bytes, self.seconds, self.statuses)
+
+	def as_dict(self):
+		"""
+		Returns the metrics as a flat dictionary of numbers, the status counts included for decoders.
+		"""
+		values = {"calls": self.calls, "errors": self.errors, "bytes": self.bytes, "seconds": self.seconds}
+		if self.statuses is not None:
+			values.update(clean=self.statuses.clean, corrected=self.statuses.corrected,
+				corrected_overall_parity=self.statuses.corrected_overall_parity, uncorrectable=self.statuses.uncorrectable)
+		return values
+
+def enable_metrics():
+	"""
+	Starts recording metrics for the API functions listed in _INSTRUMENTED, importing the modules they live in.
+	Only calls made through the hamming package are seen, so names imported with 'from hamming import ...' before this call keep running
+	uninstrumented - set the HAMMING_METRICS environment variable to enable metrics as the package is
+	imported instead.
+	"""
+	if _originals:
+		return None
+	package = import_module(__package__)
+	for module_name, name, tally in _INSTRUMENTED:
+		module = import_module('.' + module_name, __package__)
+		owner, attribute = (getattr(module, name.split('.')[0]), name.split('.')[1]) if '.' in name else (package, name)
+		original = getattr(module, name) if owner is package else getattr(owner, attribute)
+		_originals[name] = (owner, attribute, original)
+		_metrics.setdefault(name, FunctionMetrics(tally is not None))
+		if tally == _COUNTERS:
+			instrumented = _counters_instrumented(name, original)
+		elif isinstance(tally, str): # the name of a helper doing the decoder's work and returning its status
+			instrumented = _decode_instrumented(name, original, getattr(module, tally))
+		else:
+			instrumented = _instrument(name, original, tally)
+		setattr(owner, attribute, instrumented)
+	return None
+
+def disable_metrics():
+	"""
+	Stops recording metrics, putting the original API functions back. What was recorded so far is kept.
+	"""
+	for owner, attribute, original in _originals.values():
+		setattr(owner, attribute, original)
+	_originals.clear()
+	return None
+
+def reset_metrics():
+	"""
+	Forgets everything recorded so far.
+	"""
+	with _lock:
+		for name in _metrics:
+			_metrics[name] = FunctionMetrics(_metrics[name].statuses is not None)
+	return None
+
+def metrics_snapshot():
+	"""
+	Returns whether metrics are being recorded, and what was recorded so far per function, as a dictionary of
+	plain numbers ready to be exported - {"enabled": bool, "functions": {name: FunctionMetrics.as_dict()}}.
+	"""
+	with _lock:
+		return {"enabled": bool(_originals), "functions": {name: metrics.as_dict() for name, metrics in _metrics.items()}}
+
+def _instrument(name: str, function, tally):
+	"""
+	Returns 'function' wrapped to record its calls into the FunctionMetrics of 'name'. tally(statuses, args,
+	kwargs, result), if given, adds the statuses of what a decoder returned to its DecodeCounters.
+	"""
+	@wraps(function)
+	def instrumented(*args, **kwargs):
+		start = perf_counter()
+		try:
+			result = function(*args, **kwargs)
+		except BaseException:
+			_record(name, args, kwargs, perf_counter() - start, True)
+			raise
+		metrics = _record(name, args, kwargs, perf_counter() - start, False)
+		if tally is not None:
+			with _lock:
+				tally(metrics.statuses, args, kwargs, result)
+		return result
+	return instrumented
+
+def _decode_instrumented(name: str, decoder, decode_status):
+	"""
+	Returns the instrumented 'decoder', decode() or decode_bytes(). It's built on decode_status, the helper
+	doing its work and returning the status it doesn't, so that corrected codewords can be counted and double
+	errors are counted as uncorrectable, not as errors.
+	"""
+	counted = _instrument(name, decode_status, lambda statuses, args, kwargs, result: statuses.add(result[1]))
+
+	def decode(*args, **kwargs):
+		decoded, status = counted(*args, **kwargs)
+		if status == DOUBLE_ERROR:
+			raise ValueError("Two errors detected.")
+		return decoded
+	return wraps(decoder)(decode)
+
+def _counters_instrumented(name: str, decoder):
+	"""
+	Returns the instrumented version of a decoder taking a DecodeCounters as 'counters'. Every call is given
+	counters of its own, added to those of 'name' - and to the caller's, if any - even when it raises.
+	"""
+	parameters = signature(decoder)
+	counted = _instrument(name, decoder, None)
+
+	@wraps(decoder)
+	def instrumented(*args, **kwargs):
+		arguments = parameters.bind(*args, **kwargs)
+		callers = arguments.arguments.get('counters')
+		counters = arguments.arguments['counters'] = DecodeCounters()
+		try:
+			return counted(*arguments.args, **arguments.kwargs)
+		finally:
+			with _lock:
+				_add_counters(_metrics[name].statuses, counters)
+			if callers is not None:
+				_add_counters(callers, counters)
+	return instrumented
+
+def _record(name: str, args: tuple, kwargs: dict, seconds: float, failed: bool):
+	"""
+	Adds one call to the FunctionMetrics of 'name', returning them.
+	"""
+	if name in _MEASURES:
+		size = _MEASURES[name](args, kwargs)
+	else:
+		size = _input_bytes(args[0] if args else next(iter(kwargs.values()), None))
+	with _lock:
+		metrics = _metrics[name]
+		metrics.calls   += 1
+		metrics.errors  += failed
+		metrics.bytes   += size
+		metrics.seconds += seconds
+	return metrics
+
+def _input_bytes(argument):
+	"""
+	Returns the size in bytes of the main argument of an API function: a bitarray, a bytes-like object or an
+	array-like, or 0 for anything else.
+	"""
+	if isinstance(argument, bitarray):
+		return -(-len(argument) // BITS_PER_BYTE)
+	try:
+		return memoryview(argument).nbytes
+	except TypeError:
+		return len(argument) if hasattr(argument, '__len__') else 0
+
+def _tally_result(statuses: DecodeCounters, args: tuple, kwargs: dict, result):
+	"""
+	Counts the DecodeResult returned by decode_ex().
+	"""
+	field = result.status.name.lower() # DecodeCounters has one attribute per DecodeStatus
+	setattr(statuses, field, getattr(statuses, field) + 1)
+
+def _tally_statuses(statuses: DecodeCounters, args: tuple, kwargs: dict, result):
+	"""
+	Counts the status, or NumPy array of statuses, returned second by decode_word(), decode_words() and
+	decode_lookup().
+	"""
+	if isinstance(result[1], int):
+		statuses.add(result[1])
+	else:
+		statuses.add_array(result[1])
+
+def _add_counters(totals: DecodeCounters, counters: DecodeCounters):
+	"""
+	Adds every count of 'counters' to 'totals'.
+	"""
+	for field in DecodeCounters.__slots__:
+		setattr(totals, field, getattr(totals, field) + getattr(counters, field))
+
+# the tally of decoders counting their statuses through their own 'counters' argument, see _counters_instrumented()
+_COUNTERS = 'counters'
+
+# (module, function name, tally of its statuses) of every instrumented API function - tallies only for decoders,
+# given as the name of a status returning helper for decoders that raise on double errors. Methods are named
+# after their class
+_INSTRUMENTED = (
+	('core',       'encode',               None),
+	('core',       'encode_into',          None),
+	('core',       'decode',               '_decode'), # see _decode_instrumented()
+	('core',       'decode_ex',            _tally_result),
+	('core',       'decode_into',          lambda statuses, args, kwargs, result: statuses.add(result)),
+	('core',       'bytes_to_bits',        None),
+	('core',       'bits_to_bytes',        None),
+	('core',       'encode_bytes',         None),
+	('core',       'decode_bytes',         '_decode_bytes'),
+	('batch',      'encode_batch',         None),
+	('batch',      'decode_batch',         _COUNTERS),
+	('words',      'encode_word',          None),
+	('words',      'decode_word',          _tally_statuses),
+	('words',      'encode_words',         None),
+	('words',      'decode_words',         _tally_statuses),
+	('words',      'decode_lookup',        _tally_statuses),
+	('interleave', 'encode_interleaved',   None),
+	('interleave', 'decode_interleaved',   _COUNTERS),
+	('blocks',     'encode_blocks',        None),
+	('blocks',     'decode_blocks',        _COUNTERS),
+	('blocks',     'encode_stream',        None),
+	('blocks',     'decode_stream',        _COUNTERS),
+	('parallel',   'encode_parallel',      None),
+	('parallel',   'decode_parallel',      _COUNTERS),
+	('container',  'Container.read_range', _COUNTERS),
+	('container',  'Container.read_block', _COUNTERS),
+)
+
+# bytes of input of the instrumented methods, whose first argument is the instance - the data bytes they read
+_MEASURES = {
+	'Container.read_range': lambda args, kwargs: args[2],
+	'Container.read_block': lambda args, kwargs: args[0].block_bits // BITS_PER_BYTE,
+}
+
+# what has been recorded so far, and the (owner, attribute, original) of every instrumented function while
+# enabled, by function name
+_metrics   = {}
+_originals = {}
+_lock      = Lock()
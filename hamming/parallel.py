@@ -0,0 +1,97 @@
+"""
+File:		hamming/parallel.py
+Author:		Dominic Carrano (carrano.dominic@gmail.com)
+Created:	October 16, 2026
+
+Block framing spread over a pool of worker processes.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from .blocks import decode_blocks, encode_blocks, _block_data_length, _block_encoded_bytes, _stream_chunk_sizes
+from .core import BITS_PER_BYTE, BLOCK_BITS, DecodeCounters
+
+# data bytes each worker process of encode_parallel() handles at a time by default, rounded to a whole number
+# of block groups
+PARALLEL_CHUNK_SIZE = 8 << 20
+
+# PARALLEL BLOCK FRAMING - blocks are independent, so chunks of them are encoded and decoded by a pool of worker
+# processes. Workers read their input from and write their output to shared memory, at offsets fixed up front
+
+def encode_parallel(data, block_bits: int = BLOCK_BITS, workers: int = None, chunk_size: int = PARALLEL_CHUNK_SIZE):
+	"""
+	Returns encode_blocks(data, block_bits), computed by 'workers' processes (by default, one per CPU) each
+	encoding chunks of about chunk_size data bytes.
+	"""
+	data_chunk, encoded_chunk = _stream_chunk_sizes(block_bits, chunk_size)
+	encoded_length = _block_encoded_bytes(len(data), block_bits)
+	tasks = [(start, min(start + data_chunk, len(data)), index * encoded_chunk, block_bits)
+		for index, start in enumerate(range(0, len(data), data_chunk))]
+	encoded, _ = _run_shared(_encode_shared, data, encoded_length, tasks, workers)
+	return encoded
+
+def decode_parallel(encoded, block_bits: int = BLOCK_BITS, workers: int = None, chunk_size: int = PARALLEL_CHUNK_SIZE,
+	counters: DecodeCounters = None):
+	"""
+	Returns decode_blocks(encoded, block_bits, counters), computed by 'workers' processes (by default, one per
+	CPU) each decoding chunks of the codewords of about chunk_size data bytes.
+	"""
+	data_chunk, encoded_chunk = _stream_chunk_sizes(block_bits, chunk_size)
+	data_length = _block_data_length(len(encoded), block_bits)
+	blocks_per_chunk = data_chunk * BITS_PER_BYTE // block_bits
+	tasks = [(start, min(start + encoded_chunk, len(encoded)), index * data_chunk, block_bits)
+		for index, start in enumerate(range(0, len(encoded), encoded_chunk))]
+	data, results = _run_shared(_decode_shared, encoded, data_length, tasks, workers)
+	errors = [(index * blocks_per_chunk + block, status) for index, chunk_errors in enumerate(results) for block, status in chunk_errors]
+	if counters is not None:
+		counters.add_errors(-(-data_length * BITS_PER_BYTE // block_bits), errors)
+	return data, errors
+
+def _run_shared(function, source, output_length: int, tasks: list, workers: int):
+	"""
+	Copies 'source' into shared memory, allocates 'output_length' bytes of shared output memory, and has a
+	process pool run function(source name, output name, *task) for every task. Returns a tuple of the output
+	and the list of every task's return value, in task order.
+	"""
+	if not tasks:
+		return b'', []
+	source_memory = shared_memory.SharedMemory(create=True, size=len(source))
+	output_memory = shared_memory.SharedMemory(create=True, size=max(1, output_length))
+	try:
+		source_memory.buf[:len(source)] = source
+		with ProcessPoolExecutor(max_workers=workers) as executor:
+			futures = [executor.submit(function, source_memory.name, output_memory.name, *task) for task in tasks]
+			results = [future.result() for future in futures]
+		return bytes(output_memory.buf[:output_length]), results
+	finally:
+		source_memory.close()
+		source_memory.unlink()
+		output_memory.close()
+		output_memory.unlink()
+
+def _encode_shared(source_name: str, output_name: str, start: int, stop: int, output_start: int, block_bits: int):
+	"""
+	Worker process side of encode_parallel(): encodes source[start:stop] into output, from output_start on.
+	"""
+	source, output = shared_memory.SharedMemory(name=source_name), shared_memory.SharedMemory(name=output_name)
+	try:
+		encoded = encode_blocks(source.buf[start:stop], block_bits)
+		output.buf[output_start:output_start + len(encoded)] = encoded
+	finally:
+		source.close()
+		output.close()
+	return None
+
+def _decode_shared(source_name: str, output_name: str, start: int, stop: int, output_start: int, block_bits: int):
+	"""
+	Worker process side of decode_parallel(): decodes source[start:stop] into output, from output_start on,
+	returning the chunk's errors as decode_blocks() does.
+	"""
+	source, output = shared_memory.SharedMemory(name=source_name), shared_memory.SharedMemory(name=output_name)
+	try:
+		data, errors = decode_blocks(source.buf[start:stop], block_bits)
+		output.buf[output_start:output_start + len(data)] = data
+	finally:
+		source.close()
+		output.close()
+	return errors
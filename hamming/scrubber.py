@@ -0,0 +1,222 @@
+"""
+File:		hamming/scrubber.py
+Author:		Dominic Carrano (carrano.dominic@gmail.com)
+Created:	October 16, 2026
+
+Background scrubbing of files protected by protect_file(): every block is read back and checked against its
+sidecar, so that single errors get corrected before a second one lands in the same codeword.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from json import dump, load
+from mmap import ACCESS_READ, ACCESS_WRITE
+from os import cpu_count, path, remove, replace, walk
+from time import monotonic, sleep
+from .core import BITS_PER_BYTE
+from .files import (SIDECAR_HEADER, SIDECAR_SUFFIX, _block_count, _close_map, _map_file, _sidecar_header,
+	_verify_range)
+
+# protected bytes each task of scrub() checks by default, rounded down to a whole number of blocks
+SCRUB_CHUNK_SIZE = 8 << 20
+
+# seconds between checkpoint writes while scrubbing - a restart rescans at most about this much work
+CHECKPOINT_INTERVAL = 10.0
+
+# format version of scrub() checkpoint files
+CHECKPOINT_VERSION = 1
+
+class ScrubReport:
+	"""
+	Progress and outcome of scrub(): how many files, blocks and protected bytes have been checked so far, the
+	(path, byte offset) pairs of every block found with a single error and with an uncorrectable error, and
+	the seconds spent. Blocks checked before a restart from a checkpoint are included.
+	"""
+
+	def __init__(self, files: int = 0, blocks: int = 0, bytes_scanned: int = 0, corrected: list = None,
+		uncorrectable: list = None, elapsed: float = 0.0, repaired: bool = True):
+		self.files         = files
+		self.blocks        = blocks
+		self.bytes_scanned = bytes_scanned
+		self.corrected     = [] if corrected is None else corrected
+		self.uncorrectable = [] if uncorrectable is None else uncorrectable
+		self.elapsed       = elapsed
+		self.repaired      = repaired
+
+	def __repr__(self):
+		return "ScrubReport(files={0}, blocks={1}, bytes_scanned={2}, corrected={3}, uncorrectable={4}, elapsed={5:.3f})".format(
+			self.files, self.blocks, self.bytes_scanned, len(self.corrected), len(self.uncorrectable), self.elapsed)
+
+	@property
+	def blocks_per_s(self):
+		"""
+		Blocks checked per second so far.
+		"""
+		return self.blocks / self.elapsed if self.elapsed else 0.0
+
+	@property
+	def bytes_per_s(self):
+		"""
+		Protected bytes checked per second so far.
+		"""
+		return self.bytes_scanned / self.elapsed if self.elapsed else 0.0
+
+	def as_dict(self):
+		"""
+		Returns the report as a JSON-ready dictionary, rates included.
+		"""
+		return {"files": self.files, "blocks": self.blocks, "bytes_scanned": self.bytes_scanned,
+			"corrected": [list(entry) for entry in self.corrected],
+			"uncorrectable": [list(entry) for entry in self.uncorrectable], "elapsed": self.elapsed,
+			"repaired": self.repaired, "blocks_per_s": self.blocks_per_s, "bytes_per_s": self.bytes_per_s}
+
+def scrub(paths, repair: bool = True, workers: int = None, processes: bool = False, bandwidth: float = None,
+	checkpoint: str = None, progress=None, chunk_size: int = SCRUB_CHUNK_SIZE):
+	"""
+	Checks every block of the protected files in 'paths' against their sidecar files and returns a ScrubReport.
+	A path naming a directory stands for every file below it with a sidecar next to it, named by SIDECAR_SUFFIX.
+	With repair=True (the default), single errors are corrected in place as they're found.
+
+	Chunks of about chunk_size protected bytes are checked by a pool of 'workers' threads (by default, one per
+	CPU), or processes with processes=True. A 'bandwidth' in bytes per second caps how fast chunks are handed
+	out, to leave I/O for everyone else. progress(report), if given, is called with the running ScrubReport
+	after every chunk.
+
+	With a 'checkpoint' path, the chunks done so far are saved to that JSON file every CHECKPOINT_INTERVAL
+	seconds, and a later call with the same paths and checkpoint skips them. The checkpoint is removed once
+	the scrub completes, so the next scrub starts over.
+	"""
+	if chunk_size <= 0:
+		raise ValueError("Chunks must hold a positive number of bytes.")
+	files = _scrub_files(paths)
+	state = _load_checkpoint(checkpoint, chunk_size, repair)
+	report = ScrubReport(len(files), state["blocks"], state["bytes_scanned"], [tuple(entry) for entry in state["corrected"]],
+		[tuple(entry) for entry in state["uncorrectable"]], state["elapsed"], repair)
+	tasks = [task for name, sidecar in files for task in _scrub_tasks(name, sidecar, chunk_size, state["done"].get(name, ()))]
+
+	# elapsed time carries on from the checkpoint, and the bandwidth cap applies from now
+	started = monotonic()
+	clock_start, saved = started - report.elapsed, started
+	workers = workers or cpu_count() or 1
+	pool = ProcessPoolExecutor(max_workers=workers) if processes else ThreadPoolExecutor(max_workers=workers)
+	try:
+		with pool:
+			pending, submitted = {}, 0
+			for task in tasks: # keeping up to two chunks per worker in flight
+				if bandwidth: # hand out chunks no faster than 'bandwidth' bytes per second
+					sleep(max(0.0, started + submitted / bandwidth - monotonic()))
+				pending[pool.submit(_scrub_chunk, *task, repair)] = task
+				submitted += task[4] - task[3]
+				while len(pending) >= 2 * workers:
+					saved = _finish_chunks(pending, report, state, progress, clock_start, checkpoint, saved)
+			while pending:
+				saved = _finish_chunks(pending, report, state, progress, clock_start, checkpoint, saved)
+	except BaseException: # interrupted - save what's done so far, so the next call picks up from there
+		if checkpoint:
+			_save_checkpoint(checkpoint, state, report)
+		raise
+	report.elapsed = monotonic() - clock_start
+	if checkpoint and path.exists(checkpoint):
+		remove(checkpoint)
+	return report
+
+def _scrub_files(paths):
+	"""
+	Returns the sorted (protected file, sidecar file) pairs that scrub() checks for the given paths.
+	"""
+	if isinstance(paths, str):
+		paths = [paths]
+	files = set()
+	for name in paths:
+		if not path.isdir(name):
+			files.add((name, name + SIDECAR_SUFFIX))
+			continue
+		for directory, _, names in walk(name):
+			present = set(names) # one lookup per file, however many files a directory holds
+			for entry in names:
+				if not entry.endswith(SIDECAR_SUFFIX) and entry + SIDECAR_SUFFIX in present:
+					files.add((path.join(directory, entry), path.join(directory, entry + SIDECAR_SUFFIX)))
+	return sorted(files)
+
+def _scrub_tasks(name: str, sidecar: str, chunk_size: int, done):
+	"""
+	Returns the (protected file, sidecar file, data bits per block, start, stop) tasks of scrub() for one file,
+	checking its sidecar's header first and leaving out the chunks starting at the byte offsets in 'done'.
+	"""
+	with open(sidecar, 'rb') as sidecar_file:
+		header = sidecar_file.read(SIDECAR_HEADER.size)
+		sidecar_length = sidecar_file.seek(0, 2)
+	try: # check the header against the lengths of both files, without reading the entries
+		if len(header) < SIDECAR_HEADER.size:
+			raise ValueError("Not a sidecar file written by protect_file().")
+		block_bits, data_length = _sidecar_header(header, sidecar_length, path.getsize(name))
+	except ValueError as error:
+		raise ValueError("{0}: {1}".format(name, error)) from None
+	block_bytes = block_bits // BITS_PER_BYTE
+	chunk = max(block_bytes, chunk_size // block_bytes * block_bytes)
+	done = set(done)
+	return [(name, sidecar, block_bits, start, min(start + chunk, data_length))
+		for start in range(0, data_length, chunk) if start not in done]
+
+def _scrub_chunk(name: str, sidecar: str, block_bits: int, start: int, stop: int, repair: bool):
+	"""
+	Worker side of scrub(): checks (and with repair=True, corrects) the blocks of one chunk, returning the
+	lists of byte offsets of the blocks with a single and with an uncorrectable error.
+	"""
+	access = ACCESS_WRITE if repair else ACCESS_READ
+	with open(name, 'r+b' if repair else 'rb') as data_file, open(sidecar, 'r+b' if repair else 'rb') as sidecar_file:
+		data_map, sidecar_map = _map_file(data_file, access), _map_file(sidecar_file, access)
+		try:
+			return _verify_range(data_map, sidecar_map, block_bits, start, stop, repair)
+		finally:
+			_close_map(data_map)
+			_close_map(sidecar_map)
+
+def _finish_chunks(pending: dict, report: ScrubReport, state: dict, progress, clock_start: float, checkpoint: str,
+	saved: float):
+	"""
+	Waits for at least one pending chunk of scrub() to finish, and adds every finished one to the report and
+	the checkpoint state, saving the checkpoint if it was last saved at least CHECKPOINT_INTERVAL seconds before
+	'saved'. Returns when the checkpoint was last saved.
+	"""
+	done, _ = wait(pending, return_when=FIRST_COMPLETED)
+	for future in done:
+		name, _, block_bits, start, stop = pending.pop(future)
+		corrected, uncorrectable = future.result()
+		report.blocks        += _block_count(stop - start, block_bits)
+		report.bytes_scanned += stop - start
+		report.corrected.extend((name, offset) for offset in corrected)
+		report.uncorrectable.extend((name, offset) for offset in uncorrectable)
+		report.elapsed = monotonic() - clock_start
+		state["done"].setdefault(name, []).append(start)
+		if progress is not None:
+			progress(report)
+	if checkpoint and monotonic() - saved >= CHECKPOINT_INTERVAL:
+		_save_checkpoint(checkpoint, state, report)
+		saved = monotonic()
+	return saved
+
+def _load_checkpoint(checkpoint: str, chunk_size: int, repair: bool):
+	"""
+	Returns the scrub state saved in the given checkpoint file, or a fresh one if there's no such file.
+	"""
+	state = {"version": CHECKPOINT_VERSION, "chunk_size": chunk_size, "repair": repair, "done": {}, "blocks": 0,
+		"bytes_scanned": 0, "corrected": [], "uncorrectable": [], "elapsed": 0.0}
+	if not checkpoint or not path.exists(checkpoint):
+		return state
+	with open(checkpoint) as checkpoint_file:
+		saved = load(checkpoint_file)
+	if saved.get("version") != CHECKPOINT_VERSION or saved.get("chunk_size") != chunk_size or saved.get("repair") != repair:
+		raise ValueError("The checkpoint {0} was written by a scrub with other settings.".format(checkpoint))
+	state.update(saved)
+	return state
+
+def _save_checkpoint(checkpoint: str, state: dict, report: ScrubReport):
+	"""
+	Atomically replaces the checkpoint file with the scrub's state so far.
+	"""
+	state.update(blocks=report.blocks, bytes_scanned=report.bytes_scanned, corrected=report.corrected,
+		uncorrectable=report.uncorrectable, elapsed=report.elapsed)
+	with open(checkpoint + '.tmp', 'w') as checkpoint_file:
+		dump(state, checkpoint_file)
+	replace(checkpoint + '.tmp', checkpoint)
+	return None
@@ -0,0 +1,175 @@
+"""
+File:		hamming/simulate.py
+Author:		Dominic Carrano (carrano.dominic@gmail.com)
+Created:	October 16, 2026
+
+Monte Carlo simulation of Hamming SECDED codewords sent over a noisy channel, to find how often decoding
+fails at a given raw bit error rate. Requires NumPy.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from math import sqrt
+from statistics import NormalDist
+from time import monotonic
+from .batch import np, decode_batch
+from .core import BLOCK_BITS, DOUBLE_ERROR, code_layout
+
+# trials generated and decoded at a time, as the rows of one batch of error patterns
+SIMULATION_BATCH = 1 << 16
+
+# trials each task of simulate_channel() runs by default - the unit of work handed to a worker process
+SIMULATION_CHUNK = 1 << 22
+
+# CHANNEL SIMULATION - the code is linear and decoding only depends on the syndrome, so sending any codeword is
+# the same as sending the all-zero one: each trial draws just an error pattern, which decode_batch() decodes as
+# the received codeword. Trials with no errors are clean without decoding, which at low error rates is most
+
+class SimulationReport:
+	"""
+	The outcome of simulate_channel(): of 'trials' codewords of block_bits data bits, how many arrived 'clean'
+	(without errors), 'corrected' (every error corrected), 'detected' (reported as uncorrectable) and 'silent'
+	(decoded to the wrong data without any error being reported), along with the seconds spent.
+	"""
+	OUTCOMES = ('clean', 'corrected', 'detected', 'silent')
+
+	def __init__(self, block_bits: int, bit_error_rate: float, burst_length: int, trials: int, clean: int,
+		corrected: int, detected: int, silent: int, elapsed: float):
+		self.block_bits     = block_bits
+		self.bit_error_rate = bit_error_rate
+		self.burst_length   = burst_length
+		self.trials         = trials
+		self.clean          = clean
+		self.corrected      = corrected
+		self.detected       = detected
+		self.silent         = silent
+		self.elapsed        = elapsed
+
+	def __repr__(self):
+		return "SimulationReport(trials={0}, clean={1}, corrected={2}, detected={3}, silent={4}, elapsed={5:.3f})".format(
+			self.trials, self.clean, self.corrected, self.detected, self.silent, self.elapsed)
+
+	@property
+	def trials_per_s(self):
+		"""
+		Trials simulated per second.
+		"""
+		return self.trials / self.elapsed if self.elapsed else 0.0
+
+	def rate(self, outcome: str):
+		"""
+		Returns the fraction of trials with the given outcome, one of OUTCOMES.
+		"""
+		return getattr(self, self._outcome(outcome)) / self.trials if self.trials else 0.0
+
+	def interval(self, outcome: str, confidence: float = 0.95):
+		"""
+		Returns the Wilson score interval (low, high) of the rate of the given outcome at the given confidence,
+		which stays meaningful for outcomes seen rarely or never, as silent ones usually are.
+		"""
+		return _wilson_interval(getattr(self, self._outcome(outcome)), self.trials, confidence)
+
+	def as_dict(self, confidence: float = 0.95):
+		"""
+		Returns the report as a JSON-ready dictionary, with the rate and confidence interval of every outcome.
+		"""
+		values = {"block_bits": self.block_bits, "bit_error_rate": self.bit_error_rate, "burst_length": self.burst_length,
+			"trials": self.trials, "elapsed": self.elapsed, "trials_per_s": self.trials_per_s, "confidence": confidence}
+		for outcome in self.OUTCOMES:
+			values[outcome] = getattr(self, outcome)
+			values[outcome + "_rate"] = self.rate(outcome)
+			values[outcome + "_interval"] = list(self.interval(outcome, confidence))
+		return values
+
+	def _outcome(self, outcome: str):
+		"""
+		Returns 'outcome', raising a ValueError unless it's one of OUTCOMES.
+		"""
+		if outcome not in self.OUTCOMES:
+			raise ValueError("Unknown outcome {0!r}, pick one of {1}.".format(outcome, self.OUTCOMES))
+		return outcome
+
+def simulate_channel(bit_error_rate: float, trials: int, block_bits: int = BLOCK_BITS, burst_length: int = 1,
+	seed: int = None, workers: int = None, chunk_size: int = SIMULATION_CHUNK):
+	"""
+	Sends 'trials' codewords of block_bits data bits over a channel where an error strikes each codeword bit
+	independently with probability bit_error_rate, decodes them, and returns a SimulationReport of the outcomes.
+	With a burst_length above 1, every error flips that many consecutive bits (fewer at the end of the codeword)
+	instead of one.
+
+	Chunks of chunk_size trials are simulated by a pool of 'workers' processes (by default, one per CPU), or in
+	this process with workers=1. Each chunk draws from its own random generator, spawned from 'seed', so a
+	given seed gives the same report however many workers there are.
+	"""
+	if np is None:
+		raise ImportError("Channel simulation requires NumPy.")
+	if not 0 <= bit_error_rate <= 1:
+		raise ValueError("The bit error rate must lie between 0 and 1.")
+	if burst_length < 1 or chunk_size <= 0:
+		raise ValueError("Bursts and chunks must be at least one bit and one trial long.")
+	code_layout(block_bits) # rejects bad block sizes here rather than in every worker
+
+	started = monotonic()
+	sizes = [min(chunk_size, trials - first) for first in range(0, trials, chunk_size)]
+	tasks = [(block_bits, bit_error_rate, burst_length, size, child)
+		for size, child in zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes)))]
+	if workers == 1 or len(tasks) <= 1:
+		counts = [_simulate_chunk(*task) for task in tasks]
+	else:
+		with ProcessPoolExecutor(max_workers=workers) as executor:
+			counts = list(executor.map(_simulate_chunk, *zip(*tasks)))
+	totals = [sum(column) for column in zip(*counts)] if counts else [0] * len(SimulationReport.OUTCOMES)
+	return SimulationReport(block_bits, bit_error_rate, burst_length, trials, *totals, monotonic() - started)
+
+def _simulate_chunk(block_bits: int, bit_error_rate: float, burst_length: int, trials: int, seed_sequence):
+	"""
+	Runs 'trials' trials from a generator seeded with seed_sequence, returning their number of clean, corrected,
+	detected and silent outcomes.
+	"""
+	rng = np.random.default_rng(seed_sequence)
+	encoded_length = code_layout(block_bits).encoded_length
+	clean, corrected, detected, silent = 0, 0, 0, 0
+	for first in range(0, trials, SIMULATION_BATCH):
+		rows = min(SIMULATION_BATCH, trials - first)
+		errors = _error_patterns(rng, rows, encoded_length, bit_error_rate, burst_length)
+		clean += rows - len(errors)
+		if not len(errors):
+			continue
+		data, status = decode_batch(errors)
+		uncorrectable, wrong = status == DOUBLE_ERROR, data.any(axis=1) # the data sent was all zeros
+		detected  += int(uncorrectable.sum())
+		silent    += int((wrong & ~uncorrectable).sum())
+		corrected += int((~wrong & ~uncorrectable).sum())
+	return clean, corrected, detected, silent
+
+def _error_patterns(rng, rows: int, encoded_length: int, bit_error_rate: float, burst_length: int):
+	"""
+	Draws the error patterns of 'rows' codewords, returning only those with at least one error, as the rows of
+	a uint8 array.
+	"""
+	if bit_error_rate * encoded_length >= 1: # most codewords see errors - draw every bit
+		starts = rng.random((rows, encoded_length)) < bit_error_rate
+		starts = starts[starts.any(axis=1)]
+	else: # draw how many errors each codeword sees, then where, for just the codewords that see any
+		events = rng.binomial(encoded_length, bit_error_rate, size=rows)
+		events = events[events > 0]
+		keys = rng.random((len(events), encoded_length))
+		starts = keys <= np.sort(keys, axis=1)[np.arange(len(events)), events - 1, None] # the 'events' smallest keys
+	errors = starts.copy()
+	for shift in range(1, min(burst_length, encoded_length)):
+		errors[:, shift:] |= starts[:, :-shift]
+	return errors.view(np.uint8)
+
+def _wilson_interval(successes: int, trials: int, confidence: float):
+	"""
+	Returns the Wilson score interval (low, high) of a binomial proportion at the given confidence.
+	"""
+	if not trials:
+		return 0.0, 1.0
+	z = NormalDist().inv_cdf((1 + confidence) / 2)
+	proportion = successes / trials
+	denominator = 1 + z * z / trials
+	centre = (proportion + z * z / (2 * trials)) / denominator
+	margin = z * sqrt(proportion * (1 - proportion) / trials + z * z / (4 * trials * trials)) / denominator
+	low  = centre - margin if successes else 0.0 # exact at the ends, which rounding would miss
+	high = centre + margin if successes < trials else 1.0
+	return low, high
@@ -0,0 +1,203 @@
+"""
+File:		hamming/words.py
+Author:		Dominic Carrano (carrano.dominic@gmail.com)
+Created:	October 16, 2026
+
+Word codecs: fixed-width data words held in ints or in NumPy uint64 arrays, and lookup table decoding of
+short codewords.
+"""
+
+from array import array
+from bitarray.util import ba2int, int2ba, parity
+from functools import lru_cache
+from .batch import np
+from .blocks import STREAM_CHUNK_SIZE
+from .core import (BITS_PER_BYTE, BLOCK_BITS, LAYOUT_CACHE_SIZE, NO_ERROR, DOUBLE_ERROR, code_layout, encode,
+	_extract_data, _is_power_of_two, _syndrome)
+
+# decode_lookup() tables hold an entry for every possible codeword, so they're limited to codewords of at most
+# LOOKUP_MAX_BITS bits (a 64 MiB table), and only the tables of the LOOKUP_CACHE_SIZE most recently used codes are kept
+LOOKUP_MAX_BITS   = 24
+LOOKUP_CACHE_SIZE = 4
+
+# WORD CODECS - fixed-width data words held in ints, such as the standard (72,64) and (39,32) codes. Codes are
+# linear, so a codeword is the XOR of the codewords of each of its data word's bytes alone, and likewise for the
+# syndrome and data of a codeword's bytes - both come from per-byte lookup tables built on first use. Bit i of
+# an int is bit data_bits - 1 - i (or n - 1 - i) of the bitarray encode() works with, so the paths interoperate
+
+def encode_word(value: int, data_bits: int = BLOCK_BITS):
+	"""
+	Returns the Hamming SECDED codeword of the 'data_bits' bit data word 'value' as an int, identical to
+	ba2int(encode(int2ba(value, data_bits))).
+	"""
+	if value < 0 or value >> data_bits:
+		raise ValueError("{0} does not fit in {1} data bits.".format(value, data_bits))
+	encoded = 0
+	for table in _word_tables(data_bits)[0]:
+		encoded ^= table[value & 0xFF]
+		value >>= BITS_PER_BYTE
+	return encoded
+
+def decode_word(encoded: int, data_bits: int = BLOCK_BITS):
+	"""
+	Given the int Hamming SECDED codeword of a 'data_bits' bit data word, returns a tuple of the (corrected)
+	data word and a status: NO_ERROR, DOUBLE_ERROR, or the index of the corrected bit, as decode_into() does.
+	"""
+	encode_tables, decode_tables, fixes, shift = _word_tables(data_bits)
+	if encoded < 0 or encoded >> code_layout(data_bits).encoded_length:
+		raise ValueError("{0} is not a codeword for {1} data bits.".format(encoded, data_bits))
+	found = 0 # data bits << shift | syndrome << 1 | overall parity
+	for table in decode_tables:
+		found ^= table[encoded & 0xFF]
+		encoded >>= BITS_PER_BYTE
+	correction, status = fixes[found & ((1 << shift) - 1)]
+	return (found >> shift) ^ correction, status
+
+def encode_words(values, data_bits: int = BLOCK_BITS):
+	"""
+	Given an array-like of N data words of data_bits <= 64 bits each, returns the (N, ceil(n / 8)) uint8 array of
+	their codewords, each as the big-endian bytes of encode_word(). Requires NumPy.
+	"""
+	(low_tables, high_tables), _, _, _ = _word_arrays(data_bits)
+	values = np.asarray(values, dtype=np.uint64).ravel()
+	if data_bits < 64 and (values >> np.uint64(data_bits)).any(): # as encode_word() does, rather than truncating
+		raise ValueError("Not every value fits in {0} data bits.".format(data_bits))
+	low, high = np.zeros(values.size, dtype=np.uint64), np.zeros(values.size, dtype=np.uint64)
+	for byte, (low_table, high_table) in enumerate(zip(low_tables, high_tables)):
+		index = (values >> np.uint64(byte * BITS_PER_BYTE)) & np.uint64(0xFF)
+		low ^= low_table[index]
+		high ^= high_table[index]
+
+	# lay both halves out as big-endian bytes and keep the codeword's bytes at the end
+	words = np.stack([high, low], axis=1).astype('>u8').view(np.uint8)
+	return np.ascontiguousarray(words[:, words.shape[1] - _word_bytes(data_bits):])
+
+def decode_words(encoded, data_bits: int = BLOCK_BITS):
+	"""
+	Given the (N, ceil(n / 8)) uint8 array of N codewords as returned by encode_words(), returns a tuple of the
+	uint64 array of their (corrected) data words and the int64 array of their statuses, as decode_batch() does.
+	"""
+	_, data_tables, syndrome_tables, fixes = _word_arrays(data_bits)
+	encoded = np.asarray(encoded, dtype=np.uint8)
+	if encoded.ndim != 2 or encoded.shape[1] != _word_bytes(data_bits):
+		raise ValueError("Expected an (N, {0}) array of codeword bytes, got shape {1}.".format(_word_bytes(data_bits), encoded.shape))
+	padding = encoded.shape[1] * BITS_PER_BYTE - code_layout(data_bits).encoded_length # unused bits atop the first byte
+	if (encoded[:, 0] >> (BITS_PER_BYTE - padding)).any():
+		raise ValueError("Not every row is a codeword for {0} data bits.".format(data_bits))
+	data = np.zeros(encoded.shape[0], dtype=np.uint64)
+	found = np.zeros(encoded.shape[0], dtype=np.int64)
+	for byte in range(len(data_tables)): # tables run from the least significant byte, the last column
+		column = encoded[:, -1 - byte]
+		data ^= data_tables[byte][column]
+		found ^= syndrome_tables[byte][column]
+	corrections, statuses = fixes
+	return data ^ corrections[found], statuses[found]
+
+def decode_lookup(encoded, data_bits: int):
+	"""
+	Returns decode_word(encoded, data_bits) for codewords of at most LOOKUP_MAX_BITS bits, with a single index
+	into a table of the (data, status) of every possible codeword, built on first use. 'encoded' may also be a
+	NumPy integer array of codewords, giving arrays of their data and statuses as decode_words() does.
+	"""
+	table = _lookup_table(data_bits)
+	if np is not None and isinstance(encoded, np.ndarray):
+		if (encoded < 0).any() or (encoded >= len(table)).any(): # negative indices would wrap around silently
+			raise ValueError("Not every entry is a codeword for {0} data bits.".format(data_bits))
+		entries = np.frombuffer(table, dtype=np.uint32)[encoded]
+		return (entries >> 8).astype(np.uint64), (entries & 0xFF).astype(np.int64) - 2
+	if not 0 <= encoded < len(table):
+		raise ValueError("{0} is not a codeword for {1} data bits.".format(encoded, data_bits))
+	entry = table[encoded]
+	return entry >> 8, (entry & 0xFF) - 2
+
+@lru_cache(maxsize=LOOKUP_CACHE_SIZE)
+def _lookup_table(data_bits: int):
+	"""
+	Returns the table of decode_lookup(): an array whose entry for every n-bit int is its decoded data << 8 |
+	its status + 2. Built with NumPy a chunk of ints at a time when available, else one decode_word() at a time.
+	"""
+	encoded_length = code_layout(data_bits).encoded_length
+	if encoded_length > LOOKUP_MAX_BITS:
+		raise ValueError("Codewords of {0} bits are too long for a lookup table, the maximum is {1}.".format(
+			encoded_length, LOOKUP_MAX_BITS))
+	table = array('I', bytes(4 << encoded_length))
+	if np is None:
+		for encoded in range(1 << encoded_length):
+			data, status = decode_word(encoded, data_bits)
+			table[encoded] = data << 8 | status + 2
+		return table
+
+	_, data_tables, syndrome_tables, (corrections, statuses) = _word_arrays(data_bits)
+	entries = np.frombuffer(table, dtype=np.uint32)
+	for start in range(0, 1 << encoded_length, STREAM_CHUNK_SIZE):
+		encoded = np.arange(start, min(start + STREAM_CHUNK_SIZE, 1 << encoded_length), dtype=np.uint64)
+		data = np.zeros(encoded.size, dtype=np.uint64)
+		found = np.zeros(encoded.size, dtype=np.int64)
+		for byte, (data_table, syndrome_table) in enumerate(zip(data_tables, syndrome_tables)):
+			column = (encoded >> np.uint64(byte * BITS_PER_BYTE)) & np.uint64(0xFF)
+			data ^= data_table[column]
+			found ^= syndrome_table[column]
+		entries[start:start + encoded.size] = (data ^ corrections[found]) << np.uint64(8) | (statuses[found] + 2).astype(np.uint64)
+	return table
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _word_tables(data_bits: int):
+	"""
+	Returns the lookup tables of encode_word() and decode_word() for data words of 'data_bits' bits: per data
+	byte (least significant first), the codeword of each of its values alone; per codeword byte, the data
+	bits << shift | syndrome << 1 | overall parity of each of its values alone; the (data correction, status)
+	of every syndrome << 1 | overall parity; and the shift.
+	"""
+	if data_bits < 1:
+		raise ValueError("Data words need at least one bit.")
+	layout = code_layout(data_bits)
+	n, shift = layout.encoded_length, layout.num_parity_bits + 1
+	encode_tables = tuple(tuple(ba2int(encode(int2ba((value << byte) & ((1 << data_bits) - 1), data_bits)))
+		for value in range(1 << BITS_PER_BYTE)) for byte in range(0, data_bits, BITS_PER_BYTE))
+
+	decode_tables = []
+	for byte in range(0, n, BITS_PER_BYTE):
+		table = []
+		for value in range(1 << BITS_PER_BYTE):
+			bits = int2ba((value << byte) & ((1 << n) - 1), n)
+			table.append(ba2int(_extract_data(bits, layout)) << shift | _syndrome(bits, layout) << 1 | parity(bits))
+		decode_tables.append(tuple(table))
+
+	fixes = []
+	for found in range(1 << shift):
+		syndrome, overall_correct = found >> 1, not found & 1
+		if (syndrome and overall_correct) or syndrome >= n:
+			fixes.append((0, DOUBLE_ERROR))
+		elif overall_correct:
+			fixes.append((0, NO_ERROR))
+		elif syndrome and not _is_power_of_two(syndrome): # a data bit is in error
+			fixes.append((1 << (data_bits - syndrome + (syndrome - 1).bit_length()), syndrome))
+		else:
+			fixes.append((0, syndrome))
+	return encode_tables, tuple(decode_tables), tuple(fixes), shift
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _word_arrays(data_bits: int):
+	"""
+	Returns _word_tables(data_bits) as NumPy arrays for encode_words() and decode_words(): the codeword tables
+	split into their low 64 bits and the bits above them, the decode tables split into data and syndrome << 1 |
+	overall parity tables, and the fixes split into data corrections and statuses.
+	"""
+	if np is None:
+		raise ImportError("The word array API requires NumPy.")
+	if data_bits > 64:
+		raise ValueError("Data words of the word array API hold at most 64 bits, not {0}.".format(data_bits))
+	encode_tables, decode_tables, fixes, shift = _word_tables(data_bits)
+	low = np.array([[codeword & ((1 << 64) - 1) for codeword in table] for table in encode_tables], dtype=np.uint64)
+	high = np.array([[codeword >> 64 for codeword in table] for table in encode_tables], dtype=np.uint64)
+	data = np.array([[found >> shift for found in table] for table in decode_tables], dtype=np.uint64)
+	syndromes = np.array([[found & ((1 << shift) - 1) for found in table] for table in decode_tables], dtype=np.int64)
+	corrections = np.array([correction for correction, _ in fixes], dtype=np.uint64)
+	statuses = np.array([status for _, status in fixes], dtype=np.int64)
+	return (low, high), data, syndromes, (corrections, statuses)
+
+def _word_bytes(data_bits: int):
+	"""
+	Returns the number of bytes holding a codeword of a 'data_bits' bit data word.
+	"""
+	return -(-code_layout(data_bits).encoded_length // BITS_PER_BYTE)
@@ -0,0 +1,24 @@
+"""
+File:		setup.py
+Author:		Dominic Carrano (carrano.dominic@gmail.com)
+Created:	October 16, 2026
+
+Installs the hamming package along with its optional C accelerator, hamming._hamming. If the accelerator
+can't be compiled the install still succeeds, and hamming runs in pure Python. Build it in place with
+`python setup.py build_ext --inplace`.
+"""
+from setuptools import Extension, setup
+
+setup(
+	name='hamming',
+	version='1.0.0',
+	description='Hamming SECDED codes for arbitrary length bitstrings.',
+	author='Dominic Carrano',
+	author_email='carrano.dominic@gmail.com',
+	license='MIT',
+	packages=['hamming'],
+	ext_modules=[Extension('hamming._hamming', sources=['hamming/_hamming.c'], optional=True)],
+	python_requires='>=3.8',
+	install_requires=['bitarray>=2.3'],
+	extras_require={'numpy': ['numpy']},
+)
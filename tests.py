@@ -6,12 +6,19 @@ Created:	December 19, 2017
 Suite of unit tests for functions in hammming.py.
 Each test returns a tuple of (# tests failed, textual info about the failure).
 """
+import asyncio
 from bitarray import bitarray
-from sys import stderr, stdout
+from bitarray.util import ba2int, int2ba
+from io import BytesIO, StringIO
+from os import path
+from subprocess import run
+from sys import executable, stderr, stdout
+from tempfile import TemporaryDirectory
+import tracemalloc
 import hamming
 
 # total number of unit tests (for nice output format purposes when running)
-N_TESTS = 52
+N_TESTS = 132
 
 # tests for hamming.bits_to_bytes
 
@@ -40,12 +47,20 @@ def bits_to_bytes_test4():
 	expected = bytearray(b'\x96')
 	return (0, "") if actual == expected else (1, "bits_to_bytes_test4 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
 
+def bits_to_bytes_test5():
+	# bit order is by index, whatever the bitarray's endianness
+	qux = bitarray('1010110011111111001100011000', endian='little')
+	actual = hamming.bits_to_bytes(qux)
+	expected = bytearray(b'\xAC\xFF\x31\x08')
+	return (0, "") if actual == expected else (1, "bits_to_bytes_test5 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
 def bits_to_bytes_tests():
 	a = bits_to_bytes_test1()
 	b = bits_to_bytes_test2()
 	c = bits_to_bytes_test3()
 	d = bits_to_bytes_test4()
-	return (a[0] + b[0] + c[0] + d[0], a[1] + b[1] + c[1] + d[1])
+	e = bits_to_bytes_test5()
+	return (a[0] + b[0] + c[0] + d[0] + e[0], a[1] + b[1] + c[1] + d[1] + e[1])
 
 # tests for hamming.bytes_to_bits
 
@@ -68,11 +83,19 @@ def bytes_to_bits_test3():
 	expected = bitarray('')
 	return (0, "") if actual == expected else (1, "bytes_to_bits_test3 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
 
+def bytes_to_bits_test4():
+	# slices of larger buffers work without copying them out first
+	qux = memoryview(b'\x00\x11\x23\x6C\xFF')[1:4]
+	actual = hamming.bytes_to_bits(qux)
+	expected = bitarray('000100010010001101101100')
+	return (0, "") if actual == expected else (1, "bytes_to_bits_test4 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
 def bytes_to_bits_tests():
 	a = bytes_to_bits_test1()
 	b = bytes_to_bits_test2()
 	c = bytes_to_bits_test3()
-	return (a[0] + b[0] + c[0], a[1] + b[1] + c[1])
+	d = bytes_to_bits_test4()
+	return (a[0] + b[0] + c[0] + d[0], a[1] + b[1] + c[1] + d[1])
 
 # tests for hamming._data_bits_covered
 
@@ -264,6 +287,14 @@ def decode_test8():
 	expected = bitarray('0100')
 	return (0, "") if actual == expected else (1, "decode_test8 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
 
+def decode_test9():
+	encoded  = bitarray('000000000') # no data length encodes to 9 bits
+	try:
+		actual = hamming.decode(encoded)
+	except ValueError:
+		return (0, "")
+	return (1, "decode_test9 FAILED! Expected: ValueError, Actual: {0}\n".format(actual))
+
 def decode_tests():
 	a = decode_test1()
 	b = decode_test2()
@@ -273,8 +304,1010 @@ def decode_tests():
 	f = decode_test6()
 	g = decode_test7()
 	h = decode_test8()
+	i = decode_test9()
+	return (a[0] + b[0] + c[0] + d[0] + e[0] + f[0] + g[0] + h[0] + i[0], a[1] + b[1] + c[1] + d[1] + e[1] + f[1] + g[1] + h[1] + i[1])
+
+# tests for hamming.decode_ex and hamming.DecodeCounters
+
+def decode_ex_test1():
+	result   = hamming.decode_ex(hamming.encode(bitarray('1011')))
+	actual   = (result.data, result.status, result.position)
+	expected = (bitarray('1011'), hamming.DecodeStatus.CLEAN, None)
+	return (0, "") if actual == expected else (1, "decode_ex_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_ex_test2():
+	encoded  = hamming.encode(bitarray('1011'))
+	encoded[5] = not encoded[5]
+	result   = hamming.decode_ex(encoded)
+	actual   = (result.data, result.status, result.position)
+	expected = (bitarray('1011'), hamming.DecodeStatus.CORRECTED, 5)
+	return (0, "") if actual == expected else (1, "decode_ex_test2 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_ex_test3():
+	encoded  = hamming.encode(bitarray('1011'))
+	encoded[0] = not encoded[0]
+	result   = hamming.decode_ex(encoded)
+	actual   = (result.data, result.status, result.position)
+	expected = (bitarray('1011'), hamming.DecodeStatus.CORRECTED_OVERALL_PARITY, 0)
+	return (0, "") if actual == expected else (1, "decode_ex_test3 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_ex_test4():
+	encoded  = hamming.encode(bitarray('1011'))
+	encoded[3] = not encoded[3]
+	encoded[6] = not encoded[6]
+	result   = hamming.decode_ex(encoded) # reported, not raised
+	actual   = (result.status, result.position)
+	expected = (hamming.DecodeStatus.UNCORRECTABLE, None)
+	return (0, "") if actual == expected else (1, "decode_ex_test4 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_counters_test1():
+	data     = b'Hello, World!'
+	encoded  = bytearray(hamming.encode_blocks(data))
+	encoded[0] ^= 0x80 # overall parity bit of block 0 in error
+	encoded[9] ^= 0x81 # bits 72 and 79 in error - both in block 1
+	counters = hamming.DecodeCounters()
+	hamming.decode_blocks(encoded, counters=counters)
+	actual   = (counters.clean, counters.corrected, counters.corrected_overall_parity, counters.uncorrectable)
+	expected = (0, 0, 1, 1)
+	return (0, "") if actual == expected else (1, "decode_counters_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_counters_test2():
+	data     = b'Hello, World!' * 4
+	encoded  = bytearray(hamming.encode_blocks(data, 8))
+	encoded[40] ^= 0x02 # bit 326 in error - index 1 of block 25
+	counters = hamming.DecodeCounters()
+	hamming.decode_stream([encoded[i:i + 5] for i in range(0, len(encoded), 5)], BytesIO(), 8, 8, counters)
+	hamming.decode_stream([encoded], BytesIO(), 8, counters=counters) # counts accumulate across calls
+	actual   = counters.as_dict()
+	expected = {hamming.DecodeStatus.CLEAN: 102, hamming.DecodeStatus.CORRECTED: 2,
+		hamming.DecodeStatus.CORRECTED_OVERALL_PARITY: 0, hamming.DecodeStatus.UNCORRECTABLE: 0}
+	return (0, "") if actual == expected else (1, "decode_counters_test2 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_ex_tests():
+	a = decode_ex_test1()
+	b = decode_ex_test2()
+	c = decode_ex_test3()
+	d = decode_ex_test4()
+	e = decode_counters_test1()
+	f = decode_counters_test2()
+	return (a[0] + b[0] + c[0] + d[0] + e[0] + f[0], a[1] + b[1] + c[1] + d[1] + e[1] + f[1])
+
+# tests for hamming.encode_into and hamming.decode_into
+
+def encode_into_test1():
+	data     = bitarray('01100100110')
+	out      = bitarray('1' * 16) # stale contents get overwritten
+	hamming.encode_into(data, out)
+	actual   = out
+	expected = hamming.encode(data)
+	return (0, "") if actual == expected else (1, "encode_into_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def encode_into_test2():
+	try:
+		hamming.encode_into(bitarray('1011'), bitarray(7))
+	except ValueError:
+		return (0, "")
+	return (1, "encode_into_test2 FAILED! Expected: ValueError, Actual: no error\n")
+
+def decode_into_test1():
+	encoded  = hamming.encode(bitarray('01100100110'))
+	encoded[9] = not encoded[9]
+	received = encoded.copy()
+	out      = bitarray(11)
+	status   = hamming.decode_into(encoded, out)
+	actual   = (out, status, encoded == received)
+	expected = (bitarray('01100100110'), 9, True)
+	return (0, "") if actual == expected else (1, "decode_into_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_into_test2():
+	encoded  = hamming.encode(bitarray('01100100110'))
+	encoded[8] = not encoded[8]
+	out      = bitarray(11)
+	status   = hamming.decode_into(encoded, out, fix=True)
+	actual   = (out, status, encoded)
+	expected = (bitarray('01100100110'), 8, hamming.encode(bitarray('01100100110')))
+	return (0, "") if actual == expected else (1, "decode_into_test2 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_into_test3():
+	encoded  = hamming.encode(bitarray('01100100110'))
+	encoded[3] = not encoded[3]
+	encoded[12] = not encoded[12]
+	actual   = hamming.decode_into(encoded, bitarray(11)) # reported, not raised
+	expected = hamming.DOUBLE_ERROR
+	return (0, "") if actual == expected else (1, "decode_into_test3 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_into_test4():
+	# a steady frame size - once warmed up, a thousand calls hold on to no object per call more than a single one, and
+	# with the C accelerator no call allocates anything the size of a frame, even for a moment
+	data     = hamming.bytes_to_bits(b'Hello, World!' * 320)
+	encoded  = hamming.encode(data)
+	encoded[100] = not encoded[100]
+	data_out, encoded_out = bitarray(len(data)), bitarray(len(encoded))
+	def frames(count):
+		for _ in range(count):
+			hamming.decode_into(encoded, data_out)
+			hamming.encode_into(data_out, encoded_out)
+	frames(10)
+	growth = []
+	for count in (1, 1000):
+		tracemalloc.start() # afresh for every count, which also resets the peak (tracemalloc.reset_peak() is 3.9+)
+		try:
+			frames(count)
+			current, peak = tracemalloc.get_traced_memory()
+		finally:
+			tracemalloc.stop()
+		growth.append(current)
+	transient = peak < len(data) // hamming.BITS_PER_BYTE // 4 if hamming.current_backend() == 'c' else True
+	leaked   = growth[1] - growth[0] >= 8 * 1000 # less than any object per call, as the interpreter caches a few frames
+	actual   = (not leaked, transient, data_out == data)
+	expected = (True, True, True)
+	return (0, "") if actual == expected else (1, "decode_into_test4 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def use_backend_test1():
+	try:
+		hamming.use_backend('fortran')
+	except ValueError:
+		return (0, "")
+	return (1, "use_backend_test1 FAILED! Expected: ValueError, Actual: no error\n")
+
+def use_backend_test2():
+	# encode_into/decode_into on little-endian bitarrays, which the C kernels leave to pure Python
+	data     = bitarray('01100100110', endian='little')
+	encoded  = bitarray(16, endian='little')
+	hamming.encode_into(data, encoded)
+	encoded[10] = not encoded[10]
+	out      = bitarray(11, endian='little')
+	status   = hamming.decode_into(encoded, out)
+	received = hamming.encode(bitarray('01100100110'))
+	received[10] = not received[10]
+	actual   = (encoded.tolist(), out.tolist(), status)
+	expected = (received.tolist(), data.tolist(), 10)
+	return (0, "") if actual == expected else (1, "use_backend_test2 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def into_tests():
+	a = encode_into_test1()
+	b = encode_into_test2()
+	c = decode_into_test1()
+	d = decode_into_test2()
+	e = decode_into_test3()
+	f = decode_into_test4()
+	g = use_backend_test1()
+	h = use_backend_test2()
 	return (a[0] + b[0] + c[0] + d[0] + e[0] + f[0] + g[0] + h[0], a[1] + b[1] + c[1] + d[1] + e[1] + f[1] + g[1] + h[1])
 
+# tests for the asyncio API
+
+class _Writer:
+	# the parts of an asyncio.StreamWriter that FramedStream uses, collecting everything written
+	def __init__(self):
+		self.written = bytearray()
+	def write(self, data):
+		self.written += data
+	async def drain(self):
+		return None
+
+def _framed(*messages, corrupt=None):
+	# writes the messages through a FramedStream, flips the bits of the output given in 'corrupt' as
+	# {byte index: mask}, and returns a FramedStream reading them back
+	async def frame():
+		writer = _Writer()
+		for message in messages:
+			await hamming.FramedStream(None, writer, 32).write(message)
+		for index, mask in (corrupt or {}).items():
+			writer.written[index] ^= mask
+		reader = asyncio.StreamReader()
+		reader.feed_data(bytes(writer.written))
+		reader.feed_eof()
+		return hamming.FramedStream(reader, None, 32)
+	return frame()
+
+def async_test1():
+	async def run():
+		data = bitarray('01100100110')
+		inline = await hamming.decode_async(await hamming.encode_async(data))
+		offloaded = await hamming.decode_async(await hamming.encode_async(data, threshold=1), threshold=1)
+		return inline, offloaded
+	actual   = asyncio.run(run())
+	expected = (bitarray('01100100110'), bitarray('01100100110'))
+	return (0, "") if actual == expected else (1, "async_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def async_test2():
+	async def run():
+		stream = await _framed(b'Hello, World!', b'', corrupt={9 + 6: 0x10}) # bit 51 of the first message's blocks
+		return await stream.read(), await stream.read()
+	actual   = asyncio.run(run())
+	expected = ((b'Hello, World!', [(1, 12)]), (b'', []))
+	return (0, "") if actual == expected else (1, "async_test2 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def async_test3():
+	async def run():
+		stream = await _framed(b'Hello, World!', corrupt={8: 0x03}) # two bits of the length header
+		return await stream.read()
+	try:
+		actual = asyncio.run(run())
+	except ValueError:
+		return (0, "")
+	return (1, "async_test3 FAILED! Expected: ValueError, Actual: {0}\n".format(actual))
+
+def async_test4():
+	async def run():
+		stream = await _framed(b'Hello, World!')
+		stream.reader = asyncio.StreamReader()
+		stream.reader.feed_data(b'\x00' * 12) # a header for an empty message, then a truncated header
+		stream.reader.feed_eof()
+		return await stream.read(), await stream.read()
+	try:
+		actual = asyncio.run(run())
+	except asyncio.IncompleteReadError:
+		return (0, "")
+	return (1, "async_test4 FAILED! Expected: IncompleteReadError, Actual: {0}\n".format(actual))
+
+def async_tests():
+	a = async_test1()
+	b = async_test2()
+	c = async_test3()
+	d = async_test4()
+	return (a[0] + b[0] + c[0] + d[0], a[1] + b[1] + c[1] + d[1])
+
+# tests for hamming.encode_word, hamming.decode_word, their array versions and hamming.decode_lookup
+
+def encode_word_test1():
+	value    = 0x0123456789ABCDEF
+	actual   = hamming.encode_word(value)
+	expected = ba2int(hamming.encode(int2ba(value, 64)))
+	return (0, "") if actual == expected else (1, "encode_word_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def encode_word_test2():
+	value    = 0xDEADBEEF
+	actual   = hamming.encode_word(value, 32)
+	expected = ba2int(hamming.encode(int2ba(value, 32)))
+	return (0, "") if actual == expected else (1, "encode_word_test2 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def encode_word_test3():
+	try:
+		actual = hamming.encode_word(1 << 32, 32)
+	except ValueError:
+		return (0, "")
+	return (1, "encode_word_test3 FAILED! Expected: ValueError, Actual: {0}\n".format(actual))
+
+def decode_word_test1():
+	encoded  = hamming.encode_word(0xDEADBEEF, 32) ^ (1 << (38 - 20)) # bit 20 of the (39,32) codeword in error
+	actual   = hamming.decode_word(encoded, 32)
+	expected = (0xDEADBEEF, 20)
+	return (0, "") if actual == expected else (1, "decode_word_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_word_test2():
+	encoded  = hamming.encode_word(0x0123456789ABCDEF) ^ 0x11 # bits 67 and 71 in error
+	actual   = hamming.decode_word(encoded)[1]
+	expected = hamming.DOUBLE_ERROR
+	return (0, "") if actual == expected else (1, "decode_word_test2 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_words_test1():
+	if hamming.np is None:
+		return (0, "")
+	values   = [0, 0x0123456789ABCDEF, (1 << 64) - 1]
+	encoded  = hamming.encode_words(values)
+	encoded[1, 4] ^= 0x08 # bit 36 of the second codeword in error
+	encoded[2, 8] ^= 0x03 # bits 70 and 71 of the third in error
+	data, status = hamming.decode_words(encoded)
+	actual   = ([int.from_bytes(row.tobytes(), 'big') for row in hamming.encode_words(values)], data.tolist()[:2], status.tolist())
+	expected = ([hamming.encode_word(value) for value in values], values[:2], [hamming.NO_ERROR, 36, hamming.DOUBLE_ERROR])
+	return (0, "") if actual == expected else (1, "decode_words_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_words_test2():
+	# values too wide for the data words, and codewords with padding bits set, are rejected as by the int codecs
+	if hamming.np is None:
+		return (0, "")
+	actual = []
+	for codec, argument in ((hamming.encode_words, [5, (1 << 40) | 5]), (hamming.decode_words, [[0x80] + [0x00] * 4])):
+		try:
+			actual.append(codec(argument, 32))
+		except ValueError:
+			actual.append("ValueError")
+	expected = ["ValueError", "ValueError"]
+	return (0, "") if actual == expected else (1, "decode_words_test2 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_lookup_test1():
+	# every possible 8-bit received word of the (8,4) code
+	actual   = [hamming.decode_lookup(word, 4) for word in range(256)]
+	expected = [hamming.decode_word(word, 4) for word in range(256)]
+	return (0, "") if actual == expected else (1, "decode_lookup_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_lookup_test2():
+	encoded  = ba2int(hamming.encode(bitarray('01100100110'))) ^ (1 << 15 - 6) # bit 6 of the (16,11) codeword in error
+	actual   = hamming.decode_lookup(encoded, 11)
+	expected = (ba2int(bitarray('01100100110')), 6)
+	return (0, "") if actual == expected else (1, "decode_lookup_test2 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_lookup_test3():
+	if hamming.np is None:
+		return (0, "")
+	data, status = hamming.decode_lookup(hamming.np.arange(1 << 16), 11)
+	actual   = list(zip(data.tolist(), status.tolist()))[::97]
+	expected = [hamming.decode_word(word, 11) for word in range(0, 1 << 16, 97)]
+	return (0, "") if actual == expected else (1, "decode_lookup_test3 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_lookup_test4():
+	# (39,32) codewords are past LOOKUP_MAX_BITS
+	try:
+		actual = hamming.decode_lookup(0, 32)
+	except ValueError:
+		return (0, "")
+	return (1, "decode_lookup_test4 FAILED! Expected: ValueError, Actual: {0}\n".format(actual))
+
+def decode_lookup_test5():
+	# arrays with a negative or too large codeword are rejected, like single ints, rather than wrapping around
+	if hamming.np is None:
+		return (0, "")
+	actual = []
+	for encoded in (hamming.np.array([3, -1]), hamming.np.array([3, 1 << 16])):
+		try:
+			actual.append(hamming.decode_lookup(encoded, 11))
+		except ValueError:
+			actual.append("ValueError")
+	expected = ["ValueError", "ValueError"]
+	return (0, "") if actual == expected else (1, "decode_lookup_test5 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def word_tests():
+	a = encode_word_test1()
+	b = encode_word_test2()
+	c = encode_word_test3()
+	d = decode_word_test1()
+	e = decode_word_test2()
+	f = decode_words_test1()
+	g = decode_lookup_test1()
+	h = decode_lookup_test2()
+	i = decode_lookup_test3()
+	j = decode_lookup_test4()
+	k = decode_lookup_test5()
+	l = decode_words_test2()
+	return (a[0] + b[0] + c[0] + d[0] + e[0] + f[0] + g[0] + h[0] + i[0] + j[0] + k[0] + l[0], \
+		a[1] + b[1] + c[1] + d[1] + e[1] + f[1] + g[1] + h[1] + i[1] + j[1] + k[1] + l[1])
+
+# tests for hamming.encode_interleaved and hamming.decode_interleaved
+
+def encode_interleaved_test1():
+	# 10 data bits at depth 3 -> three (8,4) codewords, the last data bits zero padded, read column by column
+	data     = bitarray('1011001110')
+	encoded  = hamming.encode_interleaved(data, 3)
+	actual   = [encoded[part::3] for part in range(3)]
+	expected = [hamming.encode(bitarray('1011')), hamming.encode(bitarray('0011')), hamming.encode(bitarray('1000'))]
+	return (0, "") if actual == expected else (1, "encode_interleaved_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_interleaved_test1():
+	data     = hamming.bytes_to_bits(b'Hello, World!')
+	encoded  = hamming.encode_interleaved(data, 8)
+	encoded[37:45] = ~encoded[37:45] # a burst of 8 errors
+	received = encoded.copy()
+	actual   = (hamming.decode_interleaved(encoded, 8, len(data)), len(hamming.decode_interleaved(encoded, 8)), encoded == received)
+	expected = (data, 104, True)
+	return (0, "") if actual == expected else (1, "decode_interleaved_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_interleaved_test2():
+	encoded  = hamming.encode_interleaved(hamming.bytes_to_bits(b'Hello, World!'), 8)
+	encoded[37:46] = ~encoded[37:46] # a burst of 9 errors, two of them in the same codeword
+	try:
+		actual = hamming.decode_interleaved(encoded, 8)
+	except ValueError:
+		return (0, "")
+	return (1, "decode_interleaved_test2 FAILED! Expected: ValueError, Actual: {0}\n".format(actual))
+
+def decode_interleaved_test3():
+	# 9 bits split 3 ways can't be codewords
+	try:
+		actual = hamming.decode_interleaved(bitarray(9), 3)
+	except ValueError:
+		return (0, "")
+	return (1, "decode_interleaved_test3 FAILED! Expected: ValueError, Actual: {0}\n".format(actual))
+
+def interleaved_tests():
+	a = encode_interleaved_test1()
+	b = decode_interleaved_test1()
+	c = decode_interleaved_test2()
+	d = decode_interleaved_test3()
+	return (a[0] + b[0] + c[0] + d[0], a[1] + b[1] + c[1] + d[1])
+
+# tests for hamming.EncodedBuffer
+
+def encoded_buffer_test1():
+	data   = bitarray('01100100110')
+	buffer = hamming.EncodedBuffer.from_data(data)
+	buffer.set_data_bit(0, 1)
+	buffer.set_data_bit(5, 1) # already set
+	buffer.set_data_bit(10, 0)
+	actual   = (buffer.encoded, buffer.data)
+	expected = (hamming.encode(bitarray('11100100110')), bitarray('11100100110'))
+	return (0, "") if actual == expected else (1, "encoded_buffer_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def encoded_buffer_test2():
+	# a range spanning several runs of data bits, updated in place in the wrapped codeword
+	data    = hamming.bytes_to_bits(b'Hello, World!')
+	encoded = hamming.encode(data)
+	hamming.EncodedBuffer(encoded).write_range(20, hamming.bytes_to_bits(b'ppy N'))
+	data[20:60] = hamming.bytes_to_bits(b'ppy N')
+	actual   = encoded
+	expected = hamming.encode(data)
+	return (0, "") if actual == expected else (1, "encoded_buffer_test2 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def encoded_buffer_test3():
+	buffer = hamming.EncodedBuffer.from_data(bitarray('0011'))
+	try:
+		actual = buffer.write_range(2, bitarray('101'))
+	except IndexError:
+		return (0, "")
+	return (1, "encoded_buffer_test3 FAILED! Expected: IndexError, Actual: {0}\n".format(actual))
+
+def encoded_buffer_test4():
+	# bits of the other endianness are written the same
+	buffer = hamming.EncodedBuffer.from_data(bitarray('10110011101'))
+	buffer.write_range(2, bitarray('011', endian='little'))
+	actual   = buffer.encoded
+	expected = hamming.encode(bitarray('10011011101'))
+	return (0, "") if actual == expected else (1, "encoded_buffer_test4 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def encoded_buffer_tests():
+	a = encoded_buffer_test1()
+	b = encoded_buffer_test2()
+	c = encoded_buffer_test3()
+	d = encoded_buffer_test4()
+	return (a[0] + b[0] + c[0] + d[0], a[1] + b[1] + c[1] + d[1])
+
+# tests for the hamming package's lazy imports
+
+def lazy_import_test1():
+	# a plain import only loads the core - NumPy, asyncio and the process pool wait until first used
+	script   = "import sys, hamming; print(sorted(m for m in ('numpy', 'asyncio', 'concurrent.futures', 'hamming.blocks') if m in sys.modules))"
+	result   = run([executable, "-c", script], cwd=path.dirname(path.abspath(__file__)), capture_output=True, text=True)
+	actual   = result.stdout.strip()
+	expected = "[]"
+	return (0, "") if actual == expected else (1, "lazy_import_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual or result.stderr))
+
+def lazy_import_test2():
+	actual   = (hamming.encode_blocks is hamming.blocks.encode_blocks, hamming._decode is hamming.core._decode, "decode_lookup" in dir(hamming))
+	expected = (True, True, True)
+	return (0, "") if actual == expected else (1, "lazy_import_test2 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def lazy_import_test3():
+	# a star import brings in the whole API, whichever module it lives in, and none of the package's internals
+	namespace = {}
+	exec("from hamming import *", namespace)
+	actual   = tuple(name in namespace for name in ('encode', 'decode_bytes', 'encode_blocks', 'decode_word', 'protect_file',
+		'scrub', 'core', 'import_module', 'environ'))
+	expected = (True, True, True, True, True, True, False, False, False)
+	return (0, "") if actual == expected else (1, "lazy_import_test3 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def lazy_import_test4():
+	# a star import leaves the importer's own np and main alone, while hamming.np and hamming.main still work
+	namespace = {'np': 'mine', 'main': 'mine'}
+	exec("from hamming import *", namespace)
+	actual   = (namespace['np'], namespace['main'], 'np' in hamming.__all__, 'main' in hamming.__all__, callable(hamming.main))
+	expected = ('mine', 'mine', False, False, True)
+	return (0, "") if actual == expected else (1, "lazy_import_test4 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def lazy_import_tests():
+	a = lazy_import_test1()
+	b = lazy_import_test2()
+	c = lazy_import_test3()
+	d = lazy_import_test4()
+	return (a[0] + b[0] + c[0] + d[0], a[1] + b[1] + c[1] + d[1])
+
+# tests for hamming.code_layout
+
+def code_layout_test1():
+	layout   = hamming.code_layout(4)
+	actual   = (layout.num_parity_bits, layout.encoded_length, layout.parity_positions, list(layout.data_positions))
+	expected = (3, 8, (1, 2, 4), [3, 5, 6, 7])
+	return (0, "") if actual == expected else (1, "code_layout_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def code_layout_test2():
+	actual   = list(hamming.code_layout(4).masks)
+	expected = [bitarray('01010101'), bitarray('00110011'), bitarray('00001111')]
+	return (0, "") if actual == expected else (1, "code_layout_test2 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def code_layout_test3():
+	# a repeated data length only builds its layout once
+	hamming.code_layout.cache_clear()
+	data = bitarray('01100100110')
+	hamming.encode(data)
+	hamming.decode(hamming.encode(data))
+	info     = hamming.code_layout.cache_info()
+	actual   = (info.hits, info.misses)
+	expected = (2, 1)
+	return (0, "") if actual == expected else (1, "code_layout_test3 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def code_layout_tests():
+	a = code_layout_test1()
+	b = code_layout_test2()
+	c = code_layout_test3()
+	return (a[0] + b[0] + c[0], a[1] + b[1] + c[1])
+
+# tests for hamming.encode_batch and hamming.decode_batch - these pass trivially without NumPy installed
+
+def encode_batch_test1():
+	if hamming.np is None:
+		return (0, "")
+	data     = [[0, 0, 1, 1], [0, 1, 0, 0], [1, 0, 1, 1]]
+	actual   = hamming.encode_batch(data).tolist()
+	expected = [hamming.encode(bitarray(row)).tolist() for row in data]
+	return (0, "") if actual == expected else (1, "encode_batch_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_batch_test1():
+	if hamming.np is None:
+		return (0, "")
+	encoded  = [bitarray('11000011'), bitarray('00110111'), bitarray('11011100'), bitarray('01000011')] # clean, bit 5, bit 3, overall bit
+	data, status = hamming.decode_batch([row.tolist() for row in encoded])
+	actual   = (data.tolist(), status.tolist())
+	expected = ([[0, 0, 1, 1], [1, 0, 1, 1], [0, 1, 0, 0], [0, 0, 1, 1]], [hamming.NO_ERROR, 5, 3, 0])
+	return (0, "") if actual == expected else (1, "decode_batch_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_batch_test2():
+	# a double error is reported for its own record only
+	if hamming.np is None:
+		return (0, "")
+	encoded  = [bitarray('11000011'), bitarray('11110011')] # clean, bits 2 and 3 in error
+	data, status = hamming.decode_batch([row.tolist() for row in encoded])
+	actual   = (data[0].tolist(), status.tolist())
+	expected = ([0, 0, 1, 1], [hamming.NO_ERROR, hamming.DOUBLE_ERROR])
+	return (0, "") if actual == expected else (1, "decode_batch_test2 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def batch_tests():
+	a = encode_batch_test1()
+	b = decode_batch_test1()
+	c = decode_batch_test2()
+	return (a[0] + b[0] + c[0], a[1] + b[1] + c[1])
+
+# tests for hamming.encode_blocks and hamming.decode_blocks
+
+def encode_blocks_test1():
+	actual   = hamming.encode_blocks(b'\x03', 4)
+	expected = b'\x00\xC3' # encodings of 0000 and 0011 back to back
+	return (0, "") if actual == expected else (1, "encode_blocks_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def encode_blocks_test2():
+	# 24 data bits in 11-bit blocks -> two (16,11) codewords and a (7,2) one for the 2 bits left over, zero padded to 40 bits
+	data     = b'\x48\x69\x21'
+	bits     = hamming.bytes_to_bits(data)
+	actual   = hamming.encode_blocks(data, 11)
+	expected = (hamming.encode(bits[:11]) + hamming.encode(bits[11:22]) + hamming.encode(bits[22:]) + bitarray('0')).tobytes()
+	return (0, "") if actual == expected else (1, "encode_blocks_test2 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_blocks_test1():
+	data     = b'Hello, World!'
+	encoded  = bytearray(hamming.encode_blocks(data, 32))
+	encoded[6] ^= 0x10 # bit 51 in error - index 12 of block 1
+	actual   = hamming.decode_blocks(encoded, 32)
+	expected = (data, [(1, 12)])
+	return (0, "") if actual == expected else (1, "decode_blocks_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_blocks_test2():
+	data     = b'Hello, World!'
+	encoded  = bytearray(hamming.encode_blocks(data))
+	encoded[9] ^= 0x81 # bits 72 and 79 in error - both in block 1
+	decoded, errors = hamming.decode_blocks(encoded)
+	actual   = (decoded[:8], decoded[8:] == data[8:], errors)
+	expected = (data[:8], False, [(1, hamming.DOUBLE_ERROR)])
+	return (0, "") if actual == expected else (1, "decode_blocks_test2 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_blocks_test3():
+	# no data length encodes to a single byte of 4-bit blocks
+	try:
+		actual = hamming.decode_blocks(b'\x00', 4)
+	except ValueError:
+		return (0, "")
+	return (1, "decode_blocks_test3 FAILED! Expected: ValueError, Actual: {0}\n".format(actual))
+
+def blocks_tests():
+	a = encode_blocks_test1()
+	b = encode_blocks_test2()
+	c = decode_blocks_test1()
+	d = decode_blocks_test2()
+	e = decode_blocks_test3()
+	return (a[0] + b[0] + c[0] + d[0] + e[0], a[1] + b[1] + c[1] + d[1] + e[1])
+
+# tests for hamming.encode_stream and hamming.decode_stream
+
+def encode_stream_test1():
+	# 3 data bytes per chunk with 3-bit blocks, so chunks end mid-way through the data
+	data     = b'Hello, World!'
+	out      = BytesIO()
+	written  = hamming.encode_stream(BytesIO(data), out, block_bits=3, chunk_size=1)
+	actual   = (out.getvalue(), written)
+	expected = (hamming.encode_blocks(data, 3), len(hamming.encode_blocks(data, 3)))
+	return (0, "") if actual == expected else (1, "encode_stream_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_stream_test1():
+	data     = b'Hello, World!' * 4
+	encoded  = bytearray(hamming.encode_blocks(data, 8))
+	encoded[40] ^= 0x02 # bit 326 in error - index 1 of block 25
+	out      = BytesIO()
+	errors   = hamming.decode_stream([encoded[i:i + 5] for i in range(0, len(encoded), 5)], out, block_bits=8, chunk_size=8)
+	actual   = (out.getvalue(), errors)
+	expected = (data, [(25, 1)])
+	return (0, "") if actual == expected else (1, "decode_stream_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def stream_tests():
+	a = encode_stream_test1()
+	b = decode_stream_test1()
+	return (a[0] + b[0], a[1] + b[1])
+
+# tests for hamming.encode_parallel and hamming.decode_parallel
+
+def encode_parallel_test1():
+	data     = b'Hello, World!' * 100
+	actual   = hamming.encode_parallel(data, 32, workers=2, chunk_size=100)
+	expected = hamming.encode_blocks(data, 32)
+	return (0, "") if actual == expected else (1, "encode_parallel_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_parallel_test1():
+	data     = b'Hello, World!' * 100
+	encoded  = bytearray(hamming.encode_blocks(data, 32))
+	encoded[500] ^= 0x40 # bit 4001 in error - index 23 of block 102
+	encoded[900] ^= 0x06 # bits 7205 and 7206 in error - both in block 184
+	actual   = hamming.decode_parallel(encoded, 32, workers=2, chunk_size=100)[1]
+	expected = [(102, 23), (184, hamming.DOUBLE_ERROR)]
+	return (0, "") if actual == expected else (1, "decode_parallel_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def parallel_tests():
+	a = encode_parallel_test1()
+	b = decode_parallel_test1()
+	return (a[0] + b[0], a[1] + b[1])
+
+# tests for hamming.protect_file and hamming.verify_file
+
+def _protected_file(directory, data, block_bits=hamming.BLOCK_BITS):
+	name = path.join(directory, 'data.bin')
+	with open(name, 'wb') as data_file:
+		data_file.write(data)
+	hamming.protect_file(name, block_bits=block_bits)
+	return name
+
+def _corrupt_file(name, offset, mask):
+	with open(name, 'r+b') as data_file:
+		data_file.seek(offset)
+		byte = data_file.read(1)[0]
+		data_file.seek(offset)
+		data_file.write(bytes([byte ^ mask]))
+
+def protect_file_test1():
+	with TemporaryDirectory() as directory:
+		name = _protected_file(directory, b'\x03\x48', 8)
+		with open(name + hamming.SIDECAR_SUFFIX, 'rb') as sidecar:
+			actual = sidecar.read()
+	expected = hamming.SIDECAR_HEADER.pack(hamming.SIDECAR_MAGIC, 8, 2) + b'\x17\x0C' # p1, p2, p4 and overall set; p4 and p8 set
+	return (0, "") if actual == expected else (1, "protect_file_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def protect_file_test2():
+	# a bad block size is rejected before the existing sidecar is touched
+	with TemporaryDirectory() as directory:
+		name = _protected_file(directory, b'Hello, World!')
+		with open(name + hamming.SIDECAR_SUFFIX, 'rb') as sidecar:
+			before = sidecar.read()
+		try:
+			hamming.protect_file(name, block_bits=12)
+			raised = False
+		except ValueError:
+			raised = True
+		with open(name + hamming.SIDECAR_SUFFIX, 'rb') as sidecar:
+			actual = (raised, sidecar.read() == before, hamming.verify_file(name).blocks, path.exists(name + hamming.SIDECAR_SUFFIX + '.tmp'))
+	expected = (True, True, 2, False)
+	return (0, "") if actual == expected else (1, "protect_file_test2 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def verify_file_test1():
+	data = b'Hello, World!' * 100
+	with TemporaryDirectory() as directory:
+		name = _protected_file(directory, data)
+		_corrupt_file(name, 1000, 0x20)
+		report = hamming.verify_file(name, repair=True)
+		with open(name, 'rb') as data_file:
+			actual = (report.blocks, report.corrected, report.uncorrectable, data_file.read() == data)
+	expected = (163, [1000], [], True)
+	return (0, "") if actual == expected else (1, "verify_file_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def verify_file_test2():
+	# errors in the sidecar are found too, and a double error is left alone
+	data = b'Hello, World!' * 100
+	with TemporaryDirectory() as directory:
+		name = _protected_file(directory, data, 32)
+		_corrupt_file(name + hamming.SIDECAR_SUFFIX, hamming.SIDECAR_HEADER.size + 7, 0x04)
+		_corrupt_file(name, 12, 0x11)
+		report = hamming.verify_file(name)
+		actual = (report.corrected, report.uncorrectable, hamming.verify_file(name, repair=True).corrected, hamming.verify_file(name).corrected)
+	expected = ([28], [12], [28], [])
+	return (0, "") if actual == expected else (1, "verify_file_test2 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def main_test1():
+	with TemporaryDirectory() as directory:
+		name = _protected_file(directory, b'Hello, World!')
+		_corrupt_file(name, 3, 0x01)
+		output = stdout
+		try:
+			hamming.cli.stdout = StringIO() # silence the report
+			actual = (hamming.main(['verify', name]), hamming.main(['repair', name]), hamming.main(['verify', name]))
+		finally:
+			hamming.cli.stdout = output
+	expected = (1, 0, 0)
+	return (0, "") if actual == expected else (1, "main_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def file_tests():
+	a = protect_file_test1()
+	b = verify_file_test1()
+	c = verify_file_test2()
+	d = main_test1()
+	e = protect_file_test2()
+	return (a[0] + b[0] + c[0] + d[0] + e[0], a[1] + b[1] + c[1] + d[1] + e[1])
+
+# tests for hamming.scrub
+
+def scrub_test1():
+	# one single error and one double error, in two 1 KiB chunks of a file found by walking its directory
+	with TemporaryDirectory() as directory:
+		name = _protected_file(directory, bytes(range(256)) * 8)
+		_corrupt_file(name, 100, 0x10)
+		_corrupt_file(name, 1500, 0x03)
+		report = hamming.scrub(directory, workers=2, chunk_size=1024)
+		actual = (report.files, report.blocks, report.bytes_scanned, report.corrected, report.uncorrectable,
+			hamming.verify_file(name).corrected)
+	expected = (1, 256, 2048, [(name, 96)], [(name, 1496)], [])
+	return (0, "") if actual == expected else (1, "scrub_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def scrub_test2():
+	# a scrub interrupted after its first chunk resumes from its checkpoint without checking that chunk again
+	with TemporaryDirectory() as directory:
+		name = _protected_file(directory, bytes(range(256)) * 8)
+		_corrupt_file(name, 100, 0x10)
+		checkpoint, chunks = path.join(directory, 'scrub.json'), []
+		def interrupt(report):
+			chunks.append(report.bytes_scanned)
+			raise KeyboardInterrupt
+		try:
+			hamming.scrub(name, workers=1, checkpoint=checkpoint, progress=interrupt, chunk_size=1024)
+		except KeyboardInterrupt:
+			pass
+		report = hamming.scrub(name, workers=1, checkpoint=checkpoint, progress=lambda report: chunks.append(report.bytes_scanned), chunk_size=1024)
+		actual = (chunks, report.bytes_scanned, report.corrected, path.exists(checkpoint))
+	expected = ([1024, 2048], 2048, [(name, 96)], False)
+	return (0, "") if actual == expected else (1, "scrub_test2 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def scrub_tests():
+	a = scrub_test1()
+	b = scrub_test2()
+	return (a[0] + b[0], a[1] + b[1])
+
+# tests for hamming.enable_metrics and hamming.metrics_snapshot
+
+def metrics_test1():
+	encode = hamming.encode
+	hamming.reset_metrics()
+	hamming.enable_metrics()
+	try:
+		encoded = hamming.encode(bitarray('01100100110'))
+		encoded[6] = not encoded[6]
+		hamming.decode(encoded)
+		encoded[3] = not encoded[3]
+		encoded[5] = not encoded[5]
+		try:
+			hamming.decode(encoded)
+		except ValueError:
+			pass
+		hamming.decode_blocks(hamming.encode_blocks(b'Hello, World!', 32), 32)
+		snapshot = hamming.metrics_snapshot()
+	finally:
+		hamming.disable_metrics()
+	functions = snapshot["functions"]
+	actual   = (snapshot["enabled"], functions["encode"]["calls"], functions["encode"]["bytes"], functions["decode"]["calls"],
+		functions["decode"]["corrected"], functions["decode"]["uncorrectable"], functions["decode"]["errors"],
+		functions["decode_blocks"]["clean"], functions["bytes_to_bits"]["calls"], hamming.encode is encode)
+	expected = (True, 1, 2, 2, 1, 1, 0, 4, 0, True)
+	return (0, "") if actual == expected else (1, "metrics_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def metrics_test2():
+	# nothing is recorded while metrics are off
+	hamming.reset_metrics()
+	hamming.encode(bitarray('1011'))
+	actual   = hamming.metrics_snapshot()
+	expected = {"enabled": False, "functions": {name: 0 for name in actual["functions"]}}
+	actual   = {"enabled": actual["enabled"], "functions": {name: metrics["calls"] for name, metrics in actual["functions"].items()}}
+	return (0, "") if actual == expected else (1, "metrics_test2 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def metrics_test3():
+	# decode_bytes() counts the statuses of what it decodes, a double error as uncorrectable rather than as an exception
+	hamming.reset_metrics()
+	hamming.enable_metrics()
+	try:
+		encoded = bytearray(hamming.encode_bytes(b'Hello, World!'))
+		encoded[3] ^= 0x10
+		decoded = hamming.decode_bytes(encoded, pad='left')
+		encoded[5] ^= 0x01
+		try:
+			hamming.decode_bytes(encoded)
+		except ValueError:
+			decoded += b'!'
+		functions = hamming.metrics_snapshot()["functions"]
+	finally:
+		hamming.disable_metrics()
+	actual   = (decoded, functions["decode_bytes"]["calls"], functions["decode_bytes"]["corrected"],
+		functions["decode_bytes"]["uncorrectable"], functions["decode_bytes"]["errors"])
+	expected = (bytearray(b'Hello, World!!'), 2, 1, 1, 0)
+	return (0, "") if actual == expected else (1, "metrics_test3 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def metrics_test4():
+	# decoders of other modules count their statuses too, each codeword once, passing them on to the caller's counters
+	data, read_range = b'Hello, World!' * 4, hamming.Container.read_range
+	hamming.reset_metrics()
+	hamming.enable_metrics()
+	try:
+		encoded = bytearray(hamming.encode_blocks(data, 8))
+		encoded[40] ^= 0x02 # index 1 of block 25 in error
+		counters = hamming.DecodeCounters()
+		hamming.decode_stream(BytesIO(encoded), BytesIO(), 8, counters=counters)
+		interleaved = hamming.encode_interleaved(hamming.bytes_to_bits(data), 8)
+		interleaved[37:46] = ~interleaved[37:46] # a burst of 9 errors, two of them in the same codeword
+		try:
+			hamming.decode_interleaved(interleaved, 8)
+		except ValueError:
+			pass
+		hamming.decode_word(hamming.encode_word(5, 32) ^ 1 << 3, 32)
+		container = bytearray(hamming.encode_container(data))
+		container[hamming.CONTAINER_HEADER.size + 9 + 2] ^= 0x04
+		hamming.Container(container).read_range(4, 10)
+		functions = hamming.metrics_snapshot()["functions"]
+	finally:
+		hamming.disable_metrics()
+	actual   = ((counters.clean, counters.corrected), [functions["decode_stream"][field] for field in ("calls", "clean", "corrected")],
+		functions["decode_blocks"]["calls"], [functions["decode_interleaved"][field] for field in ("errors", "corrected", "uncorrectable")],
+		functions["decode_word"]["corrected"], [functions["Container.read_range"][field] for field in ("bytes", "clean", "corrected")],
+		hamming.Container.read_range is read_range)
+	expected = ((51, 1), [1, 51, 1], 0, [1, 7, 1], 1, [10, 1, 1], True)
+	return (0, "") if actual == expected else (1, "metrics_test4 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def metrics_tests():
+	a = metrics_test1()
+	b = metrics_test2()
+	c = metrics_test3()
+	d = metrics_test4()
+	return (a[0] + b[0] + c[0] + d[0], a[1] + b[1] + c[1] + d[1])
+
+# tests for hamming.encode(systematic=True), hamming.to_systematic, hamming.from_systematic and hamming.decode_view
+
+def systematic_test1():
+	data     = bitarray('1011001110001111')
+	encoded  = hamming.encode(data)
+	actual   = (hamming.encode(data, systematic=True), hamming.from_systematic(hamming.to_systematic(encoded)) == encoded)
+	expected = (data + bitarray('00010') + bitarray('1'), True) # parity bits 1, 2, 4, 8, 16, then the overall parity bit
+	return (0, "") if actual == expected else (1, "systematic_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def systematic_test2():
+	# every single error is corrected, at its index in the systematic codeword
+	data, failures = bitarray('01100100110'), []
+	systematic = hamming.encode(data, systematic=True)
+	for i in range(len(systematic)):
+		received = systematic.copy()
+		received[i] = not received[i]
+		result = hamming.decode_ex(received, systematic=True)
+		if (result.data, result.position, received) != (data, i, systematic):
+			failures.append(i)
+	received[2], received[9] = not received[2], not received[9]
+	actual   = (failures, hamming.decode_ex(received, systematic=True).status)
+	expected = ([], hamming.DecodeStatus.UNCORRECTABLE)
+	return (0, "") if actual == expected else (1, "systematic_test2 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def systematic_test3():
+	data = hamming.bytes_to_bits(b'Hamming!')
+	systematic = hamming.encode(data, systematic=True)
+	view = hamming.decode_view(systematic)
+	clean = (view.obj is systematic, bytes(view))
+	systematic[5] = not systematic[5]
+	read_only = bitarray(buffer=systematic.tobytes()) # (72,64) codewords are whole bytes
+	actual   = clean + (bytes(view), bytes(hamming.decode_view(read_only)), read_only[5])
+	expected = (True, b'Hamming!', b'Lamming!', b'Hamming!', systematic[5]) # the view sees changes to the codeword
+	return (0, "") if actual == expected else (1, "systematic_test3 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def systematic_tests():
+	a = systematic_test1()
+	b = systematic_test2()
+	c = systematic_test3()
+	return (a[0] + b[0] + c[0], a[1] + b[1] + c[1])
+
+# tests for hamming.encode_container, hamming.Container and hamming.open_container
+
+def container_test1():
+	data = b'Hello, World!' * 100
+	container = hamming.encode_container(data, 32)
+	header = hamming.CONTAINER_HEADER.unpack_from(container)
+	first = hamming.encode(hamming.bytes_to_bits(data[:4]), systematic=True).tobytes()
+	reader, counters = hamming.Container(container), hamming.DecodeCounters()
+	actual   = (header, len(container), container[hamming.CONTAINER_HEADER.size:][:len(first)] == first,
+		reader.read_range(650, 13, counters), reader.read_range(1299, 1), counters.total)
+	expected = ((hamming.CONTAINER_MAGIC, 32, 39, 1300, 325), hamming.CONTAINER_HEADER.size + 325 * 5, True, b'Hello, World!', b'!', 4)
+	return (0, "") if actual == expected else (1, "container_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def container_test2():
+	# reads through a memory map correct single errors, in the file too with repair=True, and raise on double ones
+	data = b'Hello, World!' * 100
+	with TemporaryDirectory() as directory:
+		name = path.join(directory, 'data.hamming')
+		with open(name, 'wb') as container_file:
+			container_file.write(hamming.encode_container(data))
+		_corrupt_file(name, hamming.CONTAINER_HEADER.size + 9 * 100 + 2, 0x04)
+		_corrupt_file(name, hamming.CONTAINER_HEADER.size + 9 * 50 + 1, 0x11)
+		with hamming.open_container(name, repair=True) as reader:
+			actual = [reader.read_range(800, 8), reader.read_range(0, 16)]
+			try:
+				reader.read_range(400, 20)
+			except ValueError:
+				actual.append("ValueError")
+		with hamming.open_container(name) as reader:
+			counters = hamming.DecodeCounters()
+			reader.read_block(100, counters)
+			actual.append(counters.clean)
+	expected = [data[800:808], data[:16], "ValueError", 1]
+	return (0, "") if actual == expected else (1, "container_test2 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def container_tests():
+	a = container_test1()
+	b = container_test2()
+	return (a[0] + b[0], a[1] + b[1])
+
+# tests for hamming.simulate_channel - these pass trivially without NumPy installed
+
+def simulate_channel_test1():
+	# without errors every codeword is clean, and with every bit flipped, (8,4) codewords decode to all ones
+	if hamming.np is None:
+		return (0, "")
+	quiet, noisy = hamming.simulate_channel(0.0, 1000, 4, workers=1), hamming.simulate_channel(1.0, 1000, 4, workers=1)
+	actual   = ((quiet.clean, quiet.corrected, quiet.detected, quiet.silent), (noisy.clean, noisy.silent), noisy.rate('silent'),
+		quiet.interval('silent')[0])
+	expected = ((1000, 0, 0, 0), (0, 1000), 1.0, 0.0)
+	return (0, "") if actual == expected else (1, "simulate_channel_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def simulate_channel_test2():
+	# a seed gives the same outcomes whether its chunks run here or in worker processes
+	if hamming.np is None:
+		return (0, "")
+	here  = hamming.simulate_channel(0.01, 30000, 16, burst_length=2, seed=7, workers=1, chunk_size=10000)
+	there = hamming.simulate_channel(0.01, 30000, 16, burst_length=2, seed=7, workers=2, chunk_size=10000)
+	low, high = here.interval('detected')
+	actual   = ([here.as_dict()[outcome] for outcome in here.OUTCOMES], sum(here.as_dict()[outcome] for outcome in here.OUTCOMES),
+		low < here.rate('detected') < high)
+	expected = ([there.as_dict()[outcome] for outcome in there.OUTCOMES], 30000, True)
+	return (0, "") if actual == expected else (1, "simulate_channel_test2 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def simulate_channel_tests():
+	a = simulate_channel_test1()
+	b = simulate_channel_test2()
+	return (a[0] + b[0], a[1] + b[1])
+
+# tests for hamming.encode_bytes and hamming.decode_bytes
+
+def encode_bytes_test1():
+	# bit-identical to the bitarray round trip, from a slice of a larger buffer too
+	buffer   = bytearray(b'..Hello, World!..')
+	actual   = (hamming.encode_bytes(b'Hello, World!'), hamming.encode_bytes(memoryview(buffer)[2:-2], pad='right'),
+		hamming.encode_bytes(b'\x03'))
+	expected = (hamming.bits_to_bytes(hamming.encode(hamming.bytes_to_bits(b'Hello, World!'))),
+		hamming.encode(hamming.bytes_to_bits(b'Hello, World!')).tobytes(), bytearray(b'\xE8\x03')) # 11101000 00011, padded on the left
+	return (0, "") if actual == expected else (1, "encode_bytes_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def decode_bytes_test1():
+	encoded = hamming.encode(hamming.bytes_to_bits(b'Hello, World!'))
+	encoded[37] = not encoded[37]
+	short = hamming.encode(bitarray('10110'))
+	double = hamming.encode_bytes(b'Hi', pad='right')
+	double[0] ^= 0x30
+	actual = [hamming.decode_bytes(hamming.bits_to_bytes(encoded)), hamming.decode_bytes(encoded.tobytes(), pad='right'),
+		hamming.decode_bytes(hamming.bits_to_bytes(short), 5)]
+	try:
+		hamming.decode_bytes(double, pad='right')
+	except ValueError:
+		actual.append("ValueError")
+	expected = [bytearray(b'Hello, World!'), bytearray(b'Hello, World!'), bytearray(b'\x16'), "ValueError"]
+	return (0, "") if actual == expected else (1, "decode_bytes_test1 FAILED! Expected: {0}, Actual: {1}\n".format(expected, actual))
+
+def encode_bytes_tests():
+	a = encode_bytes_test1()
+	b = decode_bytes_test1()
+	return (a[0] + b[0], a[1] + b[1])
+
 # tests for hamming._num_parity_bits_needed
 
 def _num_parity_bits_needed_test1():
@@ -392,15 +1425,43 @@ def run_tests():
 	d = decode_tests()
 	e = encode_tests()
 	f = _num_parity_bits_needed_tests()
-	return (a[0] + b[0] + c[0] + d[0] + e[0] + f[0], a[1] + b[1] + c[1] + d[1] + e[1] + f[1])
+	g = code_layout_tests()
+	h = batch_tests()
+	i = blocks_tests()
+	j = stream_tests()
+	k = file_tests()
+	l = parallel_tests()
+	m = decode_ex_tests()
+	n = into_tests()
+	o = async_tests()
+	p = word_tests()
+	q = interleaved_tests()
+	r = encoded_buffer_tests()
+	s = lazy_import_tests()
+	t = scrub_tests()
+	u = metrics_tests()
+	v = systematic_tests()
+	w = container_tests()
+	x = simulate_channel_tests()
+	y = encode_bytes_tests()
+	return (a[0] + b[0] + c[0] + d[0] + e[0] + f[0] + g[0] + h[0] + i[0] + j[0] + k[0] + l[0] + m[0] + n[0] + o[0] + p[0] + q[0] + r[0] + s[0] + t[0] + u[0] + v[0] + w[0] + x[0] + y[0], \
+		a[1] + b[1] + c[1] + d[1] + e[1] + f[1] + g[1] + h[1] + i[1] + j[1] + k[1] + l[1] + m[1] + n[1] + o[1] + p[1] + q[1] + r[1] + s[1] + t[1] + u[1] + v[1] + w[1] + x[1] + y[1])
 
 def main():
-	total_failed, error_output = run_tests()
-	if total_failed:
-		stderr.write(error_output)
-		stderr.write("{0} of {1} test cases passed. {2} tests failed.\n".format(N_TESTS - total_failed, N_TESTS, total_failed))
+	# every test case runs against every available backend, which must all give identical results
+	any_failed = False
+	for backend in hamming.available_backends():
+		hamming.use_backend(backend)
+		total_failed, error_output = run_tests()
+		if total_failed:
+			stderr.write(error_output)
+			stderr.write("{0} of {1} test cases passed with the {2} backend. {3} tests failed.\n".format(
+				N_TESTS - total_failed, N_TESTS, backend, total_failed))
+			any_failed = True
+		else:
+			stdout.write("All {0} test cases passed with the {1} backend!\n".format(N_TESTS, backend))
+	if any_failed:
 		exit(1)
-	stdout.write("All {0} test cases passed!\n".format(N_TESTS))
 	return None
 
 if __name__ == '__main__':